@@ -0,0 +1,18 @@
+"""
+Password hashing shared by the API and its bulk-import process pool
+
+Pool workers are spawned processes that import their target's module. This
+module only depends on passlib, so workers do not import server.py and create
+a MongoDB client, routers and settings of their own.
+"""
+
+from typing import List
+
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a batch of passwords (runs in a pool worker)"""
+    return [pwd_context.hash(password) for password in passwords]
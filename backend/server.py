@@ -1,41 +1,421 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.datastructures import Headers, MutableHeaders
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ReturnDocument, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 import os
+import io
+import csv
+import json
+import asyncio
+import zlib
+import time
 import logging
+import threading
+import contextvars
+import multiprocessing
+from collections import Counter as CounterDict, OrderedDict, deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, EmailStr, ValidationError, field_validator
+from typing import List, Literal, Optional
 import uuid
+import hashlib
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 from enum import Enum
 import jwt
-from passlib.context import CryptContext
+import orjson
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
 from passlib.hash import bcrypt
 
+from password_hashing import hash_passwords, pwd_context
+
+# Optional response compression codecs; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+# Optional shared backend for the read cache
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics
+# Exported in Prometheus format at /metrics. With several worker processes, set
+# PROMETHEUS_MULTIPROC_DIR so every worker's samples are aggregated.
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled",
+    multiprocess_mode="livesum"
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by collection and operation",
+    ["collection", "command", "outcome"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting for a pooled MongoDB connection",
+    buckets=(.0001, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 5)
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total", "Failed MongoDB connection checkouts by reason", ["reason"]
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongodb_pool_connections", "MongoDB connections by state", ["state"],
+    multiprocess_mode="livesum"
+)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds", "Highest recent event loop scheduling delay",
+    multiprocess_mode="max"
+)
+FLEET_EVENT_SUBSCRIBERS = Gauge(
+    "fleet_event_subscribers", "Open fleet event streams",
+    multiprocess_mode="livesum"
+)
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Records every MongoDB command's latency by collection and command name"""
+    
+    def __init__(self):
+        # (connection, request id) -> collection; the completion events don't carry the command
+        self.collections = {}
+    
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        self.collections[(event.connection_id, event.request_id)] = target if isinstance(target, str) else ""
+    
+    def observe(self, event, outcome: str):
+        collection = self.collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_LATENCY.labels(collection, event.command_name, outcome).observe(event.duration_micros / 1_000_000)
+    
+    def succeeded(self, event):
+        self.observe(event, "succeeded")
+    
+    def failed(self, event):
+        self.observe(event, "failed")
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Records connection checkout wait times and pool occupancy (per server address)"""
+    
+    def __init__(self):
+        # Motor checks connections out on its executor threads, start and end on the same one
+        self.checkout = threading.local()
+        self.lock = threading.Lock()
+        self.open = CounterDict()
+        self.in_use = CounterDict()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait_seconds = 0.0
+        self.max_checkout_wait_seconds = 0.0
+    
+    def checkout_wait(self) -> float:
+        wait = time.perf_counter() - getattr(self.checkout, "started", time.perf_counter())
+        MONGO_POOL_CHECKOUT_WAIT.observe(wait)
+        self.checkout_wait_seconds += wait
+        self.max_checkout_wait_seconds = max(self.max_checkout_wait_seconds, wait)
+        return wait
+    
+    def connection_check_out_started(self, event):
+        self.checkout.started = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        with self.lock:
+            self.checkout_wait()
+            self.checkouts += 1
+            self.in_use[event.address] += 1
+        MONGO_POOL_CONNECTIONS.labels("in_use").inc()
+    
+    def connection_check_out_failed(self, event):
+        with self.lock:
+            self.checkout_wait()
+            self.checkout_failures += 1
+        MONGO_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+    
+    def connection_checked_in(self, event):
+        with self.lock:
+            self.in_use[event.address] -= 1
+        MONGO_POOL_CONNECTIONS.labels("in_use").dec()
+    
+    def connection_created(self, event):
+        with self.lock:
+            self.open[event.address] += 1
+        MONGO_POOL_CONNECTIONS.labels("open").inc()
+    
+    def connection_closed(self, event):
+        with self.lock:
+            self.open[event.address] -= 1
+        MONGO_POOL_CONNECTIONS.labels("open").dec()
+    
+    def stats(self, max_pool_size: int) -> dict:
+        """Pool occupancy per server and checkout wait totals for this process"""
+        with self.lock:
+            return {
+                "pools": [
+                    {
+                        "address": f"{address[0]}:{address[1]}",
+                        "open": self.open[address],
+                        "in_use": self.in_use[address],
+                        "max_size": max_pool_size,
+                        "utilization": self.in_use[address] / max_pool_size if max_pool_size else None
+                    }
+                    for address in sorted(set(self.open) | set(self.in_use))
+                ],
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_checkout_wait_ms": self.checkout_wait_seconds * 1000 / self.checkouts if self.checkouts else 0.0,
+                "max_checkout_wait_ms": self.max_checkout_wait_seconds * 1000
+            }
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+
+# Query budgets
+# Every request counts its MongoDB round trips and database time. They are sent
+# back in a Server-Timing header, and requests over budget are logged with their
+# route and query shapes so N+1 patterns show up. Routes can declare their own
+# budget with @query_budget; QUERY_BUDGET_ENFORCE turns overruns into errors (tests).
+# Budgets cover the handler only: queries a streaming body runs after the response
+# has started (event stream heartbeats, import progress) are not counted.
+QUERY_BUDGET_MAX_QUERIES = int(os.environ.get('QUERY_BUDGET_MAX_QUERIES', 25))
+QUERY_BUDGET_MAX_DB_MS = float(os.environ.get('QUERY_BUDGET_MAX_DB_MS', 250))
+QUERY_BUDGET_ENFORCE = os.environ.get('QUERY_BUDGET_ENFORCE', 'false').lower() in ('1', 'true', 'yes')
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in enforcing mode when a request exceeds its query budget"""
+
+class QueryStats:
+    """MongoDB round trips made while handling one request"""
+    
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.shapes = CounterDict()
+        # Set once the response has started
+        self.closed = False
+        # Commands complete on Motor's executor threads
+        self.lock = threading.Lock()
+    
+    def record(self, shape: str, seconds: float):
+        with self.lock:
+            if self.closed:
+                return
+            self.count += 1
+            self.db_seconds += seconds
+            self.shapes[shape] += 1
+
+current_query_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("current_query_stats", default=None)
+
+# Where each command keeps its filter
+QUERY_FILTER_PATHS = {
+    "find": ("filter",),
+    "count": ("query",),
+    "distinct": ("query",),
+    "findAndModify": ("query",),
+    "update": ("updates", 0, "q"),
+    "delete": ("deletes", 0, "q"),
+    "aggregate": ("pipeline", 0, "$match"),
+}
+
+def query_shape(command_name: str, command: dict) -> str:
+    """Collection, command and filter keys without values, e.g. ``cars.find{company_id,id}``"""
+    collection = command.get(command_name)
+    if command_name == "getMore":
+        collection = command.get("collection")
+    query = command
+    for step in QUERY_FILTER_PATHS.get(command_name, ()):
+        try:
+            query = query[step]
+        except (KeyError, IndexError, TypeError):
+            query = None
+            break
+    keys = ",".join(sorted(query)) if isinstance(query, dict) and query is not command else ""
+    return f"{collection if isinstance(collection, str) else ''}.{command_name}{{{keys}}}"
+
+def query_budget(max_queries: Optional[int] = None, max_db_ms: Optional[float] = None):
+    """Declare a route's query budget (place below the route decorator)"""
+    def decorator(endpoint):
+        endpoint.query_budget = (max_queries, max_db_ms)
+        return endpoint
+    return decorator
+
+class QueryBudgetListener(monitoring.CommandListener):
+    """Attributes each MongoDB command to the request that issued it"""
+    
+    def __init__(self):
+        self.shapes = {}
+    
+    def started(self, event):
+        # Motor copies the caller's context into its executor threads
+        if current_query_stats.get() is not None:
+            self.shapes[(event.connection_id, event.request_id)] = query_shape(event.command_name, event.command)
+    
+    def finished(self, event):
+        shape = self.shapes.pop((event.connection_id, event.request_id), None)
+        stats = current_query_stats.get()
+        if stats is not None and shape is not None:
+            stats.record(shape, event.duration_micros / 1_000_000)
+    
+    def succeeded(self, event):
+        self.finished(event)
+    
+    def failed(self, event):
+        self.finished(event)
+
 # MongoDB connection
+class MongoSettings(BaseModel):
+    """MongoDB client settings; each field can be set with MONGO_<FIELD NAME> (e.g. MONGO_MAX_POOL_SIZE)"""
+    max_pool_size: int = Field(100, ge=1)
+    min_pool_size: int = Field(0, ge=0)
+    # Close connections idle for longer than this
+    max_idle_time_ms: Optional[int] = Field(None, ge=1)
+    # Fail a request instead of queueing forever when every pooled connection is busy
+    wait_queue_timeout_ms: Optional[int] = Field(None, ge=1)
+    server_selection_timeout_ms: int = Field(30000, ge=1)
+    connect_timeout_ms: int = Field(20000, ge=1)
+    # Wire compression, in order of preference (comma separated in the environment)
+    compressors: List[Literal["zstd", "snappy", "zlib"]] = []
+    # Server-side time limit (maxTimeMS) for every read: find, count, distinct and aggregate
+    max_time_ms: Optional[int] = Field(None, ge=1)
+    # Reads that must see the caller's own writes (counters, versions) need primary
+    read_preference: Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"] = "primary"
+    app_name: str = "fleetmanager-backend"
+    
+    @field_validator("compressors", mode="before")
+    @classmethod
+    def split_compressors(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+    
+    @classmethod
+    def from_env(cls) -> "MongoSettings":
+        values = {}
+        for name in cls.model_fields:
+            value = os.environ.get(f"MONGO_{name.upper()}")
+            if value:
+                values[name] = value
+        return cls(**values)
+    
+    def client_options(self) -> dict:
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "readPreference": self.read_preference,
+            "appname": self.app_name,
+        }
+        if self.max_idle_time_ms is not None:
+            options["maxIdleTimeMS"] = self.max_idle_time_ms
+        if self.wait_queue_timeout_ms is not None:
+            options["waitQueueTimeoutMS"] = self.wait_queue_timeout_ms
+        if self.compressors:
+            options["compressors"] = self.compressors
+        return options
+
+# pymongo has no client-wide maxTimeMS. Its timeoutMS option is a client-side
+# deadline for the whole operation (server selection, pool checkout and every
+# getMore) that replaces waitQueueTimeoutMS and also cuts off writes, so reads
+# get maxTimeMS individually through this proxy instead.
+class TimeLimitedCollection:
+    """Collection proxy adding a default maxTimeMS to reads"""
+    def __init__(self, collection, max_time_ms: int):
+        self.collection = collection
+        self.max_time_ms = max_time_ms
+    
+    def find(self, *args, **kwargs):
+        kwargs.setdefault("max_time_ms", self.max_time_ms)
+        return self.collection.find(*args, **kwargs)
+    
+    def find_one(self, *args, **kwargs):
+        kwargs.setdefault("max_time_ms", self.max_time_ms)
+        return self.collection.find_one(*args, **kwargs)
+    
+    def count_documents(self, *args, **kwargs):
+        kwargs.setdefault("maxTimeMS", self.max_time_ms)
+        return self.collection.count_documents(*args, **kwargs)
+    
+    def distinct(self, *args, **kwargs):
+        kwargs.setdefault("maxTimeMS", self.max_time_ms)
+        return self.collection.distinct(*args, **kwargs)
+    
+    def aggregate(self, *args, **kwargs):
+        kwargs.setdefault("maxTimeMS", self.max_time_ms)
+        return self.collection.aggregate(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+class TimeLimitedDatabase:
+    """Database proxy handing out TimeLimitedCollections"""
+    def __init__(self, database, max_time_ms: int):
+        self.database = database
+        self.max_time_ms = max_time_ms
+    
+    def __getattr__(self, name):
+        attr = getattr(self.database, name)
+        return TimeLimitedCollection(attr, self.max_time_ms) if isinstance(attr, AsyncIOMotorCollection) else attr
+    
+    def __getitem__(self, name):
+        return TimeLimitedCollection(self.database[name], self.max_time_ms)
+
+mongo_settings = MongoSettings.from_env()
+mongo_pool_metrics = MongoPoolMetrics()
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[MongoCommandMetrics(), mongo_pool_metrics, QueryBudgetListener()],
+    **mongo_settings.client_options()
+)
 db = client[os.environ['DB_NAME']]
+if mongo_settings.max_time_ms is not None:
+    db = TimeLimitedDatabase(db, mongo_settings.max_time_ms)
 
 # Authentication setup
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'fleet-management-secret-key-2024')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-# Create the main app without a prefix
-app = FastAPI()
-
-# Create a router with the /api prefix
+# Create a router with the /api prefix (the app itself is built by create_app)
 api_router = APIRouter(prefix="/api")
+# Routes served outside /api
+root_router = APIRouter()
 
 # Enums
 class UserRole(str, Enum):
@@ -140,6 +520,9 @@ class License(BaseModel):
     activated_date: Optional[datetime] = None
     created_by: Optional[str] = None  # Admin user who created it
     notes: Optional[str] = None
+    # Usage counters, reserved atomically against max_users / max_vehicles
+    users_count: int = 0
+    vehicles_count: int = 0
 
 class LicenseCreate(BaseModel):
     license_type: LicenseType
@@ -264,6 +647,17 @@ class CarUpdate(BaseModel):
     category: Optional[CarCategory] = None
     status: Optional[CarStatus] = None
 
+class ImportRowError(BaseModel):
+    row: int  # 1-based row number in the import file
+    key: Optional[str] = None  # license plate / email of the failed row
+    error: str
+
+class ImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+
 class Downtime(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     company_id: str
@@ -297,6 +691,45 @@ class FleetStats(BaseModel):
     in_use: int
     maintenance: int
 
+# Deletion Job Models
+class DeletionTarget(str, Enum):
+    CAR = "car"
+    COMPANY = "company"
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class DeletionJob(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    company_id: str
+    target_type: DeletionTarget
+    target_id: str
+    status: JobStatus = JobStatus.PENDING
+    requested_by: Optional[str] = None
+    deleted_counts: dict = Field(default_factory=dict)  # collection -> documents removed so far
+    attempts: int = 0
+    error: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+class DeletionJobResponse(BaseModel):
+    id: str
+    company_id: str
+    target_type: DeletionTarget
+    target_id: str
+    status: JobStatus
+    deleted_counts: dict
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
 # Booking Models
 class Booking(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -344,6 +777,791 @@ class BookingResponse(BaseModel):
     user_info: Optional[dict] = None
     approver_info: Optional[dict] = None
 
+# Fast response path
+def orjson_default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson response that also serializes pydantic models directly"""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+def trusted_response(content, headers: Optional[dict] = None) -> FastJSONResponse:
+    """Return already-validated content without FastAPI re-validating it.
+    
+    Only use this for models we just built or for documents read from our own
+    database with an explicit projection; the route's response_model is then
+    used for documentation only.
+    """
+    return FastJSONResponse(content, headers=headers)
+
+def model_projection(model) -> dict:
+    """Mongo projection selecting exactly the fields of a model (and never _id)"""
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+# Documents are validated when they are written, so reads trust them: instead of
+# building a model per row, responses use projected documents with any static
+# defaults filled in for fields that older documents may lack.
+@lru_cache(maxsize=None)
+def model_read_defaults(model) -> dict:
+    return {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if not field.is_required() and field.default_factory is None
+    }
+
+def selected_read_defaults(model, fields: Optional[tuple]) -> dict:
+    defaults = model_read_defaults(model)
+    if fields is None:
+        return defaults
+    return {name: value for name, value in defaults.items() if name in fields}
+
+def trusted_document(model, document: dict, fields: Optional[tuple] = None) -> dict:
+    return {**selected_read_defaults(model, fields), **document}
+
+def trusted_documents(model, documents: List[dict], fields: Optional[tuple] = None) -> List[dict]:
+    defaults = selected_read_defaults(model, fields)
+    return [{**defaults, **document} for document in documents]
+
+CAR_PROJECTION = model_projection(Car)
+BOOKING_PROJECTION = model_projection(Booking)
+DOWNTIME_PROJECTION = model_projection(Downtime)
+LICENSE_RESPONSE_PROJECTION = model_projection(LicenseResponse)
+# Built from the models, so password_hash is never fetched
+USER_PROJECTION = model_projection(User)
+USER_RESPONSE_PROJECTION = model_projection(UserResponse)
+
+# Field selection
+# Read endpoints take ?fields=a,b to return only those fields of their response
+# model. The selection is sent to Mongo as the projection, so unselected fields
+# are never transferred, decoded or serialized. "id" is always included, and
+# since names are checked against the response model, fields outside it (such
+# as password_hash) cannot be selected.
+def parse_fields(model, fields: Optional[str]) -> Optional[tuple]:
+    """Field names selected with ?fields=, or None when all fields are returned"""
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *names]))
+
+def fields_projection(fields, default: dict) -> dict:
+    """Mongo projection for a field selection, or ``default`` for a full read"""
+    if fields is None:
+        return default
+    return {"_id": 0, **{name: 1 for name in fields}}
+
+def select_fields(document: dict, fields: tuple) -> dict:
+    return {name: document[name] for name in fields if name in document}
+
+# Tenant-scoped data access
+# Company data lives in shared collections; every query against them must carry
+# the caller's company_id so it stays on the (company_id, ...) indexes and can
+# never read another tenant's documents.
+TENANT_COLLECTIONS = {"users", "cars", "bookings", "downtimes"}
+
+# Debug mode: fail any query on a tenant collection that has no company_id filter
+TENANT_QUERY_GUARD = os.environ.get('TENANT_QUERY_GUARD', 'false').lower() in ('1', 'true', 'yes')
+
+class TenantQueryError(RuntimeError):
+    """Raised in guard mode when a tenant collection is queried without a company_id filter"""
+
+def check_tenant_filter(collection_name: str, operation: str, query: Optional[dict]):
+    if not query or "company_id" not in query:
+        raise TenantQueryError(f"{operation} on '{collection_name}' without a company_id filter: {query}")
+
+class GuardedCollection:
+    """Collection proxy that rejects tenant queries without a company_id filter"""
+    FILTER_METHODS = {
+        "find", "find_one", "count_documents", "update_one", "update_many", "replace_one",
+        "delete_one", "delete_many", "find_one_and_update", "find_one_and_delete", "find_one_and_replace"
+    }
+    
+    def __init__(self, collection):
+        self.unguarded = collection
+    
+    def __getattr__(self, name):
+        attr = getattr(self.unguarded, name)
+        if name in self.FILTER_METHODS:
+            def guarded(*args, **kwargs):
+                check_tenant_filter(self.unguarded.name, name, args[0] if args else kwargs.get("filter"))
+                return attr(*args, **kwargs)
+            return guarded
+        if name == "distinct":
+            def guarded_distinct(key, filter=None, *args, **kwargs):
+                check_tenant_filter(self.unguarded.name, name, filter)
+                return attr(key, filter, *args, **kwargs)
+            return guarded_distinct
+        if name == "aggregate":
+            def guarded_aggregate(pipeline, *args, **kwargs):
+                first_stage = pipeline[0] if pipeline else {}
+                check_tenant_filter(self.unguarded.name, name, first_stage.get("$match"))
+                return attr(pipeline, *args, **kwargs)
+            return guarded_aggregate
+        return attr
+
+class GuardedDatabase:
+    """Database proxy handing out guarded tenant collections"""
+    def __init__(self, database):
+        self.unguarded = database
+    
+    def __getattr__(self, name):
+        attr = getattr(self.unguarded, name)
+        return GuardedCollection(attr) if name in TENANT_COLLECTIONS else attr
+    
+    def __getitem__(self, name):
+        collection = self.unguarded[name]
+        return GuardedCollection(collection) if name in TENANT_COLLECTIONS else collection
+
+def unscoped(collection):
+    """Explicitly opt out of the tenant guard for genuinely cross-tenant lookups
+    (authentication and global email uniqueness)"""
+    return collection.unguarded if isinstance(collection, GuardedCollection) else collection
+
+class TenantCollection:
+    """Collection wrapper that injects a company_id into every query"""
+    def __init__(self, collection, company_id: str):
+        self.collection = collection
+        self.company_id = company_id
+    
+    @property
+    def name(self) -> str:
+        return self.collection.name
+    
+    def scope(self, query: Optional[dict] = None) -> dict:
+        return {**(query or {}), "company_id": self.company_id}
+    
+    def find(self, query: Optional[dict] = None, *args, **kwargs):
+        return self.collection.find(self.scope(query), *args, **kwargs)
+    
+    def find_one(self, query: Optional[dict] = None, *args, **kwargs):
+        return self.collection.find_one(self.scope(query), *args, **kwargs)
+    
+    def count_documents(self, query: Optional[dict] = None, **kwargs):
+        return self.collection.count_documents(self.scope(query), **kwargs)
+    
+    def distinct(self, key: str, query: Optional[dict] = None, **kwargs):
+        return self.collection.distinct(key, self.scope(query), **kwargs)
+    
+    def update_one(self, query: dict, update: dict, **kwargs):
+        return self.collection.update_one(self.scope(query), update, **kwargs)
+    
+    def update_many(self, query: dict, update: dict, **kwargs):
+        return self.collection.update_many(self.scope(query), update, **kwargs)
+    
+    def find_one_and_update(self, query: dict, update: dict, **kwargs):
+        return self.collection.find_one_and_update(self.scope(query), update, **kwargs)
+    
+    def delete_one(self, query: dict, **kwargs):
+        return self.collection.delete_one(self.scope(query), **kwargs)
+    
+    def delete_many(self, query: dict, **kwargs):
+        return self.collection.delete_many(self.scope(query), **kwargs)
+    
+    def aggregate(self, pipeline: List[dict], **kwargs):
+        return self.collection.aggregate([{"$match": {"company_id": self.company_id}}, *pipeline], **kwargs)
+    
+    def insert_one(self, document: dict, **kwargs):
+        return self.collection.insert_one({**document, "company_id": self.company_id}, **kwargs)
+    
+    def insert_many(self, documents: List[dict], **kwargs):
+        return self.collection.insert_many(
+            [{**document, "company_id": self.company_id} for document in documents], **kwargs
+        )
+
+class TenantDatabase:
+    """Access to the tenant collections of a single company, e.g. ``tenant_db(company_id).bookings``"""
+    def __init__(self, company_id: str):
+        self.company_id = company_id
+    
+    def __getattr__(self, name: str) -> TenantCollection:
+        if name not in TENANT_COLLECTIONS:
+            raise AttributeError(f"'{name}' is not a tenant collection")
+        return TenantCollection(db[name], self.company_id)
+
+def tenant_db(company_id: str) -> TenantDatabase:
+    return TenantDatabase(company_id)
+
+if TENANT_QUERY_GUARD:
+    db = GuardedDatabase(db)
+
+# Concurrent queries
+# Handlers run independent queries through gather_queries, so they take as long
+# as the slowest query instead of the sum of all of them. Each query has its own
+# timeout, and the first failure cancels the queries still running.
+QUERY_TIMEOUT_SECONDS = float(os.environ.get('QUERY_TIMEOUT_SECONDS', 5))
+
+async def gather_queries(*queries, timeout: Optional[float] = None) -> list:
+    """Await independent queries concurrently and return their results in order.
+    
+    ``None`` entries are returned as ``None``, so optional queries keep their
+    position. A query running longer than ``timeout`` (QUERY_TIMEOUT_SECONDS by
+    default) fails with 504; the first exception cancels the other queries and
+    is raised as is.
+    """
+    timeout = QUERY_TIMEOUT_SECONDS if timeout is None else timeout
+    
+    async def run(query):
+        if query is None:
+            return None
+        try:
+            async with asyncio.timeout(timeout):
+                return await query
+        except TimeoutError:
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Database query timed out")
+    
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(run(query)) for query in queries]
+    except BaseExceptionGroup as errors:
+        raise errors.exceptions[0]
+    return [task.result() for task in tasks]
+
+# Read cache
+# Read-mostly dashboard views are cached per (company_id, endpoint, params) in an
+# in-process LRU with a TTL and, optionally, in a shared backend that other workers
+# can fill from. bump_collection_version drops the entries built from a changed
+# collection, the invalidation bus does the same for writes made by other workers,
+# and the TTL bounds staleness if the bus falls behind.
+READ_CACHE_ENABLED = os.environ.get('READ_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+READ_CACHE_MAX_ENTRIES = int(os.environ.get('READ_CACHE_MAX_ENTRIES', 10000))
+READ_CACHE_TTL_SECONDS = float(os.environ.get('READ_CACHE_TTL_SECONDS', 15))
+# Shared backend: redis://host:port/db, or memory:// for a process-local stand-in
+READ_CACHE_URL = os.environ.get('READ_CACHE_URL')
+
+# Cached endpoint -> collections its response is built from
+READ_CACHE_DEPENDENCIES = {
+    "fleet_stats": {"cars"},
+    "fleet_categories": {"cars"},
+    "company": {"companies", "cars", "users", "bookings"},
+    "license_info": {"companies", "licenses", "cars", "users"},
+}
+
+class LocalCacheBackend:
+    """In-memory stand-in for a shared cache backend (tests, single process)"""
+    
+    def __init__(self):
+        self.entries = {}
+    
+    async def get(self, company_id: str, endpoint: str, params: str) -> Optional[bytes]:
+        entry = self.entries.get((company_id, endpoint), {}).get(params)
+        if entry is None or entry[0] <= time.time():
+            return None
+        return entry[1]
+    
+    async def set(self, company_id: str, endpoint: str, params: str, value: bytes, ttl: float):
+        self.entries.setdefault((company_id, endpoint), {})[params] = (time.time() + ttl, value)
+    
+    async def delete(self, company_id: str, endpoints):
+        for endpoint in endpoints:
+            self.entries.pop((company_id, endpoint), None)
+
+class RedisCacheBackend:
+    """Shared cache backend: one Redis hash per (company, endpoint), one field per params"""
+    
+    def __init__(self, url: str):
+        if redis_asyncio is None:
+            raise RuntimeError("READ_CACHE_URL points to Redis but the redis package is not installed")
+        self.redis = redis_asyncio.from_url(url)
+    
+    @staticmethod
+    def key(company_id: str, endpoint: str) -> str:
+        return f"readcache:{company_id}:{endpoint}"
+    
+    async def get(self, company_id: str, endpoint: str, params: str) -> Optional[bytes]:
+        entry = await self.redis.hget(self.key(company_id, endpoint), params)
+        if entry is None:
+            return None
+        expires_at, value = entry.split(b" ", 1)
+        if float(expires_at) <= time.time():
+            return None
+        return value
+    
+    async def set(self, company_id: str, endpoint: str, params: str, value: bytes, ttl: float):
+        key = self.key(company_id, endpoint)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, params, f"{time.time() + ttl} ".encode() + value)
+            pipe.expire(key, max(1, int(ttl) + 1))
+            await pipe.execute()
+    
+    async def delete(self, company_id: str, endpoints):
+        await self.redis.delete(*(self.key(company_id, endpoint) for endpoint in endpoints))
+
+def create_cache_backend(url: Optional[str]):
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return LocalCacheBackend()
+    return RedisCacheBackend(url)
+
+class ReadCache:
+    """LRU + TTL cache of JSON-compatible responses, invalidated per company and collection"""
+    
+    def __init__(self, max_entries: int, ttl: float, backend=None, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self.enabled = enabled
+        self.entries = OrderedDict()  # (company_id, endpoint, params) -> (expires_at, value)
+        self.keys_by_company = {}
+        # (company_id, collection) -> number of invalidations; a load that overlaps
+        # an invalidation is not stored, so it cannot resurrect the old data
+        self.generations = {}
+        self.epoch = 0
+        self.counters = {endpoint: dict.fromkeys(("hits", "shared_hits", "misses", "invalidations"), 0)
+                         for endpoint in READ_CACHE_DEPENDENCIES}
+        self.evictions = 0
+    
+    def generation(self, company_id: str, collections) -> tuple:
+        return (self.epoch, *(self.generations.get((company_id, collection), 0) for collection in sorted(collections)))
+    
+    def store(self, key: tuple, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        self.keys_by_company.setdefault(key[0], set()).add(key)
+        while len(self.entries) > self.max_entries:
+            old_key, _ = self.entries.popitem(last=False)
+            self.forget(old_key)
+            self.evictions += 1
+    
+    def forget(self, key: tuple):
+        keys = self.keys_by_company.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_company[key[0]]
+    
+    async def get_or_load(self, company_id: str, endpoint: str, params: str, loader):
+        """Cached value for the key, or the result of ``await loader()`` (then cached)"""
+        if not self.enabled:
+            return await loader()
+        
+        key = (company_id, endpoint, params)
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.counters[endpoint]["hits"] += 1
+                return entry[1]
+            del self.entries[key]
+            self.forget(key)
+        
+        dependencies = READ_CACHE_DEPENDENCIES[endpoint]
+        generation = self.generation(company_id, dependencies)
+        if self.backend is not None:
+            try:
+                shared = await self.backend.get(company_id, endpoint, params)
+            except Exception as e:
+                logger.warning(f"Read cache backend get failed: {e}")
+                shared = None
+            if shared is not None:
+                value = orjson.loads(shared)
+                self.counters[endpoint]["shared_hits"] += 1
+                if self.generation(company_id, dependencies) == generation:
+                    self.store(key, value)
+                return value
+        
+        self.counters[endpoint]["misses"] += 1
+        value = await loader()
+        if self.generation(company_id, dependencies) == generation:
+            self.store(key, value)
+            if self.backend is not None:
+                try:
+                    await self.backend.set(company_id, endpoint, params, orjson.dumps(value, default=orjson_default), self.ttl)
+                except Exception as e:
+                    logger.warning(f"Read cache backend set failed: {e}")
+        return value
+    
+    async def invalidate(self, company_id: str, *collections: str, shared: bool = True):
+        """Drop the company's entries built from any of the given collections.
+        
+        ``shared=False`` leaves the shared backend alone (the writer already cleared it).
+        """
+        for collection in collections:
+            key = (company_id, collection)
+            self.generations[key] = self.generations.get(key, 0) + 1
+        endpoints = {endpoint for endpoint, dependencies in READ_CACHE_DEPENDENCIES.items()
+                     if dependencies.intersection(collections)}
+        if not endpoints or not self.enabled:
+            return
+        
+        for key in [key for key in self.keys_by_company.get(company_id, ()) if key[1] in endpoints]:
+            del self.entries[key]
+            self.forget(key)
+        for endpoint in endpoints:
+            self.counters[endpoint]["invalidations"] += 1
+        if shared and self.backend is not None:
+            try:
+                await self.backend.delete(company_id, endpoints)
+            except Exception as e:
+                logger.warning(f"Read cache backend delete failed: {e}")
+    
+    def clear(self):
+        """Drop every local entry, e.g. after missing invalidation events"""
+        self.epoch += 1
+        self.entries.clear()
+        self.keys_by_company.clear()
+    
+    def stats(self) -> dict:
+        endpoints = {}
+        for endpoint, counters in self.counters.items():
+            lookups = counters["hits"] + counters["shared_hits"] + counters["misses"]
+            endpoints[endpoint] = {
+                **counters,
+                "hit_ratio": (counters["hits"] + counters["shared_hits"]) / lookups if lookups else None
+            }
+        totals = {name: sum(counters[name] for counters in self.counters.values())
+                  for name in ("hits", "shared_hits", "misses", "invalidations")}
+        lookups = totals["hits"] + totals["shared_hits"] + totals["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "evictions": self.evictions,
+            **totals,
+            "hit_ratio": (totals["hits"] + totals["shared_hits"]) / lookups if lookups else None,
+            "endpoints": endpoints
+        }
+
+read_cache = ReadCache(
+    READ_CACHE_MAX_ENTRIES,
+    READ_CACHE_TTL_SECONDS,
+    backend=create_cache_backend(READ_CACHE_URL) if READ_CACHE_ENABLED else None,
+    enabled=READ_CACHE_ENABLED
+)
+
+# Conditional GET support
+# Every company has a version counter per tenant collection, bumped by the write
+# paths after they change data. List endpoints derive their ETag from the
+# versions they depend on, so an unchanged view is answered with 304 Not
+# Modified after a single small lookup instead of re-reading the collection.
+async def get_collection_versions(company_id: str) -> dict:
+    versions = await db.collection_versions.find_one({"company_id": company_id}, {"_id": 0, "versions": 1})
+    return (versions or {}).get("versions", {})
+
+async def bump_collection_version(company_id: str, *collections: str):
+    await db.collection_versions.update_one(
+        {"company_id": company_id},
+        {
+            "$inc": {f"versions.{collection}": 1 for collection in collections},
+            "$set": {"updated_by": WORKER_ID},
+            "$currentDate": {"updated_at": True}
+        },
+        upsert=True
+    )
+    await read_cache.invalidate(company_id, *collections)
+
+async def collection_etag(request: Request, user: User, *collections: str) -> str:
+    """Weak ETag for a response built from the given collections of the user's company.
+    
+    Responses differ per user (role, own bookings) and per query string, so both
+    are part of the tag.
+    """
+    versions = await get_collection_versions(user.company_id)
+    key = "|".join([
+        user.company_id,
+        user.id,
+        str(request.url.query),
+        *(f"{collection}:{versions.get(collection, 0)}" for collection in collections)
+    ])
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response if the client's If-None-Match already has this ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == opaque_tag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    return None
+
+def etag_headers(etag: str) -> dict:
+    # no-cache: clients may store the response but must revalidate it every time
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+# Cache invalidation bus
+# Writes bump collection_versions, so that collection is a log of which company's
+# data changed. Every worker follows it and invalidates its own in-process caches
+# for changes made by other workers: through a change stream when MongoDB runs as
+# a replica set, otherwise by polling the updated_at index.
+CACHE_INVALIDATION_BUS = os.environ.get('CACHE_INVALIDATION_BUS', 'auto')  # auto, change_stream, poll, off
+CACHE_INVALIDATION_POLL_SECONDS = float(os.environ.get('CACHE_INVALIDATION_POLL_SECONDS', 1))
+# Re-read this far back on every poll so writes that commit out of timestamp order are not missed
+CACHE_INVALIDATION_POLL_OVERLAP_SECONDS = float(os.environ.get('CACHE_INVALIDATION_POLL_OVERLAP_SECONDS', 5))
+WORKER_ID = f"{os.uname().nodename}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class CacheInvalidationBus:
+    """Applies collection version changes made by any worker to this worker's read cache"""
+    
+    def __init__(self, cache: ReadCache):
+        self.cache = cache
+        self.mode = None
+        # Polling: company_id -> (versions, updated_at) for recently changed companies
+        self.known = {}
+        self.events = 0
+    
+    async def run(self):
+        if CACHE_INVALIDATION_BUS == "off":
+            return
+        if CACHE_INVALIDATION_BUS in ("auto", "change_stream"):
+            try:
+                await self.follow_change_stream()
+                return
+            except Exception as e:
+                if CACHE_INVALIDATION_BUS == "change_stream":
+                    raise
+                logger.info(f"Change streams unavailable ({e}); polling collection_versions instead")
+        await self.poll()
+    
+    async def follow_change_stream(self):
+        self.mode = "change_stream"
+        resume_token = None
+        opened = False
+        while True:
+            try:
+                async with db.collection_versions.watch(full_document="updateLookup", resume_after=resume_token) as stream:
+                    opened = True
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        await self.apply_change(change)
+            except PyMongoError as e:
+                if not opened:
+                    raise
+                # Events may have been missed while the stream was down
+                logger.warning(f"Cache invalidation stream interrupted, resuming: {e}")
+                self.cache.clear()
+                await asyncio.sleep(CACHE_INVALIDATION_POLL_SECONDS)
+                if getattr(e, "code", None) == 286:  # ChangeStreamHistoryLost
+                    resume_token = None
+    
+    async def apply_change(self, change: dict):
+        document = change.get("fullDocument") or {}
+        if change["operationType"] == "insert":
+            collections = list(document.get("versions", {}))
+        elif change["operationType"] == "update":
+            updated = change["updateDescription"]["updatedFields"]
+            if updated.get("updated_by") == WORKER_ID:
+                return
+            collections = [field.split(".", 1)[1] for field in updated if field.startswith("versions.")]
+            # A whole versions object is reported when it was created by this update
+            collections.extend(updated.get("versions", {}))
+        else:
+            return
+        if not document.get("company_id"):
+            self.cache.clear()
+            return
+        self.events += 1
+        await self.cache.invalidate(document["company_id"], *collections, shared=False)
+    
+    async def poll(self):
+        self.mode = "poll"
+        latest = await db.collection_versions.find_one({}, {"_id": 0, "updated_at": 1}, sort=[("updated_at", -1)])
+        since = (latest or {}).get("updated_at") or datetime.utcnow()
+        overlap = timedelta(seconds=CACHE_INVALIDATION_POLL_OVERLAP_SECONDS)
+        while True:
+            await asyncio.sleep(CACHE_INVALIDATION_POLL_SECONDS)
+            try:
+                async for document in db.collection_versions.find(
+                    {"updated_at": {"$gte": since - overlap}},
+                    {"_id": 0, "company_id": 1, "versions": 1, "updated_at": 1}
+                ):
+                    await self.apply_versions(document)
+                    since = max(since, document["updated_at"])
+            except PyMongoError as e:
+                logger.warning(f"Cache invalidation poll failed: {e}")
+                continue
+            self.known = {
+                company_id: known for company_id, known in self.known.items() if known[1] >= since - overlap
+            }
+    
+    async def apply_versions(self, document: dict):
+        versions = document.get("versions", {})
+        previous = self.known.get(document["company_id"])
+        self.known[document["company_id"]] = (versions, document["updated_at"])
+        # Not seen in the current window: any of its collections may have changed
+        changed = [
+            collection for collection, version in versions.items()
+            if previous is None or previous[0].get(collection) != version
+        ]
+        if changed:
+            self.events += 1
+            await self.cache.invalidate(document["company_id"], *changed, shared=False)
+
+cache_invalidation_bus = CacheInvalidationBus(read_cache)
+cache_invalidation_task: Optional[asyncio.Task] = None
+
+# Fleet events
+# Every booking, car, downtime and user change is appended to a per-company event
+# log (fleet_events, numbered by a per-company sequence) and pushed to the open
+# event streams of that company. Streams live as a queue per connection in one
+# hub per worker; the hub receives other workers' events through a change stream
+# on the log, or by polling it. Clients resume from the log after reconnecting.
+FLEET_EVENTS_ENABLED = os.environ.get('FLEET_EVENTS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+FLEET_EVENTS_FEED = os.environ.get('FLEET_EVENTS_FEED', 'auto')  # auto, change_stream, poll
+FLEET_EVENTS_POLL_SECONDS = float(os.environ.get('FLEET_EVENTS_POLL_SECONDS', 1))
+FLEET_EVENTS_RETENTION_HOURS = float(os.environ.get('FLEET_EVENTS_RETENTION_HOURS', 24))
+FLEET_EVENTS_REPLAY_LIMIT = int(os.environ.get('FLEET_EVENTS_REPLAY_LIMIT', 1000))
+FLEET_EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('FLEET_EVENTS_HEARTBEAT_SECONDS', 15))
+# Events a stream may fall behind by before it is closed (the client then resumes from the log)
+FLEET_EVENTS_QUEUE_SIZE = int(os.environ.get('FLEET_EVENTS_QUEUE_SIZE', 256))
+
+class FleetEventHub:
+    """Delivers fleet events to this worker's open event streams, by company"""
+    
+    def __init__(self):
+        self.subscribers = {}
+        self.mode = None
+        # Polling: (company_id, seq) -> created_at of events already delivered in the overlap window
+        self.delivered = {}
+    
+    def subscribe(self, company_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self.subscribers.setdefault(company_id, set()).add(queue)
+        FLEET_EVENT_SUBSCRIBERS.inc()
+        return queue
+    
+    def unsubscribe(self, company_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(company_id, set())
+        if queue in queues:
+            queues.discard(queue)
+            FLEET_EVENT_SUBSCRIBERS.dec()
+        if not queues:
+            self.subscribers.pop(company_id, None)
+    
+    def dispatch(self, event: dict):
+        for queue in list(self.subscribers.get(event["company_id"], ())):
+            if queue.qsize() >= FLEET_EVENTS_QUEUE_SIZE:
+                # Too slow to keep up: end its stream instead of buffering without bound
+                self.unsubscribe(event["company_id"], queue)
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(event)
+    
+    async def replay(self, company_id: str, last_seq: int) -> Optional[List[dict]]:
+        """Events after last_seq from the log, or None if some of them are no longer retained"""
+        events = await db.fleet_events.find(
+            {"company_id": company_id, "seq": {"$gt": last_seq}}, {"_id": 0}
+        ).sort("seq", 1).limit(FLEET_EVENTS_REPLAY_LIMIT + 1).to_list(None)
+        if len(events) > FLEET_EVENTS_REPLAY_LIMIT:
+            return None
+        if events and events[0]["seq"] > last_seq + 1:
+            # Sequence numbers can be skipped (an event that failed to be written, or one
+            # still being written), so a gap only means lost history when the log no
+            # longer reaches back to last_seq
+            retained = await db.fleet_events.find_one(
+                {"company_id": company_id, "seq": {"$lte": last_seq}}, {"_id": 0, "seq": 1}
+            )
+            if retained is None:
+                return None
+        return events
+    
+    async def run(self):
+        if FLEET_EVENTS_FEED in ("auto", "change_stream"):
+            try:
+                await self.follow_change_stream()
+                return
+            except Exception as e:
+                if FLEET_EVENTS_FEED == "change_stream":
+                    raise
+                logger.info(f"Change streams unavailable ({e}); polling fleet_events instead")
+        await self.poll()
+    
+    async def follow_change_stream(self):
+        self.mode = "change_stream"
+        resume_token = None
+        opened = False
+        pipeline = [{"$match": {"operationType": "insert", "fullDocument.worker": {"$ne": WORKER_ID}}}]
+        while True:
+            try:
+                async with db.fleet_events.watch(pipeline, resume_after=resume_token) as stream:
+                    opened = True
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        event = change["fullDocument"]
+                        event.pop("_id", None)
+                        self.dispatch(event)
+            except PyMongoError as e:
+                if not opened:
+                    raise
+                # Streams resume from the log when their client reconnects
+                logger.warning(f"Fleet event stream interrupted, resuming: {e}")
+                await asyncio.sleep(FLEET_EVENTS_POLL_SECONDS)
+                if getattr(e, "code", None) == 286:  # ChangeStreamHistoryLost
+                    resume_token = None
+    
+    async def poll(self):
+        self.mode = "poll"
+        since = datetime.utcnow()
+        overlap = timedelta(seconds=CACHE_INVALIDATION_POLL_OVERLAP_SECONDS)
+        while True:
+            await asyncio.sleep(FLEET_EVENTS_POLL_SECONDS)
+            if not self.subscribers:
+                since = datetime.utcnow()
+                self.delivered = {}
+                continue
+            try:
+                async for event in db.fleet_events.find(
+                    {
+                        "created_at": {"$gte": since - overlap},
+                        "company_id": {"$in": list(self.subscribers)},
+                        "worker": {"$ne": WORKER_ID}
+                    },
+                    {"_id": 0}
+                ).sort("created_at", 1):
+                    key = (event["company_id"], event["seq"])
+                    if key not in self.delivered:
+                        self.delivered[key] = event["created_at"]
+                        self.dispatch(event)
+                    since = max(since, event["created_at"])
+            except PyMongoError as e:
+                logger.warning(f"Fleet event poll failed: {e}")
+                continue
+            self.delivered = {key: created_at for key, created_at in self.delivered.items() if created_at >= since - overlap}
+
+fleet_event_hub = FleetEventHub()
+fleet_event_task: Optional[asyncio.Task] = None
+
+async def publish_fleet_event(company_id: str, entity: str, action: str, data: dict):
+    """Append a change to the company's event log and push it to this worker's streams.
+    
+    Called after the change has been written, so failures are logged rather than
+    raised: the write succeeded and must not be reported (and retried) as failed.
+    Streams miss the event; its sequence number is simply skipped.
+    """
+    if not FLEET_EVENTS_ENABLED:
+        return
+    try:
+        sequence = await db.fleet_event_sequences.find_one_and_update(
+            {"company_id": company_id},
+            {"$inc": {"seq": 1}},
+            projection={"_id": 0, "seq": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        event = {
+            "company_id": company_id,
+            "seq": sequence["seq"],
+            "event": f"{entity}.{action}",
+            "data": data,
+            "worker": WORKER_ID,
+            "created_at": datetime.utcnow()
+        }
+        await db.fleet_events.insert_one(event)
+    except Exception as e:
+        logger.warning(f"Failed to publish {entity}.{action} event for company {company_id}: {e}")
+        return
+    event.pop("_id", None)
+    fleet_event_hub.dispatch(event)
+
 # Authentication Helper Functions
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -351,6 +1569,32 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+# Process pool for hashing passwords in bulk (bcrypt is CPU bound and holds the GIL).
+# Its workers run password_hashing.hash_passwords and never import this module.
+password_hash_pool: Optional[ProcessPoolExecutor] = None
+
+def get_password_hash_pool() -> ProcessPoolExecutor:
+    global password_hash_pool
+    if password_hash_pool is None:
+        password_hash_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return password_hash_pool
+
+async def hash_passwords_parallel(passwords: List[str]) -> List[str]:
+    """Hash passwords across all cores, preserving order"""
+    if not passwords:
+        return []
+    workers = os.cpu_count() or 1
+    batch_size = -(-len(passwords) // workers)
+    loop = asyncio.get_running_loop()
+    batches = await asyncio.gather(*(
+        loop.run_in_executor(get_password_hash_pool(), hash_passwords, passwords[i:i + batch_size])
+        for i in range(0, len(passwords), batch_size)
+    ))
+    return [hashed for batch in batches for hashed in batch]
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -361,6 +1605,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Cars and companies marked for deletion are hidden from all reads until their
+# deletion job has removed them
+NOT_DELETED = {"deleted": {"$ne": True}}
+
+async def deleted_cars_filter(company_id: str) -> dict:
+    """Filter hiding the bookings and downtimes of cars marked for deletion"""
+    deleted = await db.cars.distinct("id", {"company_id": company_id, "deleted": True})
+    return {"car_id": {"$nin": deleted}} if deleted else {}
+
 # License Helper Functions
 import secrets
 import string
@@ -409,15 +1662,23 @@ async def check_license_limits(company_id: str, license_doc: dict) -> dict:
         "max_vehicles": license_doc.get("max_vehicles")
     }
     
-    # Check user count
-    users_count = await db.users.count_documents({"company_id": company_id, "is_active": True})
+    # Usage counters are maintained on the license document; only count for
+    # licenses that predate them and have not been backfilled yet
+    users_count = license_doc.get("users_count")
+    vehicles_count = license_doc.get("vehicles_count")
+    counted_users, counted_vehicles = await gather_queries(
+        db.users.count_documents({"company_id": company_id, "is_active": True}) if users_count is None else None,
+        db.cars.count_documents({"company_id": company_id, **NOT_DELETED}) if vehicles_count is None else None
+    )
+    if users_count is None:
+        users_count = counted_users
+    if vehicles_count is None:
+        vehicles_count = counted_vehicles
     limits["users_count"] = users_count
     
     if license_doc.get("max_users"):
         limits["users_within_limit"] = users_count <= license_doc["max_users"]
     
-    # Check vehicle count
-    vehicles_count = await db.cars.count_documents({"company_id": company_id})
     limits["vehicles_count"] = vehicles_count
     
     if license_doc.get("max_vehicles"):
@@ -443,6 +1704,90 @@ async def get_company_license_info(company_id: str) -> Optional[dict]:
         "limits": limits
     }
 
+# License usage counters: resource -> (counter field, limit field)
+LICENSE_USAGE_FIELDS = {
+    "users": ("users_count", "max_users"),
+    "vehicles": ("vehicles_count", "max_vehicles"),
+}
+
+async def get_company_license_id(company_id: str) -> Optional[str]:
+    """Get the id of the license currently assigned to a company"""
+    company = await db.companies.find_one({"id": company_id}, {"_id": 0, "license_id": 1})
+    if not company:
+        return None
+    return company.get("license_id")
+
+async def reserve_license_usage(company_id: str, resource: str, amount: int = 1) -> Optional[str]:
+    """Atomically reserve users/vehicles on the company's license.
+    
+    The counter is only incremented if the result stays within the license
+    limit, so concurrent creates cannot overrun it. Returns the license id the
+    usage was charged to (None if the company has no license and therefore no
+    limit). Raises 403 if the limit would be exceeded.
+    """
+    count_field, max_field = LICENSE_USAGE_FIELDS[resource]
+    license_id = await get_company_license_id(company_id)
+    if not license_id:
+        return None
+    
+    reserved = await db.licenses.find_one_and_update(
+        {
+            "id": license_id,
+            "$or": [
+                # No limit (None, missing or 0 all mean unlimited)
+                {max_field: {"$in": [None, 0]}},
+                {"$expr": {"$lte": [
+                    {"$add": [{"$ifNull": [f"${count_field}", 0]}, amount]},
+                    f"${max_field}"
+                ]}}
+            ]
+        },
+        {"$inc": {count_field: amount}},
+        projection={"_id": 0, "id": 1}
+    )
+    if reserved:
+        return license_id
+    
+    license_doc = await db.licenses.find_one({"id": license_id}, {"_id": 0, max_field: 1})
+    if not license_doc:
+        return None
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"License limit reached. Maximum {resource} allowed: {license_doc[max_field]}"
+    )
+
+async def release_license_usage(license_id: Optional[str], resource: str, amount: int = 1):
+    """Give back previously reserved users/vehicles on a license"""
+    if not license_id or amount <= 0:
+        return
+    count_field, _ = LICENSE_USAGE_FIELDS[resource]
+    await db.licenses.update_one(
+        {"id": license_id, count_field: {"$gte": amount}},
+        {"$inc": {count_field: -amount}}
+    )
+
+async def sync_license_usage(license_id: str, company_id: str):
+    """Recount a company's users and vehicles into its license counters.
+    
+    Only needed when a license is attached to a company that already has
+    data, or to backfill licenses created before the counters existed.
+    """
+    users_count = await db.users.count_documents({"company_id": company_id, "is_active": True})
+    vehicles_count = await db.cars.count_documents({"company_id": company_id, **NOT_DELETED})
+    await db.licenses.update_one(
+        {"id": license_id},
+        {"$set": {"users_count": users_count, "vehicles_count": vehicles_count}}
+    )
+
+async def backfill_license_usage():
+    """Initialise usage counters on assigned licenses that do not have them yet"""
+    cursor = db.licenses.find(
+        {"company_id": {"$ne": None}, "vehicles_count": {"$exists": False}},
+        {"_id": 0, "id": 1, "company_id": 1}
+    )
+    async for license_doc in cursor:
+        await sync_license_usage(license_doc["id"], license_doc["company_id"])
+
 def create_company_slug(name: str) -> str:
     """Create a unique slug from company name"""
     import re
@@ -450,25 +1795,105 @@ def create_company_slug(name: str) -> str:
     slug = re.sub(r'\s+', '-', slug)
     return slug.strip('-')
 
+# Bulk import helpers
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 10000
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+async def read_import_rows(request: Request) -> List[dict]:
+    """Read import rows from a CSV or JSON array body, or from a multipart file upload"""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="No import file uploaded")
+        raw = await upload.read()
+        is_csv = (upload.filename or "").lower().endswith(".csv") or "csv" in (upload.content_type or "")
+    else:
+        raw = await request.body()
+        is_csv = "csv" in content_type
+    
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+    
+    if is_csv:
+        # Empty cells are treated as missing so optional fields fall back to their defaults
+        rows = [
+            {k.strip(): v.strip() for k, v in row.items() if k and v is not None and v.strip() != ""}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    else:
+        try:
+            rows = json.loads(text)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Import body is not valid JSON")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPException(status_code=400, detail="Import body must be a JSON array of objects")
+    
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many rows in import. Maximum allowed: {MAX_IMPORT_ROWS}"
+        )
+    return rows
+
+def format_validation_error(error: ValidationError) -> str:
+    """Flatten a pydantic validation error into a single line for row reports"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
     )
+
+def import_progress_stream(events):
+    """Wrap an async generator of import events as an NDJSON streaming response"""
+    async def body():
+        async for event in events:
+            yield json.dumps(event, default=str) + "\n"
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+async def collect_import_result(events) -> dict:
+    """Drain an import event generator and return its final result event"""
+    result = None
+    async for event in events:
+        result = event
+    return {k: v for k, v in result.items() if k != "event"}
+
+
+CREDENTIALS_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def decode_access_token(token: str) -> dict:
+    """Claims of a valid access token; raises 401 otherwise"""
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.PyJWTError:
-        raise credentials_exception
-    
-    user = await db.users.find_one({"id": user_id})
+        raise CREDENTIALS_EXCEPTION
+    if payload.get("sub") is None:
+        raise CREDENTIALS_EXCEPTION
+    return payload
+
+async def load_user(user_id: str) -> Optional[User]:
+    # Tenant is not known until the user has been loaded
+    user = await unscoped(db.users).find_one({"id": user_id, **NOT_DELETED}, USER_PROJECTION)
     if user is None:
-        raise credentials_exception
-    return User(**user)
+        return None
+    # Stored users were validated on write, but model_construct does not convert
+    # their enum fields back from the strings MongoDB returns
+    user["role"] = UserRole(user["role"])
+    if "language" in user:
+        user["language"] = Language(user["language"])
+    return User.model_construct(**user)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    payload = decode_access_token(credentials.credentials)
+    user = await load_user(payload["sub"])
+    if user is None:
+        raise CREDENTIALS_EXCEPTION
+    return user
 
 async def get_current_manager(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.FLEET_MANAGER:
@@ -478,9 +1903,68 @@ async def get_current_manager(current_user: User = Depends(get_current_user)) ->
         )
     return current_user
 
+# Stream tickets
+# EventSource cannot send an Authorization header, and access tokens must never
+# appear in URLs (they end up in access logs). Browsers instead exchange their
+# token for a short-lived ticket with an authenticated POST and open the stream
+# with ?ticket=. Tickets are stored so any worker can redeem them, and are
+# deleted when redeemed, so each one opens exactly one stream.
+STREAM_TICKET_TTL_SECONDS = int(os.environ.get('STREAM_TICKET_TTL_SECONDS', 30))
+
+async def create_stream_ticket(user: User, token_expires_at: datetime) -> dict:
+    ticket = {
+        "ticket": secrets.token_urlsafe(32),
+        "user_id": user.id,
+        # Streams opened with the ticket end when the token they were issued for expires
+        "token_expires_at": token_expires_at,
+        "expires_at": datetime.utcnow() + timedelta(seconds=STREAM_TICKET_TTL_SECONDS)
+    }
+    await db.stream_tickets.insert_one(ticket)
+    return ticket
+
+async def redeem_stream_ticket(ticket: str) -> Optional[dict]:
+    return await db.stream_tickets.find_one_and_delete(
+        {"ticket": ticket, "expires_at": {"$gt": datetime.utcnow()}},
+        projection={"_id": 0, "user_id": 1, "token_expires_at": 1}
+    )
+
+async def get_stream_user(
+    ticket: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> tuple:
+    """The stream's user and when its access to the stream expires.
+    
+    Accepts a bearer token (for clients that can send headers) or a stream ticket.
+    """
+    if credentials is not None:
+        payload = decode_access_token(credentials.credentials)
+        user_id, expires_at = payload["sub"], datetime.utcfromtimestamp(payload["exp"])
+    elif ticket:
+        redeemed = await redeem_stream_ticket(ticket)
+        if redeemed is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired stream ticket")
+        user_id, expires_at = redeemed["user_id"], redeemed["token_expires_at"]
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = await load_stream_user(user_id)
+    if user is None:
+        raise CREDENTIALS_EXCEPTION
+    return user, expires_at
+
+async def load_stream_user(user_id: str) -> Optional[User]:
+    """The user an event stream is for, or None once they may no longer receive events"""
+    user = await load_user(user_id)
+    if user is None or not user.is_active:
+        return None
+    return user
+
 async def get_user_company(user: User) -> Company:
     """Get the company for the current user"""
-    company = await db.companies.find_one({"id": user.company_id})
+    company = await db.companies.find_one({"id": user.company_id, **NOT_DELETED})
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     return Company(**company)
@@ -570,27 +2054,35 @@ async def assign_license_to_company(validation_data: LicenseValidation, current_
         {"$set": {"license_id": license_doc["id"]}}
     )
     
+    # Start the usage counters from the company's existing users and vehicles
+    await sync_license_usage(license_doc["id"], company.id)
+    await bump_collection_version(company.id, "companies", "licenses")
+    
     return {"message": "License successfully assigned to company"}
 
 @api_router.get("/licenses/company-info")
+@query_budget(max_queries=4)
 async def get_company_license_info_endpoint(current_user: dict = Depends(get_current_user)):
     """Get license information for current user's company"""
-    company = await get_user_company(current_user)
-    license_info = await get_company_license_info(company.id)
-    
-    if not license_info:
+    async def load():
+        company = await get_user_company(current_user)
+        license_info = await get_company_license_info(company.id)
+        
+        if not license_info:
+            return {
+                "has_license": False,
+                "message": "No active license found for company"
+            }
+        
         return {
-            "has_license": False,
-            "message": "No active license found for company"
+            "has_license": True,
+            "license_type": license_info["license_type"],
+            "status": license_info["status"],
+            "expires_date": license_info.get("expires_date"),
+            "limits": license_info["limits"]
         }
     
-    return {
-        "has_license": True,
-        "license_type": license_info["license_type"],
-        "status": license_info["status"],
-        "expires_date": license_info.get("expires_date"),
-        "limits": license_info["limits"]
-    }
+    return trusted_response(await read_cache.get_or_load(current_user.company_id, "license_info", "", load))
 
 # Admin License Management Routes
 @api_router.post("/admin/licenses", response_model=LicenseResponse)
@@ -626,6 +2118,7 @@ async def create_license(license_data: LicenseCreate, current_user: User = Depen
     return LicenseResponse(**license.dict())
 
 @api_router.get("/admin/licenses", response_model=List[LicenseResponse])
+@query_budget(max_queries=3)
 async def list_licenses(current_user: User = Depends(get_current_user)):
     """List all licenses (admin only)"""
     if current_user.role != UserRole.FLEET_MANAGER:
@@ -634,21 +2127,22 @@ async def list_licenses(current_user: User = Depends(get_current_user)):
             detail="Only fleet managers can view licenses"
         )
     
-    licenses_cursor = db.licenses.find({}).sort("issued_date", -1)
-    licenses = []
+    licenses = trusted_documents(
+        LicenseResponse,
+        await db.licenses.find({}, LICENSE_RESPONSE_PROJECTION).sort("issued_date", -1).to_list(None)
+    )
     
-    async for license_doc in licenses_cursor:
-        license_response = LicenseResponse(**license_doc)
-        
-        # Add company name if assigned
-        if license_doc.get("company_id"):
-            company = await db.companies.find_one({"id": license_doc["company_id"]})
-            if company:
-                license_response.company_name = company["name"]
-        
-        licenses.append(license_response)
+    # Add company names for assigned licenses with a single lookup
+    company_ids = list({license_doc["company_id"] for license_doc in licenses if license_doc.get("company_id")})
+    company_names = {}
+    if company_ids:
+        async for company in db.companies.find({"id": {"$in": company_ids}}, {"_id": 0, "id": 1, "name": 1}):
+            company_names[company["id"]] = company["name"]
+    
+    for license_doc in licenses:
+        license_doc["company_name"] = company_names.get(license_doc.get("company_id"))
     
-    return licenses
+    return trusted_response(licenses)
 
 @api_router.delete("/admin/licenses/{license_id}")
 async def revoke_license(license_id: str, current_user: User = Depends(get_current_user)):
@@ -671,17 +2165,96 @@ async def revoke_license(license_id: str, current_user: User = Depends(get_curre
             detail="License not found"
         )
     
+    revoked = await db.licenses.find_one({"id": license_id}, {"_id": 0, "company_id": 1})
+    if revoked and revoked.get("company_id"):
+        await bump_collection_version(revoked["company_id"], "licenses")
+    
     return {"message": "License revoked successfully"}
 
+# Health probes
+# Health endpoints are polled several times a second by compose, the proxy and
+# monitors, so none of them touches MongoDB: a background prober pings it on a
+# fixed interval and they report its last result. Liveness only says the process
+# is serving; readiness also fails on a broken database, a saturated connection
+# pool or a lagging event loop so load balancers can shed load early.
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.environ.get('HEALTH_PROBE_INTERVAL_SECONDS', 5))
+HEALTH_PROBE_TIMEOUT_SECONDS = float(os.environ.get('HEALTH_PROBE_TIMEOUT_SECONDS', 2))
+LOOP_LAG_SAMPLE_SECONDS = float(os.environ.get('LOOP_LAG_SAMPLE_SECONDS', 0.5))
+READINESS_MAX_POOL_SATURATION = float(os.environ.get('READINESS_MAX_POOL_SATURATION', 0.9))
+READINESS_MAX_LOOP_LAG_MS = float(os.environ.get('READINESS_MAX_LOOP_LAG_MS', 250))
+
+class DependencyProber:
+    """Checks MongoDB and the event loop in the background for the health endpoints"""
+    
+    def __init__(self):
+        self.database = "unknown"
+        self.database_latency_ms = None
+        self.checked_at = None
+        # Lag samples from roughly the last five seconds
+        self.lag_samples = deque(maxlen=max(1, int(5 / LOOP_LAG_SAMPLE_SECONDS)))
+        self.tasks = []
+    
+    def start(self):
+        self.tasks = [asyncio.create_task(self.probe_database()), asyncio.create_task(self.measure_loop_lag())]
+    
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+    
+    async def probe_database(self):
+        while True:
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(db.command("ping"), HEALTH_PROBE_TIMEOUT_SECONDS)
+                self.database = "connected"
+            except asyncio.TimeoutError:
+                self.database = f"disconnected: no ping response within {HEALTH_PROBE_TIMEOUT_SECONDS}s"
+            except Exception as e:
+                self.database = f"disconnected: {str(e)}"
+            self.database_latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.checked_at = datetime.utcnow()
+            await asyncio.sleep(HEALTH_PROBE_INTERVAL_SECONDS)
+    
+    async def measure_loop_lag(self):
+        """Sleep for a fixed time and record how late the loop wakes us up"""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LOOP_LAG_SAMPLE_SECONDS)
+            self.lag_samples.append(max(0.0, time.perf_counter() - started - LOOP_LAG_SAMPLE_SECONDS))
+            EVENT_LOOP_LAG.set(max(self.lag_samples))
+    
+    @property
+    def loop_lag_ms(self) -> float:
+        return round(max(self.lag_samples, default=0.0) * 1000, 1)
+    
+    def pool_saturation(self) -> float:
+        """Busiest pool's share of connections in use"""
+        pools = mongo_pool_metrics.stats(mongo_settings.max_pool_size)["pools"]
+        return max((pool["utilization"] or 0.0 for pool in pools), default=0.0)
+    
+    def readiness(self, warmed_up: bool) -> dict:
+        checks = {
+            "warmup": warmed_up,
+            "database": self.database == "connected",
+            "pool_saturation": self.pool_saturation() < READINESS_MAX_POOL_SATURATION,
+            "event_loop_lag": self.loop_lag_ms < READINESS_MAX_LOOP_LAG_MS,
+        }
+        return {
+            "ready": all(checks.values()),
+            "checks": checks,
+            "database": self.database,
+            "database_latency_ms": self.database_latency_ms,
+            "checked_at": self.checked_at,
+            "pool_saturation": round(self.pool_saturation(), 3),
+            "event_loop_lag_ms": self.loop_lag_ms,
+        }
+
+dependency_prober = DependencyProber()
+
 @api_router.get("/health")
 async def health_check():
-    """Health check endpoint for monitoring and load balancers"""
-    try:
-        # Test database connectivity
-        await db.command("ping")
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"disconnected: {str(e)}"
+    """Health check endpoint for monitoring and load balancers (last background probe result)"""
+    db_status = dependency_prober.database
     
     return {
         "status": "healthy" if db_status == "connected" else "unhealthy",
@@ -691,12 +2264,42 @@ async def health_check():
         "database": db_status
     }
 
+@api_router.get("/health/live")
+async def liveness_check():
+    """Liveness: the process is up and its event loop is serving requests"""
+    return {"status": "alive"}
+
+@api_router.get("/health/ready")
+async def readiness_check(request: Request):
+    """Readiness: warmup done, database reachable, pool and event loop not saturated"""
+    state = request.app.state
+    body = {**dependency_prober.readiness(state.ready), "warmup_ms": state.warmup_timings}
+    if not body["ready"]:
+        return FastJSONResponse(body, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return body
+
+@api_router.get("/health/extended")
+async def extended_health_check():
+    """Health check with MongoDB client configuration and connection pool usage"""
+    health = await health_check()
+    health["mongodb"] = {
+        "settings": mongo_settings.model_dump(),
+        **mongo_pool_metrics.stats(mongo_settings.max_pool_size)
+    }
+    return health
+
 @api_router.post("/companies/register", response_model=Token)
 async def register_company(registration_data: CompanyRegistration):
     """Register a new company with fleet manager"""
     
+    # The license and the company and manager emails are checked concurrently
+    license_doc, existing_company, existing_user = await gather_queries(
+        validate_license_key(registration_data.license_key),
+        db.companies.find_one({"email": registration_data.company_email}, {"_id": 0, "id": 1}),
+        unscoped(db.users).find_one({"email": registration_data.manager_email}, {"_id": 0, "id": 1})
+    )
+    
     # Validate license key first
-    license_doc = await validate_license_key(registration_data.license_key)
     if not license_doc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -711,7 +2314,6 @@ async def register_company(registration_data: CompanyRegistration):
         )
     
     # Check if company email already exists
-    existing_company = await db.companies.find_one({"email": registration_data.company_email})
     if existing_company:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -719,7 +2321,6 @@ async def register_company(registration_data: CompanyRegistration):
         )
     
     # Check if manager email already exists
-    existing_user = await db.users.find_one({"email": registration_data.manager_email})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -747,13 +2348,15 @@ async def register_company(registration_data: CompanyRegistration):
     
     await db.companies.insert_one(company.dict())
     
-    # Assign license to company
+    # Assign license to company; the new company starts with its fleet manager
     await db.licenses.update_one(
         {"license_key": registration_data.license_key},
         {
             "$set": {
                 "company_id": company.id,
-                "activated_date": datetime.utcnow()
+                "activated_date": datetime.utcnow(),
+                "users_count": 1,
+                "vehicles_count": 0
             }
         }
     )
@@ -788,27 +2391,39 @@ async def register_company(registration_data: CompanyRegistration):
     )
 
 @api_router.get("/companies/me", response_model=CompanyResponse)
+@query_budget(max_queries=5)
 async def get_my_company(current_user: User = Depends(get_current_user)):
     """Get current user's company information"""
-    company = await get_user_company(current_user)
-    
-    # Add stats for managers
-    if current_user.role == UserRole.FLEET_MANAGER:
-        total_cars = await db.cars.count_documents({"company_id": current_user.company_id})
-        total_users = await db.users.count_documents({"company_id": current_user.company_id})
-        total_bookings = await db.bookings.count_documents({"company_id": current_user.company_id})
-        
-        stats = {
-            "total_cars": total_cars,
-            "total_users": total_users,
-            "total_bookings": total_bookings
-        }
+    return trusted_response(await load_company(current_user))
+
+async def load_company(current_user: User) -> dict:
+    """Company information (with stats for managers), through the read cache"""
+    async def load():
+        # Add stats for managers
+        if current_user.role == UserRole.FLEET_MANAGER:
+            hidden_bookings = await deleted_cars_filter(current_user.company_id)
+            company, total_cars, total_users, total_bookings = await gather_queries(
+                get_user_company(current_user),
+                db.cars.count_documents({"company_id": current_user.company_id, **NOT_DELETED}),
+                db.users.count_documents({"company_id": current_user.company_id}),
+                db.bookings.count_documents({"company_id": current_user.company_id, **hidden_bookings})
+            )
+            
+            stats = {
+                "total_cars": total_cars,
+                "total_users": total_users,
+                "total_bookings": total_bookings
+            }
+            
+            company_response = CompanyResponse(**company.dict())
+            company_response.stats = stats
+            return company_response.model_dump()
         
-        company_response = CompanyResponse(**company.dict())
-        company_response.stats = stats
-        return company_response
+        company = await get_user_company(current_user)
+        return CompanyResponse(**company.dict()).model_dump()
     
-    return CompanyResponse(**company.dict())
+    # Only managers see the stats, so the role is part of the key
+    return await read_cache.get_or_load(current_user.company_id, "company", current_user.role.value, load)
 
 @api_router.put("/companies/me", response_model=CompanyResponse)
 async def update_my_company(company_update: CompanyUpdate, current_manager: User = Depends(get_current_manager)):
@@ -818,16 +2433,50 @@ async def update_my_company(company_update: CompanyUpdate, current_manager: User
         raise HTTPException(status_code=400, detail="No update data provided")
     
     result = await db.companies.update_one(
-        {"id": current_manager.company_id}, 
+        {"id": current_manager.company_id, **NOT_DELETED}, 
         {"$set": update_data}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Company not found")
+    await bump_collection_version(current_manager.company_id, "companies")
     
     updated_company = await get_user_company(current_manager)
     return CompanyResponse(**updated_company.dict())
 
+@api_router.delete("/companies/me")
+async def delete_my_company(current_manager: User = Depends(get_current_manager)):
+    """Offboard the company (managers only).
+    
+    The company is deactivated and hidden immediately; its users, bookings,
+    downtimes and cars are removed by a background job.
+    """
+    result = await db.companies.update_one(
+        {"id": current_manager.company_id, **NOT_DELETED},
+        {"$set": {"deleted": True, "is_active": False, "deleted_at": datetime.utcnow()}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Company not found")
+    # Its users can no longer authenticate, even with tokens issued before
+    await db.users.update_many(
+        {"company_id": current_manager.company_id},
+        {"$set": {"deleted": True, "is_active": False}}
+    )
+    await bump_collection_version(current_manager.company_id, "companies", "users")
+    
+    job = await enqueue_deletion_job(
+        current_manager.company_id, DeletionTarget.COMPANY, current_manager.company_id, current_manager.id
+    )
+    return {"message": "Company deletion scheduled", "job_id": job.id}
+
+@api_router.get("/jobs/{job_id}", response_model=DeletionJobResponse)
+async def get_deletion_job(job_id: str, current_manager: User = Depends(get_current_manager)):
+    """Get the status of a deletion job (managers only)"""
+    job = await db.deletion_jobs.find_one({"id": job_id, "company_id": current_manager.company_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return DeletionJobResponse(**job)
+
 # Authentication routes
 @api_router.post("/auth/register", response_model=Token)
 async def register_user(user_data: UserCreate):
@@ -840,7 +2489,10 @@ async def register_user(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=Token)
 async def login_user(user_credentials: UserLogin):
     # Find user by email
-    user = await db.users.find_one({"email": user_credentials.email})
+    # The only read that fetches password_hash
+    user = await unscoped(db.users).find_one(
+        {"email": user_credentials.email, **NOT_DELETED}, {**USER_RESPONSE_PROJECTION, "password_hash": 1}
+    )
     if not user or not verify_password(user_credentials.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -849,7 +2501,7 @@ async def login_user(user_credentials: UserLogin):
         )
     
     # Get user's company
-    company = await db.companies.find_one({"id": user["company_id"]})
+    company = await db.companies.find_one({"id": user["company_id"], **NOT_DELETED})
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
@@ -875,36 +2527,42 @@ async def login_user(user_credentials: UserLogin):
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return UserResponse(**current_user.dict())
+    return trusted_response({name: getattr(current_user, name) for name in UserResponse.model_fields})
 
 # User Management routes (only for managers)
 @api_router.get("/users", response_model=List[UserResponse])
-async def get_all_users(current_manager: User = Depends(get_current_manager)):
-    users = await db.users.find({"company_id": current_manager.company_id}).to_list(1000)
-    return [UserResponse(**{k: v for k, v in user.items() if k != "password_hash"}) for user in users]
+@query_budget(max_queries=3)
+async def get_all_users(
+    request: Request,
+    fields: Optional[str] = None,
+    current_manager: User = Depends(get_current_manager)
+):
+    selected = parse_fields(UserResponse, fields)
+    etag = await collection_etag(request, current_manager, "users")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    return trusted_response(await load_users(current_manager.company_id, selected), headers=etag_headers(etag))
+
+async def load_users(company_id: str, fields: Optional[tuple] = None) -> List[dict]:
+    projection = fields_projection(fields, USER_RESPONSE_PROJECTION)
+    users = await db.users.find({"company_id": company_id}, projection).to_list(1000)
+    return trusted_documents(UserResponse, users, fields)
 
 @api_router.post("/users", response_model=UserResponse)
 async def create_user_by_manager(user_data: UserCreate, current_manager: User = Depends(get_current_manager)):
-    # Check license limits
-    license_info = await get_company_license_info(current_manager.company_id)
-    if license_info and license_info.get("limits", {}).get("max_users"):
-        current_users = license_info["limits"]["users_count"]
-        max_users = license_info["limits"]["max_users"]
-        
-        if current_users >= max_users:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"License limit reached. Maximum users allowed: {max_users}"
-            )
-    
-    # Check if user already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
+    # Check if user already exists (emails are unique across companies)
+    existing_user = await unscoped(db.users).find_one({"email": user_data.email}, {"_id": 0, "id": 1})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # Reserve a seat on the license (raises if the limit is reached)
+    license_id = await reserve_license_usage(current_manager.company_id, "users")
+    
     # Create new user
     hashed_password = get_password_hash(user_data.password)
     user = User(
@@ -919,9 +2577,102 @@ async def create_user_by_manager(user_data: UserCreate, current_manager: User =
     # Store user with hashed password
     user_dict = user.dict()
     user_dict["password_hash"] = hashed_password
-    await db.users.insert_one(user_dict)
-    
-    return UserResponse(**user.dict())
+    try:
+        await db.users.insert_one(user_dict)
+    except Exception:
+        await release_license_usage(license_id, "users")
+        raise
+    await bump_collection_version(current_manager.company_id, "users")
+    
+    response = UserResponse(**user.dict())
+    await publish_fleet_event(current_manager.company_id, "user", "created", response.dict())
+    return response
+
+async def hash_import_passwords(documents: List[dict]) -> List[dict]:
+    """Replace the plain-text passwords of a chunk of imported users with hashes"""
+    passwords = [document.pop("password") for document in documents]
+    for document, hashed_password in zip(documents, await hash_passwords_parallel(passwords)):
+        document["password_hash"] = hashed_password
+    return documents
+
+@api_router.post("/users/import", response_model=ImportResult)
+async def import_users(request: Request, stream: bool = False, current_manager: User = Depends(get_current_manager)):
+    """Bulk import users from a CSV file or JSON array (managers only).
+    
+    Same row reporting and ``stream`` behaviour as the car import. Passwords are
+    hashed in parallel on a process pool, one chunk at a time.
+    """
+    rows = await read_import_rows(request)
+    company_id = current_manager.company_id
+    errors: List[ImportRowError] = []
+    users = []  # (row number, UserCreate)
+    seen_emails = set()
+    
+    for row_number, row in enumerate(rows, start=1):
+        email = row.get("email")
+        try:
+            user_data = UserCreate(**row)
+        except ValidationError as e:
+            errors.append(ImportRowError(
+                row=row_number,
+                key=str(email) if email is not None else None,
+                error=format_validation_error(e)
+            ))
+            continue
+        if user_data.email in seen_emails:
+            errors.append(ImportRowError(
+                row=row_number,
+                key=user_data.email,
+                error="Duplicate email in import file"
+            ))
+            continue
+        seen_emails.add(user_data.email)
+        users.append((row_number, user_data))
+    
+    # Check all emails against existing users in a single query
+    if users:
+        existing_emails = {
+            user["email"]
+            async for user in unscoped(db.users).find(
+                {"email": {"$in": [user_data.email for _, user_data in users]}},
+                {"_id": 0, "email": 1}
+            )
+        }
+        if existing_emails:
+            for row_number, user_data in users:
+                if user_data.email in existing_emails:
+                    errors.append(ImportRowError(row=row_number, key=user_data.email, error="Email already registered"))
+            users = [(row_number, user_data) for row_number, user_data in users if user_data.email not in existing_emails]
+    
+    # Reserve seats for the whole batch at once (raises if over the limit)
+    license_id = await reserve_license_usage(company_id, "users", len(users)) if users else None
+    
+    import_rows = []
+    for row_number, user_data in users:
+        user = User(
+            company_id=company_id,
+            name=user_data.name,
+            email=user_data.email,
+            role=user_data.role,
+            department=user_data.department,
+            phone=user_data.phone,
+            language=user_data.language
+        )
+        import_rows.append((row_number, user.email, {**user.dict(), "password": user_data.password}))
+    
+    events = insert_import_rows(
+        tenant_db(company_id).users,
+        import_rows,
+        errors,
+        len(rows),
+        license_id,
+        "users",
+        "Email already registered",
+        prepare_chunk=hash_import_passwords
+    )
+    if stream:
+        return import_progress_stream(events)
+    return await collect_import_result(events)
 
 @api_router.put("/users/{user_id}", response_model=UserResponse)
 async def update_user(user_id: str, user_data: UserUpdate, current_user: User = Depends(get_current_user)):
@@ -932,16 +2683,11 @@ async def update_user(user_id: str, user_data: UserUpdate, current_user: User =
             detail="You can only update your own profile"
         )
     
-    # For managers, verify user belongs to their company
-    if current_user.role == UserRole.FLEET_MANAGER:
-        target_user = await db.users.find_one({"id": user_id, "company_id": current_user.company_id})
-        if not target_user:
-            raise HTTPException(status_code=404, detail="User not found")
-    else:
-        # For regular users, just verify it's their own profile
-        target_user = await db.users.find_one({"id": user_id})
-        if not target_user or target_user["id"] != current_user.id:
-            raise HTTPException(status_code=404, detail="User not found")
+    # Verify user belongs to the caller's company
+    users = tenant_db(current_user.company_id).users
+    target_user = await users.find_one({"id": user_id}, {"_id": 0, "id": 1})
+    if not target_user:
+        raise HTTPException(status_code=404, detail="User not found")
     
     # Prepare update data
     update_data = {}
@@ -961,22 +2707,26 @@ async def update_user(user_id: str, user_data: UserUpdate, current_user: User =
         )
     
     # Update the user
-    result = await db.users.update_one(
+    result = await users.update_one(
         {"id": user_id},
         {"$set": update_data}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    await bump_collection_version(current_user.company_id, "users")
     
     # Return updated user
-    updated_user = await db.users.find_one({"id": user_id})
-    return UserResponse(**{k: v for k, v in updated_user.items() if k != "password_hash"})
+    updated_user = await users.find_one({"id": user_id}, USER_RESPONSE_PROJECTION)
+    await publish_fleet_event(current_user.company_id, "user", "updated", updated_user)
+    return trusted_response(trusted_document(UserResponse, updated_user))
 
 @api_router.delete("/users/{user_id}")
 async def delete_user(user_id: str, current_manager: User = Depends(get_current_manager)):
     # Check if user belongs to the same company
-    user_to_delete = await db.users.find_one({"id": user_id, "company_id": current_manager.company_id})
+    user_to_delete = await db.users.find_one(
+        {"id": user_id, "company_id": current_manager.company_id}, {"_id": 0, "role": 1, "is_active": 1}
+    )
     if not user_to_delete:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -992,17 +2742,24 @@ async def delete_user(user_id: str, current_manager: User = Depends(get_current_
                 detail="Cannot delete the last fleet manager"
             )
     
-    result = await db.users.delete_one({"id": user_id})
+    result = await db.users.delete_one({"id": user_id, "company_id": current_manager.company_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    
+    if user_to_delete.get("is_active", True):
+        license_id = await get_company_license_id(current_manager.company_id)
+        await release_license_usage(license_id, "users")
+    await bump_collection_version(current_manager.company_id, "users")
+    await publish_fleet_event(current_manager.company_id, "user", "deleted", {"id": user_id})
     return {"message": "User deleted successfully"}
 
 # Booking Helper Functions
-async def check_car_availability(car_id: str, start_date: datetime, end_date: datetime, exclude_booking_id: Optional[str] = None):
+async def check_car_availability(company_id: str, car_id: str, start_date: datetime, end_date: datetime, exclude_booking_id: Optional[str] = None):
     """Check if a car is available for booking during the specified period"""
+    tdb = tenant_db(company_id)
     
     # Check if car exists and is not in permanent downtime
-    car = await db.cars.find_one({"id": car_id})
+    car = await tdb.cars.find_one({"id": car_id, **NOT_DELETED})
     if not car:
         return False, "Car not found"
     
@@ -1021,7 +2778,7 @@ async def check_car_availability(car_id: str, start_date: datetime, end_date: da
         ]
     }
     
-    existing_downtime = await db.downtimes.find_one(downtime_query)
+    existing_downtime = await tdb.downtimes.find_one(downtime_query)
     if existing_downtime:
         return False, "Car has scheduled downtime during this period"
     
@@ -1040,77 +2797,133 @@ async def check_car_availability(car_id: str, start_date: datetime, end_date: da
     if exclude_booking_id:
         booking_query["id"] = {"$ne": exclude_booking_id}
     
-    existing_booking = await db.bookings.find_one(booking_query)
+    existing_booking = await tdb.bookings.find_one(booking_query)
     if existing_booking:
         return False, "Car is already booked during this period"
     
     return True, "Car is available"
 
-async def get_booking_with_details(booking_id: str):
+# Fields of cars and users embedded in booking responses
+BOOKING_CAR_PROJECTION = {"_id": 0, "id": 1, "make": 1, "model": 1, "year": 1, "license_plate": 1, "category": 1}
+BOOKING_USER_PROJECTION = {"_id": 0, "id": 1, "name": 1, "email": 1, "department": 1}
+
+async def add_booking_details(company_id: str, booking: dict) -> dict:
+    """Add car, user, and approver details to a booking document"""
+    tdb = tenant_db(company_id)
+    
+    # Car, user and approver (if any) details
+    car, user, approver = await gather_queries(
+        tdb.cars.find_one({"id": booking["car_id"], **NOT_DELETED}, BOOKING_CAR_PROJECTION),
+        tdb.users.find_one({"id": booking["user_id"]}, BOOKING_USER_PROJECTION),
+        tdb.users.find_one({"id": booking["approved_by"]}, BOOKING_USER_PROJECTION) if booking.get("approved_by") else None
+    )
+    
+    return embed_booking_details(booking, car, user, approver)
+
+async def add_bookings_details(company_id: str, bookings: List[dict]) -> List[dict]:
+    """add_booking_details for a list of bookings, with one query for all cars and one for all users"""
+    if not bookings:
+        return bookings
+    tdb = tenant_db(company_id)
+    car_ids = list({booking["car_id"] for booking in bookings})
+    user_ids = list(
+        {booking["user_id"] for booking in bookings}
+        | {booking["approved_by"] for booking in bookings if booking.get("approved_by")}
+    )
+    cars = {
+        car["id"]: car
+        async for car in tdb.cars.find({"id": {"$in": car_ids}, **NOT_DELETED}, BOOKING_CAR_PROJECTION)
+    }
+    users = {user["id"]: user async for user in tdb.users.find({"id": {"$in": user_ids}}, BOOKING_USER_PROJECTION)}
+    return [
+        embed_booking_details(
+            booking, cars.get(booking["car_id"]), users.get(booking["user_id"]), users.get(booking.get("approved_by"))
+        )
+        for booking in bookings
+    ]
+
+# Detail fields of BookingResponse and the booking fields they are looked up by
+BOOKING_DETAIL_FIELDS = ("car_info", "user_info", "approver_info")
+BOOKING_DETAIL_KEYS = ("car_id", "user_id", "approved_by")
+
+def booking_projection(fields: Optional[tuple]) -> dict:
+    """Projection for a booking read; selected detail fields also fetch the ids they need"""
+    if fields is None:
+        return BOOKING_PROJECTION
+    stored = [name for name in fields if name not in BOOKING_DETAIL_FIELDS]
+    if len(stored) < len(fields):
+        stored.extend(BOOKING_DETAIL_KEYS)
+    return fields_projection(stored, BOOKING_PROJECTION)
+
+def embed_booking_details(booking: dict, car: Optional[dict], user: Optional[dict], approver: Optional[dict]) -> dict:
+    booking["car_info"] = {
+        "make": car["make"],
+        "model": car["model"],
+        "year": car["year"],
+        "license_plate": car["license_plate"],
+        "category": car["category"]
+    } if car else None
+    booking["user_info"] = {
+        "name": user["name"],
+        "email": user["email"],
+        "department": user.get("department")
+    } if user else None
+    booking["approver_info"] = {
+        "name": approver["name"],
+        "email": approver["email"]
+    } if approver else None
+    
+    return booking
+
+async def get_booking_with_details(company_id: str, booking_id: str) -> Optional[dict]:
     """Get booking with car, user, and approver details"""
-    booking = await db.bookings.find_one({"id": booking_id})
+    booking = await tenant_db(company_id).bookings.find_one({"id": booking_id}, BOOKING_PROJECTION)
     if not booking:
         return None
-    
-    # Get car details
-    car = await db.cars.find_one({"id": booking["car_id"]})
-    
-    # Get user details
-    user = await db.users.find_one({"id": booking["user_id"]})
-    
-    # Get approver details if exists
-    approver = None
-    if booking.get("approved_by"):
-        approver = await db.users.find_one({"id": booking["approved_by"]})
-    
-    # Build response
-    booking_response = BookingResponse(**booking)
-    if car:
-        booking_response.car_info = {
-            "make": car["make"],
-            "model": car["model"],
-            "year": car["year"],
-            "license_plate": car["license_plate"],
-            "category": car["category"]
-        }
-    if user:
-        booking_response.user_info = {
-            "name": user["name"],
-            "email": user["email"],
-            "department": user.get("department")
-        }
-    if approver:
-        booking_response.approver_info = {
-            "name": approver["name"],
-            "email": approver["email"]
-        }
-    
-    return booking_response
+    return await add_booking_details(company_id, booking)
+
+async def load_bookings(user: User, fields: Optional[tuple] = None) -> List[dict]:
+    """Bookings with details - all for managers, own bookings for regular users"""
+    bookings_collection = tenant_db(user.company_id).bookings
+    if user.role == UserRole.FLEET_MANAGER:
+        # Managers can see all bookings of their company
+        query = {}
+    else:
+        # Regular users can only see their own bookings
+        query = {"user_id": user.id}
+    query.update(await deleted_cars_filter(user.company_id))
+    bookings = await bookings_collection.find(query, booking_projection(fields)).sort("created_at", -1).to_list(1000)
+    if fields is None:
+        return await add_bookings_details(user.company_id, bookings)
+    
+    # Details are only looked up when one of them was selected
+    if any(name in BOOKING_DETAIL_FIELDS for name in fields):
+        bookings = await add_bookings_details(user.company_id, bookings)
+    return [select_fields(booking, fields) for booking in bookings]
 
 # Booking routes
 @api_router.get("/bookings", response_model=List[BookingResponse])
-async def get_bookings(current_user: User = Depends(get_current_user)):
+@query_budget(max_queries=6)
+async def get_bookings(request: Request, fields: Optional[str] = None, current_user: User = Depends(get_current_user)):
     """Get bookings - all for managers, own bookings for regular users"""
-    if current_user.role == UserRole.FLEET_MANAGER:
-        # Managers can see all bookings
-        bookings = await db.bookings.find().sort("created_at", -1).to_list(1000)
-    else:
-        # Regular users can only see their own bookings
-        bookings = await db.bookings.find({"user_id": current_user.id}).sort("created_at", -1).to_list(1000)
-    
-    # Get detailed booking information
-    detailed_bookings = []
-    for booking in bookings:
-        detailed_booking = await get_booking_with_details(booking["id"])
-        if detailed_booking:
-            detailed_bookings.append(detailed_booking)
-    
-    return detailed_bookings
+    selected = parse_fields(BookingResponse, fields)
+    # Bookings embed car and user details
+    etag = await collection_etag(request, current_user, "bookings", "cars", "users")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    return trusted_response(await load_bookings(current_user, selected), headers=etag_headers(etag))
 
 @api_router.get("/bookings/{booking_id}", response_model=BookingResponse)
-async def get_booking(booking_id: str, current_user: User = Depends(get_current_user)):
+async def get_booking(booking_id: str, fields: Optional[str] = None, current_user: User = Depends(get_current_user)):
     """Get specific booking details"""
-    booking = await db.bookings.find_one({"id": booking_id})
+    selected = parse_fields(BookingResponse, fields)
+    # user_id is always needed for the access check
+    projection = {**booking_projection(selected), "user_id": 1}
+    booking = await tenant_db(current_user.company_id).bookings.find_one(
+        {"id": booking_id, **await deleted_cars_filter(current_user.company_id)}, projection
+    )
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -1118,8 +2931,11 @@ async def get_booking(booking_id: str, current_user: User = Depends(get_current_
     if current_user.role != UserRole.FLEET_MANAGER and booking["user_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    detailed_booking = await get_booking_with_details(booking_id)
-    return detailed_booking
+    if selected is None:
+        return trusted_response(await add_booking_details(current_user.company_id, booking))
+    if any(name in BOOKING_DETAIL_FIELDS for name in selected):
+        booking = await add_booking_details(current_user.company_id, booking)
+    return trusted_response(select_fields(booking, selected))
 
 @api_router.post("/bookings", response_model=BookingResponse)
 async def create_booking(booking_data: BookingCreate, current_user: User = Depends(get_current_user)):
@@ -1134,6 +2950,7 @@ async def create_booking(booking_data: BookingCreate, current_user: User = Depen
     
     # Check car availability
     available, message = await check_car_availability(
+        current_user.company_id,
         booking_data.car_id, 
         booking_data.start_date, 
         booking_data.end_date
@@ -1152,17 +2969,22 @@ async def create_booking(booking_data: BookingCreate, current_user: User = Depen
         purpose=booking_data.purpose
     )
     
-    await db.bookings.insert_one(booking.dict())
+    booking_dict = booking.dict()
+    await db.bookings.insert_one(booking_dict)
+    booking_dict.pop("_id", None)
+    await bump_collection_version(current_user.company_id, "bookings")
     
     # Return detailed booking
-    detailed_booking = await get_booking_with_details(booking.id)
-    return detailed_booking
+    detailed_booking = await add_booking_details(current_user.company_id, booking_dict)
+    await publish_fleet_event(current_user.company_id, "booking", "created", detailed_booking)
+    return trusted_response(detailed_booking)
 
 @api_router.put("/bookings/{booking_id}", response_model=BookingResponse)
 async def update_booking(booking_id: str, booking_update: BookingUpdate, current_user: User = Depends(get_current_user)):
     """Update booking (only by owner and only if pending)"""
+    bookings_collection = tenant_db(current_user.company_id).bookings
     
-    booking = await db.bookings.find_one({"id": booking_id})
+    booking = await bookings_collection.find_one({"id": booking_id})
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -1188,6 +3010,7 @@ async def update_booking(booking_id: str, booking_update: BookingUpdate, current
             raise HTTPException(status_code=400, detail="End date must be after start date")
         
         available, message = await check_car_availability(
+            current_user.company_id,
             booking["car_id"], 
             new_start, 
             new_end,
@@ -1198,19 +3021,22 @@ async def update_booking(booking_id: str, booking_update: BookingUpdate, current
             raise HTTPException(status_code=400, detail=message)
     
     # Update booking
-    result = await db.bookings.update_one({"id": booking_id}, {"$set": update_data})
+    result = await bookings_collection.update_one({"id": booking_id}, {"$set": update_data})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Booking not found")
+    await bump_collection_version(current_user.company_id, "bookings")
     
     # Return updated booking
-    detailed_booking = await get_booking_with_details(booking_id)
-    return detailed_booking
+    detailed_booking = await get_booking_with_details(current_user.company_id, booking_id)
+    await publish_fleet_event(current_user.company_id, "booking", "updated", detailed_booking)
+    return trusted_response(detailed_booking)
 
 @api_router.put("/bookings/{booking_id}/approve", response_model=BookingResponse)
 async def approve_reject_booking(booking_id: str, approval_data: BookingApproval, current_manager: User = Depends(get_current_manager)):
     """Approve or reject a booking (managers only)"""
+    bookings_collection = tenant_db(current_manager.company_id).bookings
     
-    booking = await db.bookings.find_one({"id": booking_id})
+    booking = await bookings_collection.find_one({"id": booking_id})
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -1220,6 +3046,7 @@ async def approve_reject_booking(booking_id: str, approval_data: BookingApproval
     # If approving, check availability again
     if approval_data.status == BookingStatus.APPROVED:
         available, message = await check_car_availability(
+            current_manager.company_id,
             booking["car_id"], 
             booking["start_date"], 
             booking["end_date"],
@@ -1239,19 +3066,22 @@ async def approve_reject_booking(booking_id: str, approval_data: BookingApproval
     if approval_data.status == BookingStatus.REJECTED and approval_data.rejection_reason:
         update_data["rejection_reason"] = approval_data.rejection_reason
     
-    result = await db.bookings.update_one({"id": booking_id}, {"$set": update_data})
+    result = await bookings_collection.update_one({"id": booking_id}, {"$set": update_data})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Booking not found")
+    await bump_collection_version(current_manager.company_id, "bookings")
     
     # Return updated booking
-    detailed_booking = await get_booking_with_details(booking_id)
-    return detailed_booking
+    detailed_booking = await get_booking_with_details(current_manager.company_id, booking_id)
+    await publish_fleet_event(current_manager.company_id, "booking", approval_data.status.value, detailed_booking)
+    return trusted_response(detailed_booking)
 
 @api_router.delete("/bookings/{booking_id}")
 async def cancel_booking(booking_id: str, current_user: User = Depends(get_current_user)):
     """Cancel a booking"""
+    bookings_collection = tenant_db(current_user.company_id).bookings
     
-    booking = await db.bookings.find_one({"id": booking_id})
+    booking = await bookings_collection.find_one({"id": booking_id})
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -1263,13 +3093,20 @@ async def cancel_booking(booking_id: str, current_user: User = Depends(get_curre
         raise HTTPException(status_code=400, detail="Cannot cancel completed or already cancelled bookings")
     
     # Update booking status to cancelled
-    result = await db.bookings.update_one(
+    result = await bookings_collection.update_one(
         {"id": booking_id}, 
         {"$set": {"status": BookingStatus.CANCELLED}}
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Booking not found")
+    await bump_collection_version(current_user.company_id, "bookings")
+    await publish_fleet_event(current_user.company_id, "booking", "cancelled", {
+        "id": booking_id,
+        "car_id": booking["car_id"],
+        "user_id": booking["user_id"],
+        "status": BookingStatus.CANCELLED
+    })
     
     return {"message": "Booking cancelled successfully"}
 
@@ -1277,7 +3114,7 @@ async def cancel_booking(booking_id: str, current_user: User = Depends(get_curre
 async def check_car_availability_endpoint(car_id: str, start_date: datetime, end_date: datetime, current_user: User = Depends(get_current_user)):
     """Check if a car is available for booking"""
     
-    available, message = await check_car_availability(car_id, start_date, end_date)
+    available, message = await check_car_availability(current_user.company_id, car_id, start_date, end_date)
     
     return {
         "available": available,
@@ -1289,28 +3126,28 @@ async def check_car_availability_endpoint(car_id: str, start_date: datetime, end
 
 # Car routes
 @api_router.get("/cars", response_model=List[Car])
-async def get_cars(current_user: User = Depends(get_current_user)):
-    cars = await db.cars.find({"company_id": current_user.company_id}).to_list(1000)
-    return [Car(**car) for car in cars]
+@query_budget(max_queries=3)
+async def get_cars(request: Request, fields: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    selected = parse_fields(Car, fields)
+    etag = await collection_etag(request, current_user, "cars")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    return trusted_response(await load_cars(current_user.company_id, selected), headers=etag_headers(etag))
+
+async def load_cars(company_id: str, fields: Optional[tuple] = None) -> List[dict]:
+    projection = fields_projection(fields, CAR_PROJECTION)
+    cars = await db.cars.find({"company_id": company_id, **NOT_DELETED}, projection).to_list(1000)
+    return trusted_documents(Car, cars, fields)
 
 @api_router.post("/cars", response_model=Car)
 async def create_car(car_data: CarCreate, current_manager: User = Depends(get_current_manager)):
-    # Check license limits
-    license_info = await get_company_license_info(current_manager.company_id)
-    if license_info and license_info.get("limits", {}).get("max_vehicles"):
-        current_vehicles = license_info["limits"]["vehicles_count"]
-        max_vehicles = license_info["limits"]["max_vehicles"]
-        
-        if current_vehicles >= max_vehicles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"License limit reached. Maximum vehicles allowed: {max_vehicles}"
-            )
-    
     # Check for duplicate license plate within company
     existing_car = await db.cars.find_one({
         "company_id": current_manager.company_id,
-        "license_plate": car_data.license_plate
+        "license_plate": car_data.license_plate,
+        **NOT_DELETED
     })
     if existing_car:
         raise HTTPException(
@@ -1318,16 +3155,156 @@ async def create_car(car_data: CarCreate, current_manager: User = Depends(get_cu
             detail="License plate already exists in your fleet"
         )
     
+    # Reserve a vehicle slot on the license (raises if the limit is reached)
+    license_id = await reserve_license_usage(current_manager.company_id, "vehicles")
+    
     car = Car(company_id=current_manager.company_id, **car_data.dict())
-    await db.cars.insert_one(car.dict())
+    try:
+        await db.cars.insert_one(car.dict())
+    except DuplicateKeyError:
+        await release_license_usage(license_id, "vehicles")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="License plate already exists in your fleet"
+        )
+    except Exception:
+        await release_license_usage(license_id, "vehicles")
+        raise
+    await bump_collection_version(current_manager.company_id, "cars")
+    await publish_fleet_event(current_manager.company_id, "car", "created", car.dict())
     return car
 
+async def insert_import_rows(collection, rows: List[tuple], errors: List[ImportRowError], total_rows: int,
+                             license_id: Optional[str], resource: str, duplicate_error: str, prepare_chunk=None):
+    """Insert validated import rows in chunks, yielding a progress event per chunk and a final result event.
+    
+    ``collection`` is a tenant collection; ``rows`` are ``(row number, key,
+    document)`` tuples and ``prepare_chunk`` may transform a chunk's documents
+    before insertion. License usage reserved for rows that end up not being
+    inserted is released.
+    """
+    imported = 0
+    try:
+        for offset in range(0, len(rows), IMPORT_CHUNK_SIZE):
+            chunk = rows[offset:offset + IMPORT_CHUNK_SIZE]
+            documents = [document for _, _, document in chunk]
+            if prepare_chunk:
+                documents = await prepare_chunk(documents)
+            try:
+                await collection.insert_many(documents, ordered=False)
+                imported += len(chunk)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                for write_error in write_errors:
+                    row_number, key, _ = chunk[write_error["index"]]
+                    message = duplicate_error if write_error.get("code") == 11000 else write_error.get("errmsg", "Insert failed")
+                    errors.append(ImportRowError(row=row_number, key=key, error=message))
+                imported += len(chunk) - len(write_errors)
+            
+            yield {
+                "event": "progress",
+                "processed": offset + len(chunk),
+                "total": len(rows),
+                "imported": imported
+            }
+    finally:
+        await release_license_usage(license_id, resource, len(rows) - imported)
+        if imported:
+            await bump_collection_version(collection.company_id, collection.name)
+            # One event for the whole import; clients reload the list
+            await publish_fleet_event(collection.company_id, collection.name.rstrip("s"), "imported", {"count": imported})
+    
+    errors.sort(key=lambda err: err.row)
+    yield {
+        "event": "result",
+        **ImportResult(
+            total_rows=total_rows,
+            imported=imported,
+            failed=total_rows - imported,
+            errors=errors
+        ).dict()
+    }
+
+@api_router.post("/cars/import", response_model=ImportResult)
+async def import_cars(request: Request, stream: bool = False, current_manager: User = Depends(get_current_manager)):
+    """Bulk import cars from a CSV file or JSON array (managers only).
+    
+    Rows are validated individually and reported by row number; valid rows are
+    inserted even if others fail. With ``stream=true`` the response is NDJSON
+    with a progress event per inserted chunk followed by the result.
+    """
+    rows = await read_import_rows(request)
+    company_id = current_manager.company_id
+    errors: List[ImportRowError] = []
+    cars = []  # (row number, Car)
+    seen_plates = set()
+    
+    for row_number, row in enumerate(rows, start=1):
+        plate = row.get("license_plate")
+        try:
+            car_data = CarCreate(**row)
+        except ValidationError as e:
+            errors.append(ImportRowError(
+                row=row_number,
+                key=str(plate) if plate is not None else None,
+                error=format_validation_error(e)
+            ))
+            continue
+        if car_data.license_plate in seen_plates:
+            errors.append(ImportRowError(
+                row=row_number,
+                key=car_data.license_plate,
+                error="Duplicate license plate in import file"
+            ))
+            continue
+        seen_plates.add(car_data.license_plate)
+        cars.append((row_number, Car(company_id=company_id, **car_data.dict())))
+    
+    # Check all plates against the fleet in a single query
+    if cars:
+        existing_plates = {
+            car["license_plate"]
+            async for car in db.cars.find(
+                {"company_id": company_id, "license_plate": {"$in": [car.license_plate for _, car in cars]}, **NOT_DELETED},
+                {"_id": 0, "license_plate": 1}
+            )
+        }
+        if existing_plates:
+            for row_number, car in cars:
+                if car.license_plate in existing_plates:
+                    errors.append(ImportRowError(
+                        row=row_number,
+                        key=car.license_plate,
+                        error="License plate already exists in your fleet"
+                    ))
+            cars = [(row_number, car) for row_number, car in cars if car.license_plate not in existing_plates]
+    
+    # Reserve vehicle slots for the whole batch at once (raises if over the limit)
+    license_id = await reserve_license_usage(company_id, "vehicles", len(cars)) if cars else None
+    
+    events = insert_import_rows(
+        tenant_db(company_id).cars,
+        [(row_number, car.license_plate, car.dict()) for row_number, car in cars],
+        errors,
+        len(rows),
+        license_id,
+        "vehicles",
+        "License plate already exists in your fleet"
+    )
+    if stream:
+        return import_progress_stream(events)
+    return await collect_import_result(events)
+
 @api_router.get("/cars/{car_id}", response_model=Car)
-async def get_car(car_id: str, current_user: User = Depends(get_current_user)):
-    car = await db.cars.find_one({"id": car_id, "company_id": current_user.company_id})
+async def get_car(car_id: str, fields: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    selected = parse_fields(Car, fields)
+    car = await db.cars.find_one(
+        {"id": car_id, "company_id": current_user.company_id, **NOT_DELETED},
+        fields_projection(selected, CAR_PROJECTION)
+    )
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
-    return Car(**car)
+    return trusted_response(trusted_document(Car, car, selected))
 
 @api_router.put("/cars/{car_id}", response_model=Car)
 async def update_car(car_id: str, car_update: CarUpdate, current_manager: User = Depends(get_current_manager)):
@@ -1340,7 +3317,8 @@ async def update_car(car_id: str, car_update: CarUpdate, current_manager: User =
         existing_car = await db.cars.find_one({
             "company_id": current_manager.company_id,
             "license_plate": update_data["license_plate"],
-            "id": {"$ne": car_id}
+            "id": {"$ne": car_id},
+            **NOT_DELETED
         })
         if existing_car:
             raise HTTPException(
@@ -1348,42 +3326,93 @@ async def update_car(car_id: str, car_update: CarUpdate, current_manager: User =
                 detail="License plate already exists in your fleet"
             )
     
-    result = await db.cars.update_one(
-        {"id": car_id, "company_id": current_manager.company_id}, 
-        {"$set": update_data}
-    )
+    try:
+        result = await db.cars.update_one(
+            {"id": car_id, "company_id": current_manager.company_id, **NOT_DELETED}, 
+            {"$set": update_data}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="License plate already exists in your fleet"
+        )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Car not found")
+    await bump_collection_version(current_manager.company_id, "cars")
     
-    updated_car = await db.cars.find_one({"id": car_id, "company_id": current_manager.company_id})
-    return Car(**updated_car)
+    updated_car = await db.cars.find_one({"id": car_id, "company_id": current_manager.company_id, **NOT_DELETED}, CAR_PROJECTION)
+    await publish_fleet_event(current_manager.company_id, "car", "updated", updated_car)
+    return trusted_response(trusted_document(Car, updated_car))
 
 @api_router.delete("/cars/{car_id}")
 async def delete_car(car_id: str, current_manager: User = Depends(get_current_manager)):
-    result = await db.cars.delete_one({"id": car_id, "company_id": current_manager.company_id})
-    if result.deleted_count == 0:
+    # Hide the car immediately; its downtimes and bookings are removed by a background job.
+    # Its plate is freed right away (the unique plate index still holds the car until
+    # it is purged), so the original is kept in deleted_license_plate.
+    result = await db.cars.update_one(
+        {"id": car_id, "company_id": current_manager.company_id, **NOT_DELETED},
+        [{"$set": {
+            "deleted": True,
+            "deleted_at": datetime.utcnow(),
+            "deleted_license_plate": "$license_plate",
+            "license_plate": f"deleted:{car_id}"
+        }}]
+    )
+    if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Car not found")
     
-    # Also delete associated downtimes and bookings
-    await db.downtimes.delete_many({"car_id": car_id, "company_id": current_manager.company_id})
-    await db.bookings.delete_many({"car_id": car_id, "company_id": current_manager.company_id})
-    return {"message": "Car deleted successfully"}
+    license_id = await get_company_license_id(current_manager.company_id)
+    await release_license_usage(license_id, "vehicles")
+    await bump_collection_version(current_manager.company_id, "cars")
+    await publish_fleet_event(current_manager.company_id, "car", "deleted", {"id": car_id})
+    
+    job = await enqueue_deletion_job(current_manager.company_id, DeletionTarget.CAR, car_id, current_manager.id)
+    return {"message": "Car deleted successfully", "job_id": job.id}
 
 # Downtime routes
 @api_router.get("/downtimes", response_model=List[Downtime])
-async def get_downtimes(current_user: User = Depends(get_current_user)):
-    downtimes = await db.downtimes.find({"company_id": current_user.company_id}).sort("start_date", -1).to_list(1000)
-    return [Downtime(**downtime) for downtime in downtimes]
+@query_budget(max_queries=4)
+async def get_downtimes(request: Request, fields: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    selected = parse_fields(Downtime, fields)
+    # Deleting a car hides its downtimes
+    etag = await collection_etag(request, current_user, "downtimes", "cars")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    return trusted_response(await load_downtimes(current_user.company_id, selected), headers=etag_headers(etag))
+
+async def load_downtimes(company_id: str, fields: Optional[tuple] = None) -> List[dict]:
+    projection = fields_projection(fields, DOWNTIME_PROJECTION)
+    downtimes = await db.downtimes.find(
+        {"company_id": company_id, **await deleted_cars_filter(company_id)}, projection
+    ).sort("start_date", -1).to_list(1000)
+    return trusted_documents(Downtime, downtimes, fields)
 
 @api_router.get("/downtimes/car/{car_id}", response_model=List[Downtime])
-async def get_car_downtimes(car_id: str, current_user: User = Depends(get_current_user)):
-    downtimes = await db.downtimes.find({"car_id": car_id, "company_id": current_user.company_id}).sort("start_date", -1).to_list(1000)
-    return [Downtime(**downtime) for downtime in downtimes]
+@query_budget(max_queries=4)
+async def get_car_downtimes(
+    request: Request,
+    car_id: str,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    selected = parse_fields(Downtime, fields)
+    # Deleting a car hides its downtimes
+    etag = await collection_etag(request, current_user, "downtimes", "cars")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    query = {"company_id": current_user.company_id, **await deleted_cars_filter(current_user.company_id)}
+    query["car_id"] = {**query.get("car_id", {}), "$eq": car_id}
+    downtimes = await db.downtimes.find(query, fields_projection(selected, DOWNTIME_PROJECTION)).sort("start_date", -1).to_list(1000)
+    return trusted_response(trusted_documents(Downtime, downtimes, selected), headers=etag_headers(etag))
 
 @api_router.post("/downtimes", response_model=Downtime)
 async def create_downtime(downtime_data: DowntimeCreate, current_manager: User = Depends(get_current_manager)):
     # Check if car exists and belongs to the company
-    car = await db.cars.find_one({"id": downtime_data.car_id, "company_id": current_manager.company_id})
+    car = await db.cars.find_one({"id": downtime_data.car_id, "company_id": current_manager.company_id, **NOT_DELETED})
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
     
@@ -1392,7 +3421,18 @@ async def create_downtime(downtime_data: DowntimeCreate, current_manager: User =
     
     # Update car status to downtime if currently happening
     if downtime.start_date <= datetime.utcnow() and (not downtime.end_date or downtime.end_date >= datetime.utcnow()):
-        await db.cars.update_one({"id": downtime_data.car_id}, {"$set": {"status": CarStatus.DOWNTIME}})
+        await db.cars.update_one(
+            {"id": downtime_data.car_id, "company_id": current_manager.company_id},
+            {"$set": {"status": CarStatus.DOWNTIME}}
+        )
+        await bump_collection_version(current_manager.company_id, "downtimes", "cars")
+        await publish_fleet_event(current_manager.company_id, "car", "updated", {
+            "id": downtime_data.car_id,
+            "status": CarStatus.DOWNTIME
+        })
+    else:
+        await bump_collection_version(current_manager.company_id, "downtimes")
+    await publish_fleet_event(current_manager.company_id, "downtime", "created", downtime.dict())
     
     return downtime
 
@@ -1408,54 +3448,581 @@ async def update_downtime(downtime_id: str, downtime_update: DowntimeUpdate, cur
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Downtime not found")
+    await bump_collection_version(current_manager.company_id, "downtimes")
     
-    updated_downtime = await db.downtimes.find_one({"id": downtime_id, "company_id": current_manager.company_id})
-    return Downtime(**updated_downtime)
+    updated_downtime = await db.downtimes.find_one({"id": downtime_id, "company_id": current_manager.company_id}, DOWNTIME_PROJECTION)
+    await publish_fleet_event(current_manager.company_id, "downtime", "updated", updated_downtime)
+    return trusted_response(trusted_document(Downtime, updated_downtime))
 
 @api_router.delete("/downtimes/{downtime_id}")
 async def delete_downtime(downtime_id: str, current_manager: User = Depends(get_current_manager)):
     result = await db.downtimes.delete_one({"id": downtime_id, "company_id": current_manager.company_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Downtime not found")
+    await bump_collection_version(current_manager.company_id, "downtimes")
+    await publish_fleet_event(current_manager.company_id, "downtime", "deleted", {"id": downtime_id})
     return {"message": "Downtime deleted successfully"}
 
+# Fleet event routes
+def fleet_event_visible(user: User, event: dict) -> bool:
+    """Whether a user may see an event, following the read permissions of the REST endpoints"""
+    if user.role == UserRole.FLEET_MANAGER:
+        return True
+    entity = event["event"].split(".", 1)[0]
+    if entity == "booking":
+        return event["data"].get("user_id") == user.id
+    if entity == "user":
+        return event["data"].get("id") == user.id
+    return True
+
+def format_server_sent_event(event: dict) -> bytes:
+    return (
+        f"id: {event['seq']}\nevent: {event['event']}\ndata: ".encode()
+        + orjson.dumps({"data": event["data"], "created_at": event["created_at"]})
+        + b"\n\n"
+    )
+
+class StreamTicketResponse(BaseModel):
+    ticket: str
+    expires_at: datetime
+
+@api_router.post("/events/ticket", response_model=StreamTicketResponse)
+async def issue_stream_ticket(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user)
+):
+    """Single-use ticket for opening an event stream with ?ticket="""
+    payload = decode_access_token(credentials.credentials)
+    ticket = await create_stream_ticket(current_user, datetime.utcfromtimestamp(payload["exp"]))
+    return StreamTicketResponse(ticket=ticket["ticket"], expires_at=ticket["expires_at"])
+
+@api_router.get("/events/stream")
+@query_budget(max_queries=4)
+async def stream_fleet_events(
+    request: Request,
+    last_event_id: Optional[int] = None,
+    stream_user: tuple = Depends(get_stream_user)
+):
+    """Server-Sent Events stream of the company's booking, car, downtime and user changes.
+    
+    Browsers authenticate with a ticket from POST /events/ticket (?ticket=),
+    other clients with their bearer token. Reconnecting clients send
+    Last-Event-ID (or ?last_event_id=) and first get the events they missed; a
+    ``reset`` event means those are no longer available and the client should
+    reload its data.
+    """
+    current_user, expires_at = stream_user
+    header = request.headers.get("last-event-id")
+    if header:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    
+    company_id = current_user.company_id
+    # Subscribe before replaying so nothing written in between is lost
+    queue = fleet_event_hub.subscribe(company_id)
+    missed = []
+    if last_event_id is not None:
+        try:
+            missed = await fleet_event_hub.replay(company_id, last_event_id)
+        except Exception:
+            fleet_event_hub.unsubscribe(company_id, queue)
+            raise
+    
+    async def body():
+        user = current_user
+        # Replayed events may also arrive live; events with lower numbers that were
+        # still being written during the replay must not be skipped
+        replayed = set()
+        try:
+            yield f"retry: {int(FLEET_EVENTS_HEARTBEAT_SECONDS * 1000)}\n\n".encode()
+            if missed is None:
+                yield b"event: reset\ndata: {}\n\n"
+            for event in missed or []:
+                replayed.add(event["seq"])
+                if fleet_event_visible(user, event):
+                    yield format_server_sent_event(event)
+            while True:
+                # The stream ends with the token it was opened with
+                remaining = (expires_at - datetime.utcnow()).total_seconds()
+                if remaining <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), min(FLEET_EVENTS_HEARTBEAT_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    # Re-check the user on every heartbeat, so deleted or deactivated users are cut off
+                    user = await load_stream_user(user.id)
+                    if user is None:
+                        return
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                if event["seq"] in replayed:
+                    replayed.discard(event["seq"])
+                    continue
+                # Changes to the subscriber (deletion, deactivation, role) apply immediately
+                if event["event"].startswith("user.") and event["data"].get("id") == user.id:
+                    user = await load_stream_user(user.id)
+                    if user is None:
+                        return
+                if fleet_event_visible(user, event):
+                    yield format_server_sent_event(event)
+        finally:
+            fleet_event_hub.unsubscribe(company_id, queue)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Dashboard routes
 @api_router.get("/fleet/stats", response_model=FleetStats)
+@query_budget(max_queries=6)
 async def get_fleet_stats(current_user: User = Depends(get_current_user)):
-    total_cars = await db.cars.count_documents({"company_id": current_user.company_id})
-    available_cars = await db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.AVAILABLE})
-    in_downtime = await db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.DOWNTIME})
-    in_use = await db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.IN_USE})
-    maintenance = await db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.MAINTENANCE})
-    
-    return FleetStats(
-        total_cars=total_cars,
-        available_cars=available_cars,
-        in_downtime=in_downtime,
-        in_use=in_use,
-        maintenance=maintenance
-    )
+    async def load():
+        total_cars, available_cars, in_downtime, in_use, maintenance = await gather_queries(
+            db.cars.count_documents({"company_id": current_user.company_id, **NOT_DELETED}),
+            db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.AVAILABLE, **NOT_DELETED}),
+            db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.DOWNTIME, **NOT_DELETED}),
+            db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.IN_USE, **NOT_DELETED}),
+            db.cars.count_documents({"company_id": current_user.company_id, "status": CarStatus.MAINTENANCE, **NOT_DELETED})
+        )
+        
+        return FleetStats(
+            total_cars=total_cars,
+            available_cars=available_cars,
+            in_downtime=in_downtime,
+            in_use=in_use,
+            maintenance=maintenance
+        ).model_dump()
+    
+    return trusted_response(await read_cache.get_or_load(current_user.company_id, "fleet_stats", "", load))
 
 @api_router.get("/fleet/categories")
+@query_budget(max_queries=2)
 async def get_fleet_by_category(current_user: User = Depends(get_current_user)):
-    pipeline = [
-        {"$match": {"company_id": current_user.company_id}},
-        {"$group": {"_id": "$category", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}}
-    ]
-    result = await db.cars.aggregate(pipeline).to_list(100)
-    return [{"category": item["_id"], "count": item["count"]} for item in result]
-
-# Include the router in the main app
-app.include_router(api_router)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    async def load():
+        pipeline = [
+            {"$match": {"company_id": current_user.company_id, **NOT_DELETED}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+        result = await db.cars.aggregate(pipeline).to_list(100)
+        return [{"category": item["_id"], "count": item["count"]} for item in result]
+    
+    return trusted_response(await read_cache.get_or_load(current_user.company_id, "fleet_categories", "", load))
+
+# Sections of /dashboard; users is only available to managers
+DASHBOARD_SECTIONS = ("user", "company", "cars", "downtimes", "bookings", "users")
+
+@api_router.get("/dashboard")
+@query_budget(max_queries=15)
+async def get_dashboard(include: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    """Everything the frontend needs for its first render, fetched concurrently.
+    
+    ``include`` is a comma-separated subset of DASHBOARD_SECTIONS (default: all
+    the caller may see). Each section has the same content as its own endpoint.
+    """
+    is_manager = current_user.role == UserRole.FLEET_MANAGER
+    if include is None:
+        sections = [section for section in DASHBOARD_SECTIONS if is_manager or section != "users"]
+    else:
+        sections = list(dict.fromkeys(section.strip() for section in include.split(",") if section.strip()))
+        unknown = [section for section in sections if section not in DASHBOARD_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown dashboard sections: {', '.join(unknown)}")
+        if "users" in sections and not is_manager:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only fleet managers can access this resource"
+            )
+    
+    async def load_user():
+        return {name: getattr(current_user, name) for name in UserResponse.model_fields}
+    
+    loaders = {
+        "user": load_user,
+        "company": lambda: load_company(current_user),
+        "cars": lambda: load_cars(current_user.company_id),
+        "downtimes": lambda: load_downtimes(current_user.company_id),
+        "bookings": lambda: load_bookings(current_user),
+        "users": lambda: load_users(current_user.company_id),
+    }
+    results = await asyncio.gather(*(loaders[section]() for section in sections))
+    return trusted_response(dict(zip(sections, results)))
+
+@api_router.get("/cache/stats")
+async def get_read_cache_stats(current_manager: User = Depends(get_current_manager)):
+    """Read cache size and hit ratios for this worker (managers only)"""
+    return {
+        **read_cache.stats(),
+        "invalidation_bus": {"mode": cache_invalidation_bus.mode, "events": cache_invalidation_bus.events}
+    }
+
+# Background deletion jobs
+# Jobs are stored in the deletion_jobs collection so they survive restarts. Every
+# worker process polls for pending jobs (or running jobs whose lease expired) and
+# claims them atomically, then removes dependent documents in throttled batches.
+DELETION_BATCH_SIZE = int(os.environ.get('DELETION_BATCH_SIZE', 1000))
+DELETION_BATCH_PAUSE_SECONDS = float(os.environ.get('DELETION_BATCH_PAUSE_SECONDS', 0.1))
+DELETION_POLL_INTERVAL_SECONDS = float(os.environ.get('DELETION_POLL_INTERVAL_SECONDS', 5))
+DELETION_JOB_LEASE_SECONDS = 60
+DELETION_JOB_MAX_ATTEMPTS = 3
+
+deletion_worker_task: Optional[asyncio.Task] = None
+deletion_worker_wakeup = asyncio.Event()
+
+async def enqueue_deletion_job(company_id: str, target_type: DeletionTarget, target_id: str,
+                               requested_by: Optional[str] = None) -> DeletionJob:
+    job = DeletionJob(
+        company_id=company_id,
+        target_type=target_type,
+        target_id=target_id,
+        requested_by=requested_by
+    )
+    await db.deletion_jobs.insert_one(job.dict())
+    deletion_worker_wakeup.set()
+    return job
+
+async def claim_deletion_job() -> Optional[dict]:
+    """Atomically claim the oldest runnable job, taking a lease on it"""
+    now = datetime.utcnow()
+    return await db.deletion_jobs.find_one_and_update(
+        {
+            "$or": [
+                {"status": JobStatus.PENDING},
+                {"status": JobStatus.RUNNING, "locked_until": {"$lt": now}}
+            ]
+        },
+        {
+            "$set": {
+                "status": JobStatus.RUNNING,
+                "locked_until": now + timedelta(seconds=DELETION_JOB_LEASE_SECONDS),
+                "started_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def delete_in_batches(job_id: str, collection, query: dict) -> int:
+    """Delete all documents matching query in batches, recording progress on the job"""
+    deleted = 0
+    while True:
+        batch = await collection.find(query, {"_id": 1}).limit(DELETION_BATCH_SIZE).to_list(DELETION_BATCH_SIZE)
+        if not batch:
+            return deleted
+        result = await collection.delete_many({**query, "_id": {"$in": [doc["_id"] for doc in batch]}})
+        deleted += result.deleted_count
+        # Record progress and extend the lease so other workers leave the job alone
+        await db.deletion_jobs.update_one(
+            {"id": job_id},
+            {
+                "$inc": {f"deleted_counts.{collection.name}": result.deleted_count},
+                "$set": {"locked_until": datetime.utcnow() + timedelta(seconds=DELETION_JOB_LEASE_SECONDS)}
+            }
+        )
+        await asyncio.sleep(DELETION_BATCH_PAUSE_SECONDS)
+
+async def run_deletion_job(job: dict):
+    """Remove the target of a deletion job and everything that depends on it.
+    
+    Every step is idempotent, so a job interrupted by a restart can simply be
+    run again.
+    """
+    company_id = job["company_id"]
+    if job["target_type"] == DeletionTarget.CAR:
+        car_filter = {"car_id": job["target_id"], "company_id": company_id}
+        await delete_in_batches(job["id"], db.bookings, car_filter)
+        await delete_in_batches(job["id"], db.downtimes, car_filter)
+        await delete_in_batches(job["id"], db.cars, {"id": job["target_id"], "company_id": company_id})
+        await bump_collection_version(company_id, "bookings", "downtimes", "cars")
+    else:
+        company_filter = {"company_id": company_id}
+        # Users first so nobody can keep working in the company while it is removed
+        await delete_in_batches(job["id"], db.users, company_filter)
+        await delete_in_batches(job["id"], db.bookings, company_filter)
+        await delete_in_batches(job["id"], db.downtimes, company_filter)
+        await delete_in_batches(job["id"], db.cars, company_filter)
+        await db.licenses.update_many(company_filter, {"$set": {"status": LicenseStatus.REVOKED}})
+        await delete_in_batches(job["id"], db.companies, {"id": company_id})
+
+async def process_deletion_jobs():
+    """Run claimed deletion jobs until none are left"""
+    while True:
+        job = await claim_deletion_job()
+        if not job:
+            return
+        try:
+            await run_deletion_job(job)
+        except Exception as e:
+            logger.exception(f"Deletion job {job['id']} failed")
+            failed = job["attempts"] >= DELETION_JOB_MAX_ATTEMPTS
+            # Otherwise leave the job running so it is retried once its lease expires
+            await db.deletion_jobs.update_one(
+                {"id": job["id"]},
+                {"$set": {
+                    "status": JobStatus.FAILED if failed else JobStatus.RUNNING,
+                    "error": str(e),
+                    "locked_until": None if failed else datetime.utcnow() + timedelta(seconds=DELETION_JOB_LEASE_SECONDS)
+                }}
+            )
+            continue
+        await db.deletion_jobs.update_one(
+            {"id": job["id"]},
+            {"$set": {
+                "status": JobStatus.COMPLETED,
+                "completed_at": datetime.utcnow(),
+                "error": None,
+                "locked_until": None
+            }}
+        )
+
+async def deletion_worker():
+    while True:
+        try:
+            await process_deletion_jobs()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Deletion worker error: {e}")
+        deletion_worker_wakeup.clear()
+        try:
+            await asyncio.wait_for(deletion_worker_wakeup.wait(), timeout=DELETION_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+# Response compression
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', 1024))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+COMPRESSION_ZSTD_LEVEL = int(os.environ.get('COMPRESSION_ZSTD_LEVEL', 3))
+
+class GzipCompressor:
+    def __init__(self, level: int = COMPRESSION_GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class BrotliCompressor:
+    def __init__(self, quality: int = COMPRESSION_BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+    
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class ZstdCompressor:
+    def __init__(self, level: int = COMPRESSION_ZSTD_LEVEL):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+# Content-Encoding -> compressor, in order of server preference
+COMPRESSORS = {}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+COMPRESSORS["gzip"] = GzipCompressor
+
+def choose_content_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported encoding the client accepts (q > 0)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(coding.strip())
+    for encoding in COMPRESSORS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+class CompressionMiddleware:
+    """Compress responses with zstd, brotli or gzip depending on Accept-Encoding.
+    
+    Bodies smaller than ``minimum_size`` are sent as-is. Streaming responses are
+    compressed incrementally and flushed per chunk so progress events still
+    arrive promptly; server-sent event streams are never compressed.
+    """
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_content_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        compressor = COMPRESSORS[encoding]()
+        initial_message = None
+        started = False
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal initial_message, started, passthrough
+            if message["type"] == "http.response.start":
+                # Hold back the headers until we know whether to compress
+                initial_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith("text/event-stream")
+                )
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not started:
+                started = True
+                if passthrough or (not more_body and len(body) < self.minimum_size):
+                    await send(initial_message)
+                    await send(message)
+                    return
+                headers = MutableHeaders(raw=initial_message["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    body = compressor.compress(body) + compressor.flush()
+                else:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                await send(initial_message)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+            
+            if passthrough:
+                await send(message)
+                return
+            body = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+        
+        await self.app(scope, receive, send_compressed)
+
+class MetricsMiddleware:
+    """Record latency by route template and status, and the number of requests in flight"""
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope; label by its template
+            # (/api/cars/{car_id}) rather than the raw path to keep cardinality bounded
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status_code)
+            ).observe(time.perf_counter() - start)
+
+class QueryBudgetMiddleware:
+    """Count MongoDB queries per request, report them in Server-Timing and check the budget"""
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = QueryStats()
+        start = time.perf_counter()
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                # Covers the handler; a streaming body may still run queries afterwards
+                stats.closed = True
+                headers = MutableHeaders(raw=message["headers"])
+                headers.append("Server-Timing", (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.count} queries", '
+                    f'app;dur={(time.perf_counter() - start) * 1000:.1f}'
+                ))
+            await send(message)
+        
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+        
+        route = scope.get("route")
+        max_queries, max_db_ms = getattr(getattr(route, "endpoint", None), "query_budget", (None, None))
+        max_queries = QUERY_BUDGET_MAX_QUERIES if max_queries is None else max_queries
+        max_db_ms = QUERY_BUDGET_MAX_DB_MS if max_db_ms is None else max_db_ms
+        db_ms = stats.db_seconds * 1000
+        if stats.count <= max_queries and db_ms <= max_db_ms:
+            return
+        
+        shapes = ", ".join(f"{shape} x{count}" for shape, count in stats.shapes.most_common(5))
+        message = (
+            f"Query budget exceeded: {scope['method']} {getattr(route, 'path', scope['path'])} ran "
+            f"{stats.count} queries (budget {max_queries}) in {db_ms:.1f} ms (budget {max_db_ms:.0f} ms): {shapes}"
+        )
+        if QUERY_BUDGET_ENFORCE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+@root_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 # Configure logging
 logging.basicConfig(
@@ -1464,6 +4031,175 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+# Indexes the application relies on: collection -> [(keys, options)]. Tenant
+# collections are indexed with company_id as the leading key so every query
+# stays within one company's index range.
+INDEXES = {
+    "cars": [
+        # License plates are unique per company (also backs bulk import duplicate checks)
+        ([("company_id", 1), ("license_plate", 1)], {"unique": True}),
+        ([("company_id", 1), ("id", 1)], {}),
+        ([("company_id", 1), ("status", 1)], {}),
+        ([("company_id", 1), ("category", 1)], {}),
+        # Cars marked for deletion, whose bookings and downtimes are hidden until purged
+        ([("company_id", 1), ("deleted", 1)], {"partialFilterExpression": {"deleted": True}}),
+    ],
+    "bookings": [
+        ([("company_id", 1), ("id", 1)], {}),
+        ([("company_id", 1), ("created_at", -1)], {}),
+        ([("company_id", 1), ("user_id", 1), ("created_at", -1)], {}),
+        ([("company_id", 1), ("car_id", 1), ("status", 1), ("start_date", 1)], {}),
+    ],
+    "downtimes": [
+        ([("company_id", 1), ("id", 1)], {}),
+        ([("company_id", 1), ("start_date", -1)], {}),
+        ([("company_id", 1), ("car_id", 1), ("start_date", 1)], {}),
+    ],
+    "users": [
+        # Emails are unique across all companies (login looks users up by email)
+        ([("email", 1)], {"unique": True}),
+        # Authentication loads users by id before the tenant is known
+        ([("id", 1)], {"unique": True}),
+        ([("company_id", 1), ("role", 1)], {}),
+    ],
+    "companies": [
+        ([("id", 1)], {"unique": True}),
+        ([("email", 1)], {}),
+        ([("slug", 1)], {}),
+    ],
+    "licenses": [
+        ([("id", 1)], {"unique": True}),
+        ([("license_key", 1)], {"unique": True}),
+        ([("company_id", 1)], {}),
+        # Admin license list, newest first
+        ([("issued_date", -1)], {}),
+    ],
+    "collection_versions": [
+        ([("company_id", 1)], {"unique": True}),
+        # Polled by the cache invalidation bus when change streams are unavailable
+        ([("updated_at", 1)], {}),
+    ],
+    "fleet_events": [
+        ([("company_id", 1), ("seq", 1)], {"unique": True}),
+        # Expires old events and serves the polling feed
+        ([("created_at", 1)], {"expireAfterSeconds": int(FLEET_EVENTS_RETENTION_HOURS * 3600)}),
+    ],
+    "fleet_event_sequences": [
+        ([("company_id", 1)], {"unique": True}),
+    ],
+    "stream_tickets": [
+        ([("ticket", 1)], {"unique": True}),
+        ([("expires_at", 1)], {"expireAfterSeconds": 0}),
+    ],
+    "deletion_jobs": [
+        ([("id", 1)], {"unique": True}),
+        ([("status", 1), ("created_at", 1)], {}),
+    ],
+}
+
+async def create_indexes():
+    """Create the indexes in INDEXES, logging (not failing on) any that cannot be built"""
+    for collection_name, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                await db[collection_name].create_index(keys, **options)
+            except Exception as e:
+                logger.warning(f"Could not create index {keys} on {collection_name}: {e}")
+
+# Application factory
+# Startup work runs in a background warmup task so the process answers liveness
+# checks right away; /api/health/ready reports ready only once warmup is done and
+# the first requests no longer pay for connection setup or lazy initialization.
+STARTUP_WARMUP = os.environ.get('STARTUP_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+WARMUP_CONNECTIONS = int(os.environ.get('WARMUP_CONNECTIONS', min(10, mongo_settings.max_pool_size)))
+WARMUP_RETRY_SECONDS = float(os.environ.get('WARMUP_RETRY_SECONDS', 2))
+
+# Models whose read defaults are computed for trusted responses
+TRUSTED_RESPONSE_MODELS = (Car, Downtime, UserResponse, LicenseResponse, BookingResponse)
+
+async def warm_connection_pool():
+    """Wait for MongoDB, then open WARMUP_CONNECTIONS pooled connections with concurrent pings"""
+    while True:
+        try:
+            await db.command("ping")
+            break
+        except Exception as e:
+            logger.warning(f"MongoDB not reachable during warmup, retrying: {e}")
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+    await asyncio.gather(*(db.command("ping") for _ in range(WARMUP_CONNECTIONS)))
+
+async def warm_caches():
+    for model in TRUSTED_RESPONSE_MODELS:
+        model_read_defaults(model)
+
+async def warm_password_hashing():
+    # The first bcrypt call loads and self-tests the backend; a 4-round hash is
+    # enough for that and keeps the event loop (bcrypt holds the GIL) responsive
+    await asyncio.to_thread(pwd_context.hash, "warmup", rounds=4)
+
+async def warmup(application: FastAPI):
+    """Run the startup steps in order, recording how long each took, then mark the app ready"""
+    global deletion_worker_task, cache_invalidation_task, fleet_event_task
+    steps = [("connection_pool", warm_connection_pool), ("indexes", create_indexes)]
+    steps.append(("license_usage", backfill_license_usage))
+    if STARTUP_WARMUP:
+        steps.extend([("caches", warm_caches), ("password_hashing", warm_password_hashing)])
+    
+    started = time.perf_counter()
+    for name, step in steps:
+        step_started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            logger.warning(f"Warmup step {name} failed: {e}")
+        application.state.warmup_timings[name] = round((time.perf_counter() - step_started) * 1000, 1)
+    application.state.warmup_timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    deletion_worker_task = asyncio.create_task(deletion_worker())
+    cache_invalidation_task = asyncio.create_task(cache_invalidation_bus.run())
+    if FLEET_EVENTS_ENABLED:
+        fleet_event_task = asyncio.create_task(fleet_event_hub.run())
+    application.state.ready = True
+    logger.info(f"Warmup finished in {application.state.warmup_timings['total']} ms")
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    dependency_prober.start()
+    warmup_task = asyncio.create_task(warmup(application))
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        dependency_prober.stop()
+        if deletion_worker_task is not None:
+            deletion_worker_task.cancel()
+        if cache_invalidation_task is not None:
+            cache_invalidation_task.cancel()
+        if fleet_event_task is not None:
+            fleet_event_task.cancel()
+        client.close()
+        if password_hash_pool is not None:
+            password_hash_pool.shutdown(wait=False, cancel_futures=True)
+
+def create_app() -> FastAPI:
+    application = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+    application.state.ready = False
+    application.state.warmup_timings = {}
+    
+    application.include_router(api_router)
+    application.include_router(root_router)
+    
+    application.add_middleware(QueryBudgetMiddleware)
+    application.add_middleware(CompressionMiddleware)
+    application.add_middleware(MetricsMiddleware)
+    
+    application.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return application
+
+app = create_app()
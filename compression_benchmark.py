@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+Response Compression Benchmark for Fleet Management System
+Shows the CPU versus bytes trade-off of the response compressors (gzip,
+brotli, zstd) at several levels on realistic /api/bookings payloads
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent / "backend"
+sys.path.append(str(backend_dir))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "fleetmanager_benchmark")
+
+# Import from server after setting up the path
+from server import BrotliCompressor, GzipCompressor, ZstdCompressor, brotli, trusted_response, zstandard
+from response_benchmark import make_booking_documents
+
+ROW_COUNTS = [100, 1000]
+REPEAT = 10
+
+# (Content-Encoding, compressor class, levels to try)
+CODECS = [("gzip", GzipCompressor, [1, 6, 9])]
+if brotli is not None:
+    CODECS.append(("br", BrotliCompressor, [1, 4, 6, 11]))
+if zstandard is not None:
+    CODECS.append(("zstd", ZstdCompressor, [1, 3, 9, 19]))
+
+
+def compress(compressor_class, level: int, payload: bytes) -> bytes:
+    compressor = compressor_class(level)
+    return compressor.compress(payload) + compressor.finish()
+
+
+def measure(compressor_class, level: int, payload: bytes):
+    """Best compression time in milliseconds over REPEAT runs, and output size"""
+    best = float("inf")
+    compressed = b""
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        compressed = compress(compressor_class, level, payload)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(compressed)
+
+
+def run_benchmark():
+    print("🗜️  Response compression benchmark (/api/bookings payloads)")
+    print("=" * 72)
+    if brotli is None or zstandard is None:
+        print("ℹ️  brotli and/or zstandard not installed; only available codecs are measured")
+
+    for count in ROW_COUNTS:
+        payload = trusted_response(make_booking_documents(count)).body
+        print()
+        print(f"{count} bookings, {len(payload):,} bytes uncompressed")
+        print(f"{'codec':>6} | {'level':>5} | {'ms':>8} | {'bytes':>9} | {'ratio':>6} | {'MB/s':>8}")
+        print("-" * 72)
+        for encoding, compressor_class, levels in CODECS:
+            for level in levels:
+                ms, size = measure(compressor_class, level, payload)
+                throughput = len(payload) / (ms / 1000) / 1_000_000
+                print(f"{encoding:>6} | {level:>5} | {ms:>8.2f} | {size:>9,} | {len(payload) / size:>5.1f}x | {throughput:>8.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
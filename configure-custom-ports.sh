@@ -123,7 +123,7 @@ services:
     networks:
       - fleetmanager-custom
     healthcheck:
-      test: ["CMD", "curl", "-f", "http://localhost:8001/api/health"]
+      test: ["CMD", "curl", "-f", "http://localhost:8001/api/health/live"]
       interval: 30s
       timeout: 10s
       retries: 3
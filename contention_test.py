@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+
+"""
+Contention Test for Fleet Management System
+Fires bursts of simultaneous, conflicting requests at the endpoints that check
+and then write (booking creation and approval, vehicle and user license limits,
+duplicate license plates, license assignment at registration), then checks the
+invariants those checks are meant to protect directly in MongoDB and reports
+throughput and latency per burst. Exits non-zero if an invariant is violated.
+
+Every scenario runs in its own freshly registered company; licenses are written
+directly to MongoDB (MONGO_URL / DB_NAME from backend/.env), like load_test.py.
+
+    python contention_test.py --base-url http://localhost:8001 --requests 200
+    python contention_test.py --scenarios booking_overlap,license_assignment
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent / "backend"
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+# Import from server after setting up the path
+from server import NOT_DELETED, BookingStatus, License, LicenseType, generate_license_key
+from load_test import PASSWORD, percentile
+
+
+class Burst:
+    """Outcome of one burst of simultaneous requests"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = []
+        self.statuses = Counter()
+        self.elapsed = 0.0
+
+    async def run(self, client: httpx.AsyncClient, requests: list) -> list:
+        """Send all (method, url, kwargs) requests at once; returns the responses (None on transport errors)"""
+        gate = asyncio.Event()
+
+        async def send(method: str, url: str, kwargs: dict):
+            await gate.wait()
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                self.statuses[type(e).__name__] += 1
+                return None
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+            self.statuses[str(response.status_code)] += 1
+            return response
+
+        tasks = [asyncio.create_task(send(method, url, kwargs)) for method, url, kwargs in requests]
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        gate.set()
+        responses = await asyncio.gather(*tasks)
+        self.elapsed = time.perf_counter() - start
+        return responses
+
+    def report(self):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        statuses = ", ".join(f"{code}: {n}" for code, n in sorted(self.statuses.items()))
+        print(
+            f"  {self.name:<28} {count:>5} requests in {self.elapsed:6.2f} s ({count / self.elapsed:7.1f} req/s), "
+            f"p50 {percentile(latencies, 50) * 1000:7.1f} ms, p95 {percentile(latencies, 95) * 1000:7.1f} ms  [{statuses}]"
+        )
+
+
+class ContentionTest:
+    def __init__(self, client: httpx.AsyncClient, db, args):
+        self.client = client
+        self.db = db
+        self.args = args
+        self.run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        self.violations = []
+
+    def check(self, invariant: str, holds: bool, detail: str = ""):
+        print(f"  {'✅' if holds else '❌'} {invariant}{f' ({detail})' if detail else ''}")
+        if not holds:
+            self.violations.append(invariant)
+
+    async def create_license(self, max_users: int, max_vehicles: int) -> License:
+        license = License(
+            license_key=generate_license_key(),
+            license_type=LicenseType.ENTERPRISE,
+            max_users=max_users,
+            max_vehicles=max_vehicles,
+            notes="Contention test"
+        )
+        await self.db.licenses.insert_one(license.dict())
+        return license
+
+    def registration(self, name: str, index: int, license_key: str) -> dict:
+        return {
+            "company_name": f"Contention {self.run_id} {name} #{index}",
+            "company_email": f"contention-{self.run_id}-{name}-{index}@example.com",
+            "license_key": license_key,
+            "manager_name": "Contention Manager",
+            "manager_email": f"contention-{self.run_id}-{name}-{index}-manager@example.com",
+            "manager_password": PASSWORD
+        }
+
+    async def setup_company(self, name: str, max_users: int = 1000, max_vehicles: int = 1000):
+        """Register a company; returns (company_id, license, manager headers)"""
+        license = await self.create_license(max_users, max_vehicles)
+        response = await self.client.post("/api/companies/register", json=self.registration(name, 0, license.license_key))
+        response.raise_for_status()
+        data = response.json()
+        return data["company"]["id"], license, {"Authorization": f"Bearer {data['access_token']}"}
+
+    def car(self, plate: str) -> dict:
+        return {
+            "make": "Toyota", "model": "Corolla", "year": 2022, "license_plate": plate,
+            "vin": f"CT{self.run_id}{plate}", "mileage": 1000, "category": "sedan"
+        }
+
+    async def live_car_count(self, company_id: str) -> int:
+        return await self.db.cars.count_documents({"company_id": company_id, **NOT_DELETED})
+
+    async def overlapping_pairs(self, company_id: str, statuses: list) -> int:
+        """Pairs of bookings of the same car in the given statuses whose periods overlap"""
+        bookings = await self.db.bookings.find(
+            {"company_id": company_id, "status": {"$in": statuses}},
+            {"_id": 0, "car_id": 1, "start_date": 1, "end_date": 1}
+        ).sort([("car_id", 1), ("start_date", 1)]).to_list(None)
+        pairs = 0
+        for i, booking in enumerate(bookings):
+            for other in bookings[i + 1:]:
+                if other["car_id"] != booking["car_id"] or other["start_date"] >= booking["end_date"]:
+                    break
+                pairs += 1
+        return pairs
+
+    async def booking_overlap(self):
+        """Many users request overlapping slots on one car, then the manager approves every request at once"""
+        company_id, _, manager_headers = await self.setup_company("booking")
+        users = [
+            {"name": f"Driver {i}", "email": f"contention-{self.run_id}-driver{i}@example.com",
+             "password": PASSWORD, "role": "regular_user"}
+            for i in range(self.args.users)
+        ]
+        (await self.client.post("/api/users/import", json=users, headers=manager_headers)).raise_for_status()
+        (await self.client.post("/api/cars", json=self.car("BOOK-1"), headers=manager_headers)).raise_for_status()
+        car_id = (await self.client.get("/api/cars", headers=manager_headers)).json()[0]["id"]
+        logins = await asyncio.gather(*(
+            self.client.post("/api/auth/login", json={"email": user["email"], "password": PASSWORD}) for user in users
+        ))
+        user_headers = [{"Authorization": f"Bearer {login.json()['access_token']}"} for login in logins]
+
+        start = datetime.utcnow().replace(microsecond=0) + timedelta(days=30)
+        create = Burst("create overlapping bookings")
+        responses = await create.run(self.client, [
+            ("POST", "/api/bookings", {"headers": user_headers[i % len(user_headers)], "json": {
+                "car_id": car_id,
+                "start_date": (start + timedelta(minutes=5 * (i % 12))).isoformat(),
+                "end_date": (start + timedelta(hours=2, minutes=5 * (i % 12))).isoformat(),
+                "purpose": "Contention test"
+            }})
+            for i in range(self.args.requests)
+        ])
+        create.report()
+        booking_ids = [response.json()["id"] for response in responses if response is not None and response.status_code == 200]
+
+        approve = Burst("approve every request")
+        await approve.run(self.client, [
+            ("PUT", f"/api/bookings/{booking_id}/approve", {"headers": manager_headers, "json": {"status": "approved"}})
+            for booking_id in booking_ids
+        ])
+        approve.report()
+
+        approved = await self.overlapping_pairs(company_id, [BookingStatus.APPROVED.value])
+        live = await self.overlapping_pairs(company_id, [BookingStatus.APPROVED.value, BookingStatus.PENDING.value])
+        self.check("no overlapping approved bookings", approved == 0, f"{approved} overlapping pairs")
+        self.check("no overlapping pending/approved bookings", live == 0, f"{live} overlapping pairs")
+
+    async def vehicle_limit(self):
+        """Many cars created at once against a small vehicle limit"""
+        company_id, license, manager_headers = await self.setup_company("vehicles", max_vehicles=self.args.limit)
+        burst = Burst("create cars over the limit")
+        await burst.run(self.client, [
+            ("POST", "/api/cars", {"headers": manager_headers, "json": self.car(f"LIM-{i}")})
+            for i in range(self.args.requests)
+        ])
+        burst.report()
+
+        cars = await self.live_car_count(company_id)
+        license_doc = await self.db.licenses.find_one({"id": license.id})
+        self.check("vehicle limit not exceeded", cars <= self.args.limit, f"{cars} cars, limit {self.args.limit}")
+        self.check(
+            "license vehicle counter matches the fleet", license_doc.get("vehicles_count") == cars,
+            f"counter {license_doc.get('vehicles_count')}, {cars} cars"
+        )
+
+    async def user_limit(self):
+        """Many users created at once against a small user limit"""
+        company_id, license, manager_headers = await self.setup_company("users", max_users=self.args.limit)
+        burst = Burst("create users over the limit")
+        await burst.run(self.client, [
+            ("POST", "/api/users", {"headers": manager_headers, "json": {
+                "name": f"User {i}", "email": f"contention-{self.run_id}-limit{i}@example.com",
+                "password": PASSWORD, "role": "regular_user"
+            }})
+            for i in range(self.args.requests)
+        ])
+        burst.report()
+
+        users = await self.db.users.count_documents({"company_id": company_id, "is_active": True})
+        license_doc = await self.db.licenses.find_one({"id": license.id})
+        self.check("user limit not exceeded", users <= self.args.limit, f"{users} users, limit {self.args.limit}")
+        self.check(
+            "license user counter matches the users", license_doc.get("users_count") == users,
+            f"counter {license_doc.get('users_count')}, {users} users"
+        )
+
+    async def duplicate_plate(self):
+        """The same license plate created many times at once"""
+        company_id, _, manager_headers = await self.setup_company("plates")
+        burst = Burst("create the same plate")
+        await burst.run(self.client, [
+            ("POST", "/api/cars", {"headers": manager_headers, "json": self.car("DUP-1")})
+            for _ in range(self.args.requests)
+        ])
+        burst.report()
+
+        cars = await self.db.cars.count_documents({"company_id": company_id, "license_plate": "DUP-1", **NOT_DELETED})
+        self.check("license plates unique per company", cars == 1, f"{cars} cars with the plate")
+
+    async def license_assignment(self):
+        """Many companies register with the same license key at once"""
+        license = await self.create_license(1000, 1000)
+        burst = Burst("register with one license")
+        await burst.run(self.client, [
+            ("POST", "/api/companies/register", {"json": self.registration("license", i, license.license_key)})
+            for i in range(self.args.requests)
+        ])
+        burst.report()
+
+        companies = await self.db.companies.find(
+            {"license_id": license.id, **NOT_DELETED}, {"_id": 0, "id": 1}
+        ).to_list(None)
+        license_doc = await self.db.licenses.find_one({"id": license.id})
+        self.check("one company per license", len(companies) == 1, f"{len(companies)} companies")
+        self.check(
+            "license assigned to that company",
+            len(companies) == 1 and license_doc.get("company_id") == companies[0]["id"]
+        )
+
+
+SCENARIOS = ["booking_overlap", "vehicle_limit", "user_limit", "duplicate_plate", "license_assignment"]
+
+
+async def run_contention_test(args) -> int:
+    print("⚔️  Fleet Management contention test")
+    print("=" * 60)
+    print(f"Target: {args.base_url}, {args.requests} simultaneous requests per burst")
+
+    mongo_client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        test = ContentionTest(client, mongo_client[os.environ['DB_NAME']], args)
+        for name in args.scenarios:
+            print(f"\n{name}: {getattr(ContentionTest, name).__doc__}")
+            await getattr(test, name)()
+    mongo_client.close()
+
+    print()
+    if test.violations:
+        print(f"❌ {len(test.violations)} invariants violated")
+        return 1
+    print("✅ All invariants hold")
+    return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Contention test the Fleet Management backend")
+    parser.add_argument("--base-url", default=os.environ.get("BACKEND_URL", "http://localhost:8001"))
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=SCENARIOS,
+                        help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=200, help="simultaneous requests per burst")
+    parser.add_argument("--users", type=int, default=20, help="competing users in booking_overlap")
+    parser.add_argument("--limit", type=int, default=10, help="license limit in vehicle_limit and user_limit")
+    parser.add_argument("--max-connections", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_contention_test(parse_args())))
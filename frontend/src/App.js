@@ -1059,7 +1059,121 @@ const FleetDashboard = () => {
     }
   };
 
-  // Fetch cars data
+  // Live updates: apply fleet change events from the server instead of refetching
+  const [reloads, setReloads] = useState({ car: 0, downtime: 0, booking: 0, user: 0 });
+
+  useEffect(() => {
+    if (!user) return;
+
+    const setters = { car: setCars, downtime: setDowntimes, booking: setBookings, user: setUsers };
+    const upsert = (items, item) => (
+      items.some(existing => existing.id === item.id)
+        ? items.map(existing => (existing.id === item.id ? { ...existing, ...item } : existing))
+        : [item, ...items]
+    );
+    const reload = (...entities) => setReloads(current => {
+      const next = { ...current };
+      entities.forEach(entity => { next[entity] += 1; });
+      return next;
+    });
+    let source = null;
+    let retryTimer = null;
+    let lastEventId = null;
+    let closed = false;
+
+    const handleEvent = (message) => {
+      lastEventId = message.lastEventId;
+      const [entity, action] = message.type.split('.');
+      const { data } = JSON.parse(message.data);
+      if (action === 'imported') {
+        reload(entity);
+      } else if (action === 'deleted') {
+        setters[entity](items => items.filter(item => item.id !== data.id));
+      } else {
+        setters[entity](items => upsert(items, data));
+      }
+    };
+
+    const eventTypes = {
+      car: ['created', 'updated', 'deleted', 'imported'],
+      downtime: ['created', 'updated', 'deleted'],
+      booking: ['created', 'updated', 'approved', 'rejected', 'cancelled'],
+      user: ['created', 'updated', 'deleted', 'imported']
+    };
+    const reconnect = () => {
+      if (!closed) retryTimer = setTimeout(connect, 3000);
+    };
+
+    // Streams are opened with a single-use ticket, never with the access token in the URL,
+    // so every (re)connection fetches a new ticket and resumes from the last event seen
+    const connect = async () => {
+      try {
+        const response = await fetch(`${API}/api/events/ticket`, {
+          method: 'POST',
+          headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+        });
+        if (!response.ok) throw new Error(`Ticket request failed with ${response.status}`);
+        const { ticket } = await response.json();
+        if (closed) return;
+
+        const params = new URLSearchParams({ ticket });
+        if (lastEventId) params.set('last_event_id', lastEventId);
+        source = new EventSource(`${API}/api/events/stream?${params}`);
+        Object.entries(eventTypes).forEach(([entity, actions]) => {
+          actions.forEach(action => source.addEventListener(`${entity}.${action}`, handleEvent));
+        });
+        // Missed events are no longer available: reload everything
+        source.addEventListener('reset', () => reload('car', 'downtime', 'booking', 'user'));
+        // The ticket is spent, so reconnect with a new one instead of letting EventSource retry
+        source.onerror = () => {
+          source.close();
+          reconnect();
+        };
+      } catch (error) {
+        console.error('Error connecting to the event stream:', error);
+        reconnect();
+      }
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) source.close();
+    };
+  }, [user]);
+
+  // Load cars, downtimes, bookings and users in a single request
+  useEffect(() => {
+    const fetchDashboard = async () => {
+      try {
+        const sections = isManager ? 'cars,downtimes,bookings,users' : 'cars,downtimes,bookings';
+        const response = await fetch(`${API}/api/dashboard?include=${sections}`, {
+          headers: {
+            'Authorization': `Bearer ${localStorage.getItem('token')}`
+          }
+        });
+
+        if (response.ok) {
+          const data = await response.json();
+          setCars(data.cars);
+          setDowntimes(data.downtimes);
+          setBookings(data.bookings);
+          if (data.users) {
+            setUsers(data.users);
+          }
+        }
+      } catch (error) {
+        console.error('Error fetching dashboard:', error);
+      }
+    };
+
+    if (user) {
+      fetchDashboard();
+    }
+  }, [user, isManager]);
+
+  // Reload cars data
   useEffect(() => {
     const fetchCars = async () => {
       try {
@@ -1078,12 +1192,12 @@ const FleetDashboard = () => {
       }
     };
 
-    if (user) {
+    if (user && reloads.car > 0) {
       fetchCars();
     }
-  }, [user]);
+  }, [user, reloads.car]);
 
-  // Fetch downtimes data
+  // Reload downtimes data
   useEffect(() => {
     const fetchDowntimes = async () => {
       try {
@@ -1102,12 +1216,12 @@ const FleetDashboard = () => {
       }
     };
 
-    if (user) {
+    if (user && reloads.downtime > 0) {
       fetchDowntimes();
     }
-  }, [user]);
+  }, [user, reloads.downtime]);
 
-  // Fetch bookings data
+  // Reload bookings data
   useEffect(() => {
     const fetchBookings = async () => {
       try {
@@ -1126,12 +1240,12 @@ const FleetDashboard = () => {
       }
     };
 
-    if (user) {
+    if (user && reloads.booking > 0) {
       fetchBookings();
     }
-  }, [user]);
+  }, [user, reloads.booking]);
 
-  // Fetch users data (managers only)
+  // Reload users data (managers only)
   useEffect(() => {
     const fetchUsers = async () => {
       try {
@@ -1150,10 +1264,10 @@ const FleetDashboard = () => {
       }
     };
 
-    if (user && isManager) {
+    if (user && isManager && reloads.user > 0) {
       fetchUsers();
     }
-  }, [user, isManager]);
+  }, [user, isManager, reloads.user]);
 
   // Calculate fleet statistics
   useEffect(() => {
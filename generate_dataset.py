@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+
+"""
+Synthetic Dataset Generator for Fleet Management System
+Generates realistic, deterministic data volumes: many companies with skewed
+fleet sizes, years of bookings (with busy and idle cars, overlapping requests,
+past and upcoming bookings) and downtimes. Documents are streamed into MongoDB
+with batched insert_many calls from concurrent tasks in several processes, and
+can also be written as NDJSON fixtures for offline benchmarking.
+
+The same --seed always produces the same documents, whatever the --workers and
+--concurrency settings. All generated users share the password PASSWORD.
+
+    python generate_dataset.py --companies 2000 --cars-per-company 150 --years 3 --workers 8 --drop
+    python generate_dataset.py --companies 50 --no-mongo --ndjson fixtures/
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import string
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import orjson
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent / "backend"
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+# Import from server after setting up the path
+from server import (
+    INDEXES, BookingStatus, CarCategory, CarStatus, DowntimeReason, LicenseStatus, LicenseType, UserRole
+)
+
+PASSWORD = "password123"
+# bcrypt hash of PASSWORD at the backend's default cost, fixed so that user documents are reproducible too
+PASSWORD_HASH = "$2b$12$0i2dupSgOC06MaHd3X56IuN2UupiI9aIacanUmOFPztvcx5OwZfiq"
+COLLECTIONS = ["licenses", "companies", "users", "cars", "bookings", "downtimes"]
+MAKES = {
+    "Toyota": ["Corolla", "Camry", "RAV4", "Hilux"],
+    "Volkswagen": ["Golf", "Passat", "Tiguan", "Transporter"],
+    "Ford": ["Focus", "Kuga", "Transit", "Ranger"],
+    "BMW": ["3 Series", "5 Series", "X3"],
+    "Mercedes-Benz": ["C-Class", "E-Class", "Sprinter", "Vito"],
+    "Skoda": ["Octavia", "Superb", "Kodiaq"],
+}
+# Category mix of a typical fleet
+CATEGORY_WEIGHTS = {
+    CarCategory.SEDAN: 35, CarCategory.HATCHBACK: 20, CarCategory.SUV: 20,
+    CarCategory.VAN: 15, CarCategory.TRUCK: 7, CarCategory.COUPE: 3,
+}
+DEPARTMENTS = ["Sales", "Service", "Logistics", "Engineering", "Marketing", "Management"]
+PURPOSES = ["Customer visit", "Site inspection", "Delivery", "Trade fair", "Training", "Airport transfer"]
+# Reason -> (weight, typical duration in hours)
+DOWNTIME_REASONS = {
+    DowntimeReason.MAINTENANCE: (40, 24),
+    DowntimeReason.CLEANING: (25, 3),
+    DowntimeReason.INSPECTION: (15, 6),
+    DowntimeReason.REPAIR: (12, 96),
+    DowntimeReason.ACCIDENT: (3, 240),
+    DowntimeReason.OTHER: (5, 12),
+}
+# Bookings in the last UPCOMING_DAYS of the period are treated as upcoming
+UPCOMING_DAYS = 60
+
+
+def make_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def make_license_key(rng: random.Random) -> str:
+    """Same XXXX-XXXX-XXXX-XXXX-XXXX format as generate_license_key, but reproducible"""
+    chars = string.ascii_uppercase + string.digits
+    return '-'.join(''.join(rng.choices(chars, k=4)) for _ in range(5))
+
+
+def skewed_count(rng: random.Random, median: float, sigma: float = 0.9, maximum: int = None) -> int:
+    """Log-normally distributed count: most values near the median, a long tail of large ones"""
+    value = max(1, int(rng.lognormvariate(math.log(median), sigma)))
+    return min(value, maximum) if maximum else value
+
+
+def generate_company(index: int, args):
+    """Yield (collection, document) for one company, using an RNG derived from the seed and company index"""
+    rng = random.Random(args.seed * 1_000_003 + index)
+    period_start = args.start_date
+    period_end = period_start + timedelta(days=365 * args.years)
+    upcoming_from = period_end - timedelta(days=UPCOMING_DAYS)
+    created_at = period_start - timedelta(days=rng.randint(1, 365))
+
+    car_count = skewed_count(rng, args.cars_per_company * 0.6, maximum=args.cars_per_company * 20)
+    user_count = skewed_count(rng, max(2, car_count * 0.8), sigma=0.6, maximum=car_count * 5)
+    license_type = (
+        LicenseType.ENTERPRISE if car_count > 300 else
+        LicenseType.PROFESSIONAL if car_count > 50 else
+        LicenseType.BASIC
+    )
+
+    company_id = make_id(rng)
+    license_id = make_id(rng)
+    yield "licenses", {
+        "id": license_id,
+        "license_key": make_license_key(rng),
+        "company_id": company_id,
+        "license_type": license_type.value,
+        "status": LicenseStatus.ACTIVE.value,
+        "max_users": user_count * 2,
+        "max_vehicles": car_count * 2,
+        "issued_date": created_at,
+        "expires_date": None,
+        "activated_date": created_at,
+        "created_by": None,
+        "notes": "Synthetic dataset",
+        "users_count": user_count,
+        "vehicles_count": car_count,
+    }
+    yield "companies", {
+        "id": company_id,
+        "name": f"Synthetic Fleet {index}",
+        "slug": f"synthetic-fleet-{index}",
+        "email": f"fleet{index}@synthetic.example.com",
+        "phone": None,
+        "address": None,
+        "website": None,
+        "license_id": license_id,
+        "is_active": True,
+        "created_at": created_at,
+    }
+
+    user_ids = []
+    manager_ids = []
+    for i in range(user_count):
+        user_id = make_id(rng)
+        role = UserRole.FLEET_MANAGER if i < max(1, user_count // 25) else UserRole.REGULAR_USER
+        user_ids.append(user_id)
+        if role == UserRole.FLEET_MANAGER:
+            manager_ids.append(user_id)
+        yield "users", {
+            "id": user_id,
+            "company_id": company_id,
+            "name": f"Employee {index}-{i}",
+            "email": f"user{i}@fleet{index}.synthetic.example.com",
+            "role": role.value,
+            "department": rng.choice(DEPARTMENTS),
+            "phone": None,
+            "language": "en",
+            "is_active": rng.random() > 0.03,
+            "created_at": created_at + timedelta(days=rng.randint(0, 365)),
+            "password_hash": PASSWORD_HASH,
+        }
+    # A few heavy bookers make most of the requests
+    user_weights = [rng.paretovariate(1.2) for _ in user_ids]
+
+    categories = list(CATEGORY_WEIGHTS)
+    category_weights = list(CATEGORY_WEIGHTS.values())
+    reasons = list(DOWNTIME_REASONS)
+    reason_weights = [weight for weight, _ in DOWNTIME_REASONS.values()]
+    for car_index in range(car_count):
+        car_id = make_id(rng)
+        make = rng.choice(list(MAKES))
+        status = CarStatus.AVAILABLE
+
+        # Downtimes: a few per car and year; some are still open at the end of the period
+        downtimes = []
+        for _ in range(int(rng.expovariate(1 / (3 * args.years)))):
+            reason = rng.choices(reasons, reason_weights)[0]
+            start = period_start + timedelta(hours=rng.randrange(int((period_end - period_start).total_seconds() // 3600)))
+            end = start + timedelta(hours=max(1, rng.expovariate(1 / DOWNTIME_REASONS[reason][1])))
+            if end > period_end:
+                end = None
+                status = CarStatus.DOWNTIME
+            downtimes.append((start, end))
+            yield "downtimes", {
+                "id": make_id(rng),
+                "company_id": company_id,
+                "car_id": car_id,
+                "reason": reason.value,
+                "description": f"{reason.value.title()} for {make}",
+                "start_date": start,
+                "end_date": end,
+                "cost": round(rng.uniform(20, 2500), 2) if reason != DowntimeReason.CLEANING else None,
+                "created_at": start - timedelta(days=rng.randint(0, 14)),
+            }
+
+        yield "cars", {
+            "id": car_id,
+            "company_id": company_id,
+            "make": make,
+            "model": rng.choice(MAKES[make]),
+            "year": rng.randint(2014, 2025),
+            "license_plate": f"SY-{index}-{car_index:05d}",
+            "vin": f"SYN{index:07d}{car_index:07d}",
+            "mileage": rng.randint(1000, 250000),
+            "category": rng.choices(categories, category_weights)[0].value,
+            "status": status.value,
+            "created_at": created_at + timedelta(days=rng.randint(0, 30)),
+        }
+
+        # Bookings: back-to-back trips on busy cars, sparse ones on idle cars
+        utilization = rng.betavariate(2, 3)
+        cursor = period_start + timedelta(hours=rng.randint(0, 72))
+        while cursor < period_end:
+            cursor += timedelta(hours=rng.expovariate(utilization / 24 * args.bookings_per_car_per_day))
+            start = cursor.replace(minute=0, second=0, microsecond=0)
+            hours = rng.choice([1, 2, 3, 4, 6, 8, 8, 10]) if rng.random() < 0.85 else rng.randint(24, 24 * 7)
+            end = start + timedelta(hours=hours)
+            if end > period_end:
+                break
+            cursor = end
+            if any(down_start < end and (down_end is None or down_end > start) for down_start, down_end in downtimes):
+                continue
+            # Sometimes a second employee asks for the same slot; that request is pending or rejected
+            requests = 1 + (rng.random() < args.overlap_rate)
+            for request_number in range(requests):
+                user_id = rng.choices(user_ids, user_weights)[0]
+                created = start - timedelta(hours=rng.randint(1, 24 * 21))
+                if request_number > 0:
+                    status = BookingStatus.PENDING if start >= upcoming_from else BookingStatus.REJECTED
+                elif start >= upcoming_from:
+                    status = BookingStatus.APPROVED if rng.random() < 0.7 else BookingStatus.PENDING
+                else:
+                    status = rng.choices(
+                        [BookingStatus.COMPLETED, BookingStatus.CANCELLED, BookingStatus.REJECTED],
+                        [85, 10, 5]
+                    )[0]
+                decided = status not in (BookingStatus.PENDING, BookingStatus.CANCELLED)
+                yield "bookings", {
+                    "id": make_id(rng),
+                    "company_id": company_id,
+                    "car_id": car_id,
+                    "user_id": user_id,
+                    "start_date": start,
+                    "end_date": end,
+                    "purpose": rng.choice(PURPOSES),
+                    "status": status.value,
+                    "approved_by": rng.choice(manager_ids) if decided else None,
+                    "approved_at": created + timedelta(hours=rng.randint(1, 48)) if decided else None,
+                    "rejection_reason": "Car already booked" if status == BookingStatus.REJECTED else None,
+                    "created_at": created,
+                }
+
+
+class Sink:
+    """Buffers documents per collection and flushes full batches to MongoDB and/or NDJSON files"""
+
+    def __init__(self, db, ndjson_dir: Path, part: str, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.buffers = {collection: [] for collection in COLLECTIONS}
+        self.counts = dict.fromkeys(COLLECTIONS, 0)
+        self.files = {}
+        if ndjson_dir is not None:
+            self.files = {
+                collection: open(ndjson_dir / f"{collection}-{part}.ndjson", "ab") for collection in COLLECTIONS
+            }
+
+    async def add(self, collection: str, document: dict):
+        buffer = self.buffers[collection]
+        buffer.append(document)
+        if len(buffer) >= self.batch_size:
+            await self.flush(collection)
+
+    async def flush(self, collection: str):
+        documents = self.buffers[collection]
+        if not documents:
+            return
+        self.buffers[collection] = []
+        self.counts[collection] += len(documents)
+        if collection in self.files:
+            self.files[collection].write(b"".join(
+                orjson.dumps(document, option=orjson.OPT_APPEND_NEWLINE) for document in documents
+            ))
+        if self.db is not None:
+            await self.db[collection].insert_many(documents, ordered=False)
+
+    async def close(self):
+        for collection in COLLECTIONS:
+            await self.flush(collection)
+        for file in self.files.values():
+            file.close()
+
+
+async def run_task(db, companies, args, part: str) -> dict:
+    sink = Sink(db, Path(args.ndjson) if args.ndjson else None, part, args.batch_size)
+    for index in companies:
+        for collection, document in generate_company(index, args):
+            await sink.add(collection, document)
+        # Let the other tasks generate while this one's inserts are in flight
+        await asyncio.sleep(0)
+    await sink.close()
+    return sink.counts
+
+
+async def run_worker_async(worker: int, args) -> dict:
+    client = None if args.no_mongo else AsyncIOMotorClient(args.mongo_url)
+    db = client[args.db_name] if client is not None else None
+    tasks = args.workers * args.concurrency
+    results = await asyncio.gather(*(
+        run_task(
+            db,
+            range(worker * args.concurrency + task, args.companies, tasks),
+            args,
+            f"{worker:03d}-{task:03d}"
+        )
+        for task in range(args.concurrency)
+    ))
+    if client is not None:
+        client.close()
+    return {collection: sum(result[collection] for result in results) for collection in COLLECTIONS}
+
+
+def run_worker(worker: int, args) -> dict:
+    return asyncio.run(run_worker_async(worker, args))
+
+
+async def prepare_database(args):
+    client = AsyncIOMotorClient(args.mongo_url)
+    db = client[args.db_name]
+    if args.drop:
+        for collection in COLLECTIONS:
+            await db[collection].drop()
+    client.close()
+
+
+async def create_indexes(args):
+    """Build the backend's indexes after loading, which is much faster than maintaining them during inserts"""
+    client = AsyncIOMotorClient(args.mongo_url)
+    db = client[args.db_name]
+    for collection_name, indexes in INDEXES.items():
+        for keys, options in indexes:
+            await db[collection_name].create_index(keys, **options)
+    client.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic Fleet Management dataset")
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--cars-per-company", type=int, default=100, help="typical fleet size (skewed)")
+    parser.add_argument("--years", type=int, default=3, help="years of bookings and downtimes")
+    parser.add_argument("--start-date", type=datetime.fromisoformat, default=datetime(2023, 1, 1))
+    parser.add_argument("--bookings-per-car-per-day", type=float, default=1.0, help="for a fully utilized car")
+    parser.add_argument("--overlap-rate", type=float, default=0.05, help="share of slots requested twice")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="insert tasks per process")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "fleetmanager_synthetic"))
+    parser.add_argument("--drop", action="store_true", help="drop the generated collections first")
+    parser.add_argument("--no-mongo", action="store_true", help="only write NDJSON fixtures")
+    parser.add_argument("--ndjson", help="directory for NDJSON fixtures (one file per collection and task)")
+    args = parser.parse_args()
+    if args.no_mongo and not args.ndjson:
+        parser.error("--no-mongo requires --ndjson")
+    return args
+
+
+def main():
+    args = parse_args()
+    print("🏭 Generating synthetic Fleet Management dataset")
+    print("=" * 60)
+    print(f"{args.companies} companies, ~{args.cars_per_company} cars each, {args.years} years, seed {args.seed}")
+    if args.ndjson:
+        Path(args.ndjson).mkdir(parents=True, exist_ok=True)
+    if not args.no_mongo:
+        asyncio.run(prepare_database(args))
+
+    started = time.perf_counter()
+    totals = dict.fromkeys(COLLECTIONS, 0)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_worker, worker, args) for worker in range(args.workers)]
+        for future in futures:
+            for collection, count in future.result().items():
+                totals[collection] += count
+    elapsed = time.perf_counter() - started
+
+    total = sum(totals.values())
+    for collection in COLLECTIONS:
+        print(f"  {collection:<10} {totals[collection]:>12,}")
+    print(f"✅ {total:,} documents in {elapsed:.1f} s ({total / elapsed:,.0f} docs/s)")
+
+    if not args.no_mongo:
+        print("Building indexes...")
+        index_started = time.perf_counter()
+        asyncio.run(create_indexes(args))
+        print(f"✅ Indexes built in {time.perf_counter() - index_started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+"""
+Load Test for Fleet Management System
+Replays a realistic mix of the backend_test.py / booking_test.py scenarios (login,
+dashboard, car listing, availability checks, booking creation and approval)
+across many tenants at a target request rate, then reports latency percentiles,
+throughput and error rates per route and saves the results as JSON so runs can
+be compared over time.
+
+Tenants are set up through the API; their licenses are written directly to
+MongoDB (MONGO_URL / DB_NAME from backend/.env), like create_sample_licenses.py.
+
+    python load_test.py --base-url http://localhost:8001 --tenants 20 --rps 100 --duration 60
+    python load_test.py --compare load_test_results/<earlier run>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent / "backend"
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+# Import from server after setting up the path
+from server import CarCategory, License, LicenseType, generate_license_key
+
+RESULTS_DIR = Path(__file__).parent / "load_test_results"
+PASSWORD = "loadtest123"
+CATEGORIES = [category.value for category in CarCategory]
+
+# Scenario -> relative weight in the traffic mix
+SCENARIO_WEIGHTS = {
+    "login": 5,
+    "dashboard": 25,
+    "list_cars": 20,
+    "availability": 25,
+    "create_booking": 15,
+    "approve_booking": 10,
+}
+
+
+class Tenant:
+    def __init__(self, manager_email: str, manager_token: str):
+        self.manager_email = manager_email
+        self.manager_headers = {"Authorization": f"Bearer {manager_token}"}
+        self.user_emails = []
+        self.user_headers = []
+        self.car_ids = []
+        self.pending_bookings = []
+
+
+class Recorder:
+    """Latencies and outcomes per route template"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[route] += 1
+            self.latencies[route].append(time.perf_counter() - start)
+            self.statuses[route][type(e).__name__] += 1
+            return None
+        self.latencies[route].append(time.perf_counter() - start)
+        self.statuses[route][str(response.status_code)] += 1
+        if response.status_code >= 500:
+            self.errors[route] += 1
+        return response
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def create_licenses(count: int) -> list:
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    licenses = [
+        License(
+            license_key=generate_license_key(),
+            license_type=LicenseType.ENTERPRISE,
+            max_users=1000,
+            max_vehicles=10000,
+            notes="Load test"
+        )
+        for _ in range(count)
+    ]
+    await db.licenses.insert_many([license.dict() for license in licenses])
+    client.close()
+    return [license.license_key for license in licenses]
+
+
+async def setup_tenant(client: httpx.AsyncClient, run_id: str, index: int, license_key: str, args) -> Tenant:
+    manager_email = f"loadtest-{run_id}-{index}-manager@example.com"
+    response = await client.post("/api/companies/register", json={
+        "company_name": f"Load Test {run_id} #{index}",
+        "company_email": f"loadtest-{run_id}-{index}@example.com",
+        "license_key": license_key,
+        "manager_name": "Load Test Manager",
+        "manager_email": manager_email,
+        "manager_password": PASSWORD
+    })
+    response.raise_for_status()
+    tenant = Tenant(manager_email, response.json()["access_token"])
+
+    users = [
+        {
+            "name": f"Driver {i}",
+            "email": f"loadtest-{run_id}-{index}-user{i}@example.com",
+            "password": PASSWORD,
+            "role": "regular_user",
+            "department": "Sales"
+        }
+        for i in range(args.users_per_tenant)
+    ]
+    response = await client.post("/api/users/import", json=users, headers=tenant.manager_headers)
+    check_import(response, "users")
+    tenant.user_emails = [user["email"] for user in users]
+
+    cars = [
+        {
+            "make": "Toyota",
+            "model": "Corolla",
+            "year": 2020 + i % 5,
+            "license_plate": f"LT-{index}-{i}",
+            "vin": f"LT{run_id}{index:04d}{i:06d}",
+            "mileage": 1000 * i,
+            "category": CATEGORIES[i % len(CATEGORIES)]
+        }
+        for i in range(args.cars_per_tenant)
+    ]
+    response = await client.post("/api/cars/import", json=cars, headers=tenant.manager_headers)
+    check_import(response, "cars")
+    response = await client.get("/api/cars", headers=tenant.manager_headers)
+    tenant.car_ids = [car["id"] for car in response.json()]
+
+    for email in tenant.user_emails:
+        response = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        tenant.user_headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+    return tenant
+
+
+def check_import(response: httpx.Response, what: str):
+    """Fail setup when an import rejected rows, so tenants get the requested size"""
+    response.raise_for_status()
+    result = response.json()
+    if result["failed"]:
+        raise RuntimeError(f"Importing {what} failed for {result['failed']} of {result['total_rows']} rows: {result['errors'][:3]}")
+
+
+def booking_window(rng: random.Random):
+    start = datetime.utcnow() + timedelta(days=rng.randint(1, 365), hours=rng.randint(0, 23))
+    return start, start + timedelta(hours=rng.randint(1, 48))
+
+
+async def run_scenario(name: str, tenant: Tenant, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+    user_headers = rng.choice(tenant.user_headers)
+    if name == "login":
+        await recorder.request(client, "POST /api/auth/login", "POST", "/api/auth/login",
+                               json={"email": rng.choice(tenant.user_emails), "password": PASSWORD})
+    elif name == "dashboard":
+        headers = tenant.manager_headers if rng.random() < 0.3 else user_headers
+        await asyncio.gather(
+            recorder.request(client, "GET /api/fleet/stats", "GET", "/api/fleet/stats", headers=headers),
+            recorder.request(client, "GET /api/fleet/categories", "GET", "/api/fleet/categories", headers=headers),
+            recorder.request(client, "GET /api/companies/me", "GET", "/api/companies/me", headers=headers),
+            recorder.request(client, "GET /api/bookings", "GET", "/api/bookings", headers=headers),
+        )
+    elif name == "list_cars":
+        await recorder.request(client, "GET /api/cars", "GET", "/api/cars", headers=user_headers)
+    elif name == "availability":
+        start, end = booking_window(rng)
+        await recorder.request(
+            client, "GET /api/cars/{car_id}/availability", "GET", f"/api/cars/{rng.choice(tenant.car_ids)}/availability",
+            params={"start_date": start.isoformat(), "end_date": end.isoformat()}, headers=user_headers
+        )
+    elif name == "create_booking":
+        start, end = booking_window(rng)
+        response = await recorder.request(client, "POST /api/bookings", "POST", "/api/bookings", headers=user_headers, json={
+            "car_id": rng.choice(tenant.car_ids),
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "purpose": "Customer visit"
+        })
+        if response is not None and response.status_code == 200:
+            tenant.pending_bookings.append(response.json()["id"])
+    elif name == "approve_booking":
+        if not tenant.pending_bookings:
+            return
+        booking_id = tenant.pending_bookings.pop(rng.randrange(len(tenant.pending_bookings)))
+        await recorder.request(
+            client, "PUT /api/bookings/{booking_id}/approve", "PUT", f"/api/bookings/{booking_id}/approve",
+            headers=tenant.manager_headers, json={"status": "approved"}
+        )
+
+
+async def generate_load(tenants: list, client: httpx.AsyncClient, recorder: Recorder, args) -> float:
+    """Open-loop load: scenarios start on a seeded Poisson schedule regardless of response times"""
+    rng = random.Random(args.seed)
+    scenarios = list(SCENARIO_WEIGHTS)
+    weights = [SCENARIO_WEIGHTS[name] for name in scenarios]
+    tasks = set()
+    start = time.perf_counter()
+    next_start = start
+    while next_start - start < args.duration:
+        delay = next_start - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name = rng.choices(scenarios, weights)[0]
+        task = asyncio.create_task(
+            run_scenario(name, rng.choice(tenants), client, recorder, random.Random(rng.random()))
+        )
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        next_start += rng.expovariate(args.rps)
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - start
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for route in sorted(recorder.latencies):
+        latencies = sorted(recorder.latencies[route])
+        count = len(latencies)
+        client_errors = sum(n for code, n in recorder.statuses[route].items() if code.startswith("4"))
+        routes[route] = {
+            "count": count,
+            "throughput_rps": round(count / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2),
+            "client_error_rate": round(client_errors / count, 4),
+            "error_rate": round(recorder.errors[route] / count, 4),
+            "statuses": dict(recorder.statuses[route]),
+        }
+    total = sum(route["count"] for route in routes.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "total_requests": total,
+        "throughput_rps": round(total / elapsed, 2),
+        "error_rate": round(sum(recorder.errors.values()) / total, 4) if total else 0.0,
+        "routes": routes,
+    }
+
+
+def print_summary(summary: dict, baseline: dict = None):
+    print()
+    print(f"{'route':<40} | {'count':>6} | {'rps':>7} | {'p50':>8} | {'p95':>8} | {'p99':>8} | {'4xx':>6} | {'err':>6}")
+    print("-" * 110)
+    for route, stats in summary["routes"].items():
+        line = (
+            f"{route:<40} | {stats['count']:>6} | {stats['throughput_rps']:>7.1f} | {stats['p50_ms']:>8.1f} | "
+            f"{stats['p95_ms']:>8.1f} | {stats['p99_ms']:>8.1f} | {stats['client_error_rate']:>6.1%} | {stats['error_rate']:>6.1%}"
+        )
+        previous = (baseline or {}).get("routes", {}).get(route)
+        if previous and previous["p95_ms"]:
+            line += f" | p95 {(stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms']:+.0%}"
+        print(line)
+    print("-" * 110)
+    print(f"{summary['total_requests']} requests in {summary['elapsed_seconds']} s "
+          f"({summary['throughput_rps']} req/s), error rate {summary['error_rate']:.2%}")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_load_test(args):
+    started_at = datetime.utcnow()
+    run_id = started_at.strftime("%Y%m%d%H%M%S")
+    print("🏋️  Fleet Management load test")
+    print("=" * 60)
+    print(f"Target: {args.base_url}, {args.tenants} tenants, {args.rps} req/s for {args.duration} s (seed {args.seed})")
+
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        print("Setting up tenants...")
+        license_keys = await create_licenses(args.tenants)
+        tenants = await asyncio.gather(*(
+            setup_tenant(client, run_id, index, license_key, args) for index, license_key in enumerate(license_keys)
+        ))
+
+        print("Generating load...")
+        recorder = Recorder()
+        elapsed = await generate_load(tenants, client, recorder, args)
+
+    summary = summarize(recorder, elapsed)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_summary(summary, baseline)
+
+    results = {
+        "run_id": run_id,
+        "started_at": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key != "compare"},
+        "scenario_weights": SCENARIO_WEIGHTS,
+        **summary,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"load_test_{run_id}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"💾 Results saved to {output}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the Fleet Management backend")
+    parser.add_argument("--base-url", default=os.environ.get("BACKEND_URL", "http://localhost:8001"))
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--users-per-tenant", type=int, default=5)
+    parser.add_argument("--cars-per-tenant", type=int, default=20)
+    parser.add_argument("--rps", type=float, default=50, help="target scenario starts per second")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="results file (default: load_test_results/load_test_<run id>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare p95 latencies with")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_load_test(parse_args()))
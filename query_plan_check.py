@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+
+"""
+Query Plan Regression Checker for Fleet Management System
+Runs explain("executionStats") for every query and aggregation shape the
+backend issues (build_shapes below) against a seeded database and fails when a
+shape scans a whole collection (COLLSCAN), sorts in memory (SORT), or
+examines many more documents than it returns.
+
+Seed a database first, then point the checker at it:
+
+    python generate_dataset.py --companies 200 --db-name fleetmanager_plans --drop
+    python query_plan_check.py --db-name fleetmanager_plans
+
+When a query in server.py is added or its filter, sort or projection changes,
+update its entry here so the change is checked too.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent / "backend"
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+# Import from server after setting up the path
+from server import (
+    BOOKING_CAR_PROJECTION, BOOKING_PROJECTION, BOOKING_USER_PROJECTION, CAR_PROJECTION, DELETION_BATCH_SIZE, DOWNTIME_PROJECTION, FLEET_EVENTS_REPLAY_LIMIT, INDEXES,
+    LICENSE_RESPONSE_PROJECTION, NOT_DELETED, USER_PROJECTION, USER_RESPONSE_PROJECTION,
+    BookingStatus, CarStatus, JobStatus, UserRole
+)
+
+DEFAULT_MAX_EXAMINED_RATIO = 10
+
+
+class QueryShape:
+    """One query as the backend issues it, as the body of an explain command"""
+
+    def __init__(self, name: str, command: dict, allow_sort: bool = False, check_examined: bool = True):
+        self.name = name
+        self.command = command
+        # Exemptions are documented next to the shape that needs them
+        self.allow_sort = allow_sort
+        self.check_examined = check_examined
+
+
+def find(collection: str, query: dict, projection: dict = None, sort: dict = None, limit: int = None) -> dict:
+    command = {"find": collection, "filter": query}
+    if projection:
+        command["projection"] = projection
+    if sort:
+        command["sort"] = sort
+    if limit:
+        command["limit"] = limit
+    return command
+
+
+def count(collection: str, query: dict) -> dict:
+    return {"count": collection, "query": query}
+
+
+def distinct(collection: str, key: str, query: dict) -> dict:
+    return {"distinct": collection, "key": key, "query": query}
+
+
+def aggregate(collection: str, pipeline: list) -> dict:
+    return {"aggregate": collection, "pipeline": pipeline, "cursor": {}}
+
+
+def update(collection: str, query: dict, change: dict, multi: bool = False) -> dict:
+    return {"update": collection, "updates": [{"q": query, "u": change, "multi": multi}]}
+
+
+def delete(collection: str, query: dict, multi: bool = False) -> dict:
+    return {"delete": collection, "deletes": [{"q": query, "limit": 0 if multi else 1}]}
+
+
+def find_and_modify(collection: str, query: dict, change: dict, sort: dict = None) -> dict:
+    command = {"findAndModify": collection, "query": query, "update": change}
+    if sort:
+        command["sort"] = sort
+    return command
+
+
+def build_shapes(sample: dict) -> list:
+    """Every query shape in server.py, filled in with values from the seeded database"""
+    company_id = sample["company_id"]
+    car_id = sample["car_id"]
+    start, end = sample["window"]
+    live_statuses = [BookingStatus.APPROVED.value, BookingStatus.PENDING.value]
+    marker = {"$set": {"plan_check": True}}
+    return [
+        # Companies
+        QueryShape("companies by id", find("companies", {"id": company_id}, limit=1)),
+        QueryShape("live company by id", find("companies", {"id": company_id, **NOT_DELETED}, limit=1)),
+        QueryShape("companies by email", find("companies", {"email": sample["company_email"]}, limit=1)),
+        QueryShape("companies by slug", find("companies", {"slug": sample["company_slug"]}, limit=1)),
+        QueryShape("company names for the license list", find(
+            "companies", {"id": {"$in": [company_id]}}, {"_id": 0, "id": 1, "name": 1}
+        )),
+        QueryShape("update company", update("companies", {"id": company_id, **NOT_DELETED}, marker)),
+
+        # Licenses
+        QueryShape("licenses by key", find("licenses", {"license_key": sample["license_key"]}, limit=1)),
+        QueryShape("licenses by id", find("licenses", {"id": sample["license_id"]}, limit=1)),
+        QueryShape("admin license list", find("licenses", {}, LICENSE_RESPONSE_PROJECTION, {"issued_date": -1})),
+        QueryShape("reserve license usage", find_and_modify(
+            "licenses",
+            {"id": sample["license_id"], "$or": [
+                {"max_vehicles": {"$in": [None, 0]}},
+                {"$expr": {"$lte": [{"$add": [{"$ifNull": ["$vehicles_count", 0]}, 1]}, "$max_vehicles"]}}
+            ]},
+            {"$inc": {"vehicles_count": 0}}
+        )),
+        QueryShape("release license usage", update(
+            "licenses", {"id": sample["license_id"], "vehicles_count": {"$gte": 1}}, {"$inc": {"vehicles_count": 0}}
+        )),
+        QueryShape("assign license by key", update("licenses", {"license_key": sample["license_key"]}, marker)),
+        QueryShape("revoke company licenses", update("licenses", {"company_id": company_id}, marker, multi=True)),
+        # One-off startup backfill that walks all assigned licenses by design
+        QueryShape("license usage backfill", find(
+            "licenses", {"company_id": {"$ne": None}, "vehicles_count": {"$exists": False}},
+            {"_id": 0, "id": 1, "company_id": 1}
+        ), check_examined=False),
+
+        # Users
+        QueryShape("authenticate user by id", find("users", {"id": sample["user_id"], **NOT_DELETED}, USER_PROJECTION, limit=1)),
+        QueryShape("users by email", find("users", {"email": sample["user_email"]}, limit=1)),
+        QueryShape("login user by email", find("users", {"email": sample["user_email"], **NOT_DELETED}, limit=1)),
+        QueryShape("import email check", find(
+            "users", {"email": {"$in": [sample["user_email"]]}}, {"_id": 0, "email": 1}
+        )),
+        QueryShape("company users", find("users", {"company_id": company_id}, USER_RESPONSE_PROJECTION, limit=1000)),
+        QueryShape("company user by id", find("users", {"id": sample["user_id"], "company_id": company_id}, limit=1)),
+        QueryShape("active user count", count("users", {"company_id": company_id, "is_active": True})),
+        QueryShape("user count", count("users", {"company_id": company_id})),
+        QueryShape("manager count", count("users", {"company_id": company_id, "role": UserRole.FLEET_MANAGER.value})),
+        QueryShape("update user", update("users", {"id": sample["user_id"], "company_id": company_id}, marker)),
+        QueryShape("delete user", delete("users", {"id": sample["user_id"], "company_id": company_id})),
+
+        # Cars
+        QueryShape("fleet list", find("cars", {"company_id": company_id, **NOT_DELETED}, CAR_PROJECTION, limit=1000)),
+        QueryShape("car by id", find("cars", {"id": car_id, "company_id": company_id, **NOT_DELETED}, CAR_PROJECTION, limit=1)),
+        QueryShape("duplicate plate check", find(
+            "cars", {"company_id": company_id, "license_plate": sample["license_plate"], "id": {"$ne": car_id}, **NOT_DELETED},
+            limit=1
+        )),
+        QueryShape("import plate check", find(
+            "cars", {"company_id": company_id, "license_plate": {"$in": [sample["license_plate"]]}, **NOT_DELETED},
+            {"_id": 0, "license_plate": 1}
+        )),
+        QueryShape("vehicle count", count("cars", {"company_id": company_id, **NOT_DELETED})),
+        *[
+            QueryShape(f"fleet stats: {car_status.value} count", count(
+                "cars", {"company_id": company_id, "status": car_status.value, **NOT_DELETED}
+            ))
+            for car_status in CarStatus
+        ],
+        # The $sort orders the handful of groups, not the cars
+        QueryShape("fleet categories", aggregate("cars", [
+            {"$match": {"company_id": company_id, **NOT_DELETED}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]), allow_sort=True),
+        QueryShape("soft delete car", update(
+            "cars", {"id": car_id, "company_id": company_id, **NOT_DELETED}, marker
+        )),
+        QueryShape("cars being deleted", distinct("cars", "id", {"company_id": company_id, "deleted": True})),
+        QueryShape("set car status", update("cars", {"id": car_id, "company_id": company_id}, marker)),
+
+        # Bookings
+        QueryShape("manager booking list", find(
+            "bookings", {"company_id": company_id}, BOOKING_PROJECTION, {"created_at": -1}, 1000
+        )),
+        QueryShape("booking list without cars being deleted", find(
+            "bookings", {"company_id": company_id, "car_id": {"$nin": [car_id]}}, BOOKING_PROJECTION, {"created_at": -1}, 1000
+        )),
+        QueryShape("user booking list", find(
+            "bookings", {"user_id": sample["user_id"], "company_id": company_id}, BOOKING_PROJECTION, {"created_at": -1}, 1000
+        )),
+        QueryShape("booking by id", find(
+            "bookings", {"id": sample["booking_id"], "company_id": company_id}, BOOKING_PROJECTION, limit=1
+        )),
+        QueryShape("availability: overlapping booking", find("bookings", {
+            "car_id": car_id,
+            "status": {"$in": live_statuses},
+            "$or": [{"start_date": {"$lte": end}, "end_date": {"$gte": start}}],
+            "id": {"$ne": sample["booking_id"]},
+            "company_id": company_id
+        }, limit=1)),
+        QueryShape("booking count", count("bookings", {"company_id": company_id})),
+        QueryShape("booking list cars", find(
+            "cars", {"id": {"$in": [car_id]}, **NOT_DELETED, "company_id": company_id}, BOOKING_CAR_PROJECTION
+        )),
+        QueryShape("booking list users", find(
+            "users", {"id": {"$in": [sample["user_id"]]}, "company_id": company_id}, BOOKING_USER_PROJECTION
+        )),
+        QueryShape("update booking", update("bookings", {"id": sample["booking_id"], "company_id": company_id}, marker)),
+
+        # Downtimes
+        QueryShape("downtime list", find(
+            "downtimes", {"company_id": company_id}, DOWNTIME_PROJECTION, {"start_date": -1}, 1000
+        )),
+        QueryShape("car downtime list", find(
+            "downtimes", {"car_id": car_id, "company_id": company_id}, DOWNTIME_PROJECTION, {"start_date": -1}, 1000
+        )),
+        QueryShape("downtime by id", find(
+            "downtimes", {"id": sample["downtime_id"], "company_id": company_id}, DOWNTIME_PROJECTION, limit=1
+        )),
+        QueryShape("availability: overlapping downtime", find("downtimes", {
+            "car_id": car_id,
+            "$or": [
+                {"start_date": {"$lte": end}, "end_date": {"$gte": start}},
+                {"start_date": {"$lte": end}, "end_date": None}
+            ],
+            "company_id": company_id
+        }, limit=1)),
+        QueryShape("update downtime", update("downtimes", {"id": sample["downtime_id"], "company_id": company_id}, marker)),
+        QueryShape("delete downtime", delete("downtimes", {"id": sample["downtime_id"], "company_id": company_id})),
+
+        # Cache versions
+        QueryShape("collection versions", find(
+            "collection_versions", {"company_id": company_id}, {"_id": 0, "versions": 1}, limit=1
+        )),
+        QueryShape("bump collection version", update(
+            "collection_versions", {"company_id": company_id}, {"$inc": {"versions.cars": 0}}
+        )),
+        QueryShape("invalidation poll start", find(
+            "collection_versions", {}, {"_id": 0, "updated_at": 1}, {"updated_at": -1}, 1
+        )),
+        QueryShape("invalidation poll", find(
+            "collection_versions", {"updated_at": {"$gte": sample["now"]}},
+            {"_id": 0, "company_id": 1, "versions": 1, "updated_at": 1}
+        )),
+
+        # Fleet events
+        QueryShape("next fleet event number", find_and_modify(
+            "fleet_event_sequences", {"company_id": company_id}, {"$inc": {"seq": 0}}
+        )),
+        QueryShape("fleet event replay", find(
+            "fleet_events", {"company_id": company_id, "seq": {"$gt": 0}}, {"_id": 0}, {"seq": 1},
+            FLEET_EVENTS_REPLAY_LIMIT + 1
+        )),
+        QueryShape("fleet event replay reach", find(
+            "fleet_events", {"company_id": company_id, "seq": {"$lte": 0}}, {"_id": 0, "seq": 1}, limit=1
+        )),
+        QueryShape("fleet event poll", find(
+            "fleet_events",
+            {"created_at": {"$gte": sample["now"]}, "company_id": {"$in": [company_id]}, "worker": {"$ne": "plan-check"}},
+            {"_id": 0},
+            {"created_at": 1}
+        )),
+        QueryShape("redeem stream ticket", find_and_modify(
+            "stream_tickets", {"ticket": "plan-check", "expires_at": {"$gt": sample["now"]}}, {"$set": {"expires_at": sample["now"]}}
+        )),
+
+        # Deletion jobs
+        QueryShape("claim deletion job", find_and_modify(
+            "deletion_jobs",
+            {"$or": [
+                {"status": JobStatus.PENDING.value},
+                {"status": JobStatus.RUNNING.value, "locked_until": {"$lt": sample["now"]}}
+            ]},
+            {"$inc": {"attempts": 0}},
+            {"created_at": 1}
+        )),
+        QueryShape("deletion job by id", find("deletion_jobs", {"id": "plan-check", "company_id": company_id}, limit=1)),
+        *[
+            QueryShape(f"delete {collection} in batches", find(
+                collection, query, {"_id": 1}, limit=DELETION_BATCH_SIZE
+            ))
+            for collection, query in [
+                ("bookings", {"car_id": car_id, "company_id": company_id}),
+                ("downtimes", {"car_id": car_id, "company_id": company_id}),
+                ("cars", {"id": car_id, "company_id": company_id}),
+                ("users", {"company_id": company_id}),
+                ("bookings", {"company_id": company_id}),
+                ("companies", {"id": company_id}),
+            ]
+        ],
+    ]
+
+
+async def load_sample(db) -> dict:
+    """Pick the values the shapes are run with: the busiest car of the largest company"""
+    largest = await db.cars.aggregate([
+        {"$group": {"_id": "$company_id", "cars": {"$sum": 1}}},
+        {"$sort": {"cars": -1}},
+        {"$limit": 1}
+    ]).to_list(1)
+    if not largest:
+        raise SystemExit("❌ The database has no cars; seed it with generate_dataset.py first")
+    company_id = largest[0]["_id"]
+    busiest = await db.bookings.aggregate([
+        {"$match": {"company_id": company_id}},
+        {"$group": {"_id": "$car_id", "bookings": {"$sum": 1}}},
+        {"$sort": {"bookings": -1}},
+        {"$limit": 1}
+    ]).to_list(1)
+    car = await db.cars.find_one({"id": busiest[0]["_id"]} if busiest else {"company_id": company_id})
+    company = await db.companies.find_one({"id": company_id}) or {}
+    license_doc = await db.licenses.find_one({"company_id": company_id}) or {}
+    user = await db.users.find_one({"company_id": company_id, "role": UserRole.REGULAR_USER.value}) or {}
+    downtime = await db.downtimes.find_one({"company_id": company_id}) or {}
+    # A probe window in the middle of the car's booking history
+    bookings = await db.bookings.find(
+        {"company_id": company_id, "car_id": car["id"]}, {"_id": 0, "id": 1, "start_date": 1}
+    ).sort("start_date", 1).to_list(None)
+    middle = bookings[len(bookings) // 2] if bookings else {}
+    latest = await db.bookings.find_one({}, {"_id": 0, "created_at": 1}, sort=[("created_at", -1)])
+    window_start = middle.get("start_date") or car.get("created_at")
+    return {
+        "company_id": company_id,
+        "company_email": company.get("email"),
+        "company_slug": company.get("slug"),
+        "license_id": license_doc.get("id"),
+        "license_key": license_doc.get("license_key"),
+        "user_id": user.get("id"),
+        "user_email": user.get("email"),
+        "car_id": car["id"],
+        "license_plate": car["license_plate"],
+        "booking_id": middle.get("id"),
+        "downtime_id": downtime.get("id"),
+        "window": (window_start, window_start + timedelta(hours=4)),
+        "now": (latest or {}).get("created_at") or window_start,
+    }
+
+
+def find_key(document, key: str):
+    """First value stored under ``key`` anywhere in a (nested) explain document"""
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        document = list(document.values())
+    if isinstance(document, list):
+        for value in document:
+            found = find_key(value, key)
+            if found is not None:
+                return found
+    return None
+
+
+def plan_stages(plan: dict) -> list:
+    """Stage names of a winning plan, walking classic and SBE (queryPlan) plan trees"""
+    stages = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        for key in ("inputStage", "queryPlan", "outerStage", "innerStage"):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+def check_explain(shape: QueryShape, explain: dict, max_ratio: float) -> tuple:
+    """Problems found in one explain result (empty when the plan is fine), plan stages, examined and returned counts"""
+    problems = []
+    winning_plan = find_key(explain, "winningPlan") or {}
+    stages = plan_stages(winning_plan)
+    if "COLLSCAN" in stages:
+        problems.append("collection scan (COLLSCAN)")
+    if "SORT" in stages and not shape.allow_sort:
+        problems.append("in-memory sort (SORT)")
+
+    stats = find_key(explain, "executionStats") or {}
+    examined = stats.get("totalDocsExamined", 0)
+    # Counts, updates and deletes report what they matched on their top stage
+    top_stage = stats.get("executionStages", {})
+    returned = next(
+        (top_stage[key] for key in ("nCounted", "nMatched", "nWouldDelete") if key in top_stage),
+        stats.get("nReturned", 0)
+    )
+    if shape.check_examined and examined > max_ratio * max(returned, 1):
+        problems.append(f"examined {examined} documents to return {returned} (limit {max_ratio}x)")
+    return problems, stages, examined, returned
+
+
+async def check_plans(args) -> int:
+    client = AsyncIOMotorClient(args.mongo_url)
+    db = client[args.db_name]
+    if args.create_indexes:
+        for collection_name, indexes in INDEXES.items():
+            for keys, options in indexes:
+                await db[collection_name].create_index(keys, **options)
+
+    sample = await load_sample(db)
+    failures = 0
+    print(f"🔎 Checking query plans in {args.db_name} (company {sample['company_id']})")
+    print("=" * 100)
+    for shape in build_shapes(sample):
+        explain = await db.command({"explain": shape.command, "verbosity": "executionStats"})
+        problems, stages, examined, returned = check_explain(shape, explain, args.max_examined_ratio)
+        plan = " <- ".join(dict.fromkeys(stages)) or "?"
+        print(f"{'❌' if problems else '✅'} {shape.name:<40} {examined:>7} examined {returned:>6} returned  {plan}")
+        for problem in problems:
+            print(f"     {problem}")
+        failures += bool(problems)
+    client.close()
+
+    print("=" * 100)
+    if failures:
+        print(f"❌ {failures} query shapes have plan regressions")
+        return 1
+    print("✅ All query shapes use efficient plans")
+    return 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check the query plans of every backend query shape")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "fleetmanager_synthetic"))
+    parser.add_argument("--max-examined-ratio", type=float, default=DEFAULT_MAX_EXAMINED_RATIO,
+                        help="fail when a shape examines more than this many documents per returned document")
+    parser.add_argument("--create-indexes", action="store_true", help="create the backend indexes before checking")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(check_plans(parse_args())))
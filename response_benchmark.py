@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""
+Response Serialization Benchmark for Fleet Management System
+Compares the default FastAPI response path (build a model per row, re-validate
+against response_model, encode with the standard json encoder) with the fast
+path (trusted documents serialized directly with orjson)
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent / "backend"
+sys.path.append(str(backend_dir))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "fleetmanager_benchmark")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+# Import from server after setting up the path
+from server import BookingResponse, BookingStatus, trusted_response
+
+ROW_COUNTS = [100, 1000, 5000]
+REPEAT = 20
+
+
+def make_booking_documents(count: int) -> List[dict]:
+    """Booking documents shaped like the output of add_booking_details"""
+    now = datetime.utcnow()
+    company_id = str(uuid.uuid4())
+    documents = []
+    for i in range(count):
+        documents.append({
+            "id": str(uuid.uuid4()),
+            "company_id": company_id,
+            "car_id": str(uuid.uuid4()),
+            "user_id": str(uuid.uuid4()),
+            "start_date": now + timedelta(days=i),
+            "end_date": now + timedelta(days=i + 2),
+            "purpose": f"Customer visit #{i}",
+            "status": BookingStatus.APPROVED if i % 2 else BookingStatus.PENDING,
+            "approved_by": str(uuid.uuid4()) if i % 2 else None,
+            "approved_at": now if i % 2 else None,
+            "rejection_reason": None,
+            "created_at": now,
+            "car_info": {
+                "make": "Toyota",
+                "model": "Camry",
+                "year": 2022,
+                "license_plate": f"FL-{i:05d}",
+                "category": "sedan"
+            },
+            "user_info": {
+                "name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "department": "Sales"
+            },
+            "approver_info": {"name": "Fleet Manager", "email": "manager@example.com"} if i % 2 else None
+        })
+    return documents
+
+
+async def default_path(documents: List[dict], field) -> bytes:
+    """Model per row, response_model re-validation, standard json encoding"""
+    models = [BookingResponse(**document) for document in documents]
+    content = await serialize_response(field=field, response_content=models)
+    return JSONResponse(content).body
+
+
+async def fast_path(documents: List[dict], field) -> bytes:
+    """Trusted documents serialized directly with orjson"""
+    return trusted_response(documents).body
+
+
+async def measure(path, documents: List[dict], field) -> float:
+    """Best wall time in milliseconds over REPEAT runs"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        await path(documents, field)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def run_benchmark():
+    print("⏱️  Response serialization benchmark (List[BookingResponse])")
+    print("=" * 60)
+    field = create_response_field(name="Response", type_=List[BookingResponse])
+
+    print(f"{'rows':>6} | {'default (ms)':>12} | {'fast (ms)':>10} | {'speedup':>7} | {'bytes':>9}")
+    print("-" * 60)
+    for count in ROW_COUNTS:
+        documents = make_booking_documents(count)
+        default_ms = await measure(default_path, documents, field)
+        fast_ms = await measure(fast_path, documents, field)
+        size = len(await fast_path(documents, field))
+        print(f"{count:>6} | {default_ms:>12.2f} | {fast_ms:>10.2f} | {default_ms / fast_ms:>6.1f}x | {size:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+Startup Benchmark for Fleet Management System
+Measures import time, time until /api/health/ready reports ready, and the
+latency of the first requests after startup, with and without warmup. Every
+run starts a fresh interpreter so nothing is cached between runs. Needs a
+reachable MongoDB (MONGO_URL, DB_NAME).
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RUNS = 5
+# Low-cost bcrypt hash (4 rounds): verifying it mostly measures backend initialization
+BENCHMARK_HASH = "$2b$04$nPpgStXBR.REGNMhW5ZqDetXaBXSR6MKaXzISTTHWtrJNxiHEB3Cq"
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent / "backend"
+
+
+def measure_once() -> dict:
+    """One cold start in this process: import, lifespan startup, warmup, first requests"""
+    sys.path.append(str(backend_dir))
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "fleetmanager_benchmark")
+
+    start = time.perf_counter()
+    import server
+    from fastapi.testclient import TestClient
+    imported = time.perf_counter()
+
+    results = {"import_ms": (imported - start) * 1000}
+    with TestClient(server.app) as client:
+        while not server.app.state.ready:
+            time.sleep(0.005)
+        results["ready_ms"] = (time.perf_counter() - imported) * 1000
+        results["warmup_ms"] = server.app.state.warmup_timings
+
+        # A database round trip and a bcrypt verification, as the first login would do
+        for label in ("first", "second"):
+            request_start = time.perf_counter()
+            client.get("/api/health")
+            server.pwd_context.verify("benchmark", BENCHMARK_HASH)
+            results[f"{label}_request_ms"] = (time.perf_counter() - request_start) * 1000
+    return results
+
+
+def run_mode(warmup: bool) -> list:
+    env = {**os.environ, "STARTUP_WARMUP": "true" if warmup else "false"}
+    runs = []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child"], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return runs
+
+
+def run_benchmark():
+    print("🚀 Startup benchmark")
+    print("=" * 72)
+    print(f"{'warmup':>7} | {'import (ms)':>11} | {'ready (ms)':>10} | {'1st req (ms)':>12} | {'2nd req (ms)':>12}")
+    print("-" * 72)
+    for warmup in (False, True):
+        runs = run_mode(warmup)
+        median = {
+            key: statistics.median(run[key] for run in runs)
+            for key in ("import_ms", "ready_ms", "first_request_ms", "second_request_ms")
+        }
+        print(
+            f"{'on' if warmup else 'off':>7} | {median['import_ms']:>11.1f} | {median['ready_ms']:>10.1f} | "
+            f"{median['first_request_ms']:>12.1f} | {median['second_request_ms']:>12.1f}"
+        )
+        print(f"        warmup steps (last run): {runs[-1]['warmup_ms']}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        print(json.dumps(measure_once()))
+    else:
+        run_benchmark()
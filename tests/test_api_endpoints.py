@@ -0,0 +1,134 @@
+"""
+Endpoint tests against the in-memory mongomock-motor stand-in
+
+mongomock keeps the Python objects it was given, so enum fields written from
+models come back as Enum members. MongoDB returns plain strings; every
+collection is therefore round-tripped through BSON after seeding, so the
+handlers see documents as they would in production.
+
+    pytest tests/test_api_endpoints.py
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import bson
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.append(str(backend_dir))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "fleetmanager_test")
+
+# Import from server after setting up the path
+import server
+from fastapi.testclient import TestClient
+
+PASSWORD = "test123"
+
+
+async def round_trip_bson(db):
+    """Store every document as MongoDB would return it (enums become strings)"""
+    for name in await db.list_collection_names():
+        async for document in db[name].find({}):
+            await db[name].replace_one({"_id": document["_id"]}, bson.decode(bson.encode(document)))
+
+
+@pytest.fixture(scope="module")
+def client():
+    original_client, original_db = server.client, server.db
+    server.client = mongomock_motor.AsyncMongoMockClient()
+    server.db = server.client[f"fleetmanager_test_{uuid.uuid4().hex[:8]}"]
+    with TestClient(server.app) as client:
+        yield client
+    server.client, server.db = original_client, original_db
+
+
+@pytest.fixture(scope="module")
+def tenant(client):
+    """A company with a manager and a regular user, stored with string-typed enums"""
+    license = server.License(
+        license_key=server.generate_license_key(),
+        license_type=server.LicenseType.BASIC,
+        max_users=5,
+        max_vehicles=5
+    )
+    client.portal.call(server.db.licenses.insert_one, license.dict())
+    response = client.post("/api/companies/register", json={
+        "company_name": "Test Co",
+        "company_email": "company@test.example.com",
+        "license_key": license.license_key,
+        "manager_name": "Manager",
+        "manager_email": "manager@test.example.com",
+        "manager_password": PASSWORD
+    })
+    assert response.status_code == 200, response.text
+    manager_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = client.post("/api/users", headers=manager_headers, json={
+        "name": "Driver", "email": "driver@test.example.com", "password": PASSWORD, "role": "regular_user"
+    })
+    assert response.status_code == 200, response.text
+    response = client.post("/api/cars", headers=manager_headers, json={
+        "make": "Toyota", "model": "Corolla", "year": 2022, "license_plate": "T-1",
+        "vin": "VIN00000001", "mileage": 1000, "category": "sedan"
+    })
+    assert response.status_code == 200, response.text
+
+    client.portal.call(round_trip_bson, server.db)
+    response = client.post("/api/auth/login", json={"email": "driver@test.example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    user_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return {"manager": manager_headers, "user": user_headers}
+
+
+def test_stored_roles_are_strings(client, tenant):
+    users = client.portal.call(lambda: server.db.users.find({}).to_list(None))
+    assert {type(user["role"]) for user in users} == {str}
+
+
+@pytest.mark.parametrize("who", ["manager", "user"])
+def test_get_my_company(client, tenant, who):
+    response = client.get("/api/companies/me", headers=tenant[who])
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Test Co"
+    assert (response.json().get("stats") is not None) == (who == "manager")
+
+
+@pytest.mark.parametrize("who", ["manager", "user"])
+def test_get_dashboard(client, tenant, who):
+    response = client.get("/api/dashboard", headers=tenant[who])
+    assert response.status_code == 200, response.text
+    dashboard = response.json()
+    assert dashboard["company"]["name"] == "Test Co"
+    assert [car["license_plate"] for car in dashboard["cars"]] == ["T-1"]
+    assert ("users" in dashboard) == (who == "manager")
+
+
+def test_event_stream_heartbeats_are_outside_the_query_budget(client, tenant, monkeypatch):
+    """Streams re-check their user on every heartbeat, after the response has started"""
+    load_stream_user = server.load_stream_user
+
+    async def counted_load_stream_user(user_id):
+        # mongomock does not emit command events, so record the query like the listener would
+        stats = server.current_query_stats.get()
+        if stats is not None:
+            stats.record("users.find{id}", 0.0)
+        return await load_stream_user(user_id)
+
+    monkeypatch.setattr(server, "load_stream_user", counted_load_stream_user)
+    monkeypatch.setattr(server, "QUERY_BUDGET_ENFORCE", True)
+    monkeypatch.setattr(server, "FLEET_EVENTS_HEARTBEAT_SECONDS", 0.1)
+    user_id = client.get("/api/auth/me", headers=tenant["manager"]).json()["id"]
+    # The stream ends when its token expires, after about ten heartbeats
+    token = server.create_access_token({"sub": user_id}, server.timedelta(seconds=1.2))
+
+    response = client.get("/api/events/stream", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.text.count(": keepalive") >= 5
@@ -0,0 +1,259 @@
+"""
+Micro-benchmarks for the backend hot paths (pytest-benchmark)
+
+Runs against a seeded MongoDB when BENCHMARK_MONGO_URL is set, otherwise against
+the in-memory mongomock-motor stand-in. BENCHMARK_BOOKING_COUNTS sets the data
+sizes (default 1000,100000,1000000 with MongoDB, 1000 in memory):
+
+    BENCHMARK_MONGO_URL=mongodb://localhost:27017 pytest tests/test_hot_path_benchmarks.py
+
+Every benchmark has an absolute budget (mean, milliseconds) in BUDGETS_MS that
+fails the test when exceeded; scale it with BENCHMARK_BUDGET_FACTOR on slow
+machines. To catch relative regressions, save a baseline and compare against it:
+
+    pytest tests/test_hot_path_benchmarks.py --benchmark-autosave
+    pytest tests/test_hot_path_benchmarks.py --benchmark-compare --benchmark-compare-fail=mean:15%
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.append(str(backend_dir))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "fleetmanager_benchmark")
+
+# Import from server after setting up the path
+import server
+from fastapi.security import HTTPAuthorizationCredentials
+
+MONGO_URL = os.environ.get("BENCHMARK_MONGO_URL")
+DEFAULT_BOOKING_COUNTS = "1000,100000,1000000" if MONGO_URL else "1000"
+BOOKING_COUNTS = [int(count) for count in os.environ.get("BENCHMARK_BOOKING_COUNTS", DEFAULT_BOOKING_COUNTS).split(",")]
+BUDGET_FACTOR = float(os.environ.get("BENCHMARK_BUDGET_FACTOR", 1))
+CAR_COUNT = 100
+USER_COUNT = 50
+SEED_BATCH_SIZE = 10000
+PASSWORD = "benchmark123"
+
+# Mean time budget per benchmark in milliseconds
+BUDGETS_MS = {
+    "check_car_availability": 25,
+    "get_booking_with_details": 25,
+    "get_current_user": 15,
+    "validate_license_key": 15,
+    "check_license_limits": 15,
+    "check_license_limits_uncounted": 25,
+    "sync_license_usage": 25,
+    "generate_license_key": 0.5,
+    "verify_password": 1000,
+    "get_password_hash": 1000,
+}
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def database(loop):
+    if MONGO_URL:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(MONGO_URL)
+    else:
+        mongomock_motor = pytest.importorskip("mongomock_motor")
+        client = mongomock_motor.AsyncMongoMockClient()
+    original_db = server.db
+    server.db = client[f"fleetmanager_benchmark_{uuid.uuid4().hex[:8]}"]
+    yield server.db
+    loop.run_until_complete(client.drop_database(server.db.name))
+    server.db = original_db
+
+
+async def seed(db, booking_count: int) -> dict:
+    """One company with CAR_COUNT cars, USER_COUNT users and ``booking_count`` bookings"""
+    for name in await db.list_collection_names():
+        await db[name].drop()
+    await server.create_indexes()
+
+    license = server.License(
+        license_key=server.generate_license_key(),
+        license_type=server.LicenseType.ENTERPRISE,
+        max_users=USER_COUNT * 2,
+        max_vehicles=CAR_COUNT * 2
+    )
+    company = server.Company(name="Benchmark Co", email="benchmark@example.com", slug="benchmark-co", license_id=license.id)
+    license.company_id = company.id
+    license.users_count = USER_COUNT
+    license.vehicles_count = CAR_COUNT
+    await db.licenses.insert_one(license.dict())
+    await db.companies.insert_one(company.dict())
+    # A license from before the usage counters, which are counted and backfilled instead
+    legacy_license = {
+        **{key: value for key, value in license.dict().items() if key not in ("users_count", "vehicles_count")},
+        "id": str(uuid.uuid4()),
+        "license_key": server.generate_license_key()
+    }
+    await db.licenses.insert_one({**legacy_license})
+
+    password_hash = server.get_password_hash(PASSWORD)
+    users = [
+        server.User(
+            company_id=company.id,
+            email=f"user{i}@benchmark.example.com",
+            name=f"User {i}",
+            role=server.UserRole.FLEET_MANAGER if i == 0 else server.UserRole.REGULAR_USER
+        )
+        for i in range(USER_COUNT)
+    ]
+    await db.users.insert_many([{**user.dict(), "password_hash": password_hash} for user in users])
+
+    cars = [
+        server.Car(
+            company_id=company.id, make="Toyota", model="Corolla", year=2022, license_plate=f"BM-{i}",
+            vin=f"VIN{i:08d}", mileage=1000, category=server.CarCategory.SEDAN
+        )
+        for i in range(CAR_COUNT)
+    ]
+    await db.cars.insert_many([car.dict() for car in cars])
+
+    start = datetime(2024, 1, 1)
+    batch = []
+    booking_ids = []
+    for i in range(booking_count):
+        booking_start = start + timedelta(hours=12 * (i // CAR_COUNT))
+        booking = server.Booking(
+            company_id=company.id,
+            car_id=cars[i % CAR_COUNT].id,
+            user_id=users[i % USER_COUNT].id,
+            start_date=booking_start,
+            end_date=booking_start + timedelta(hours=8),
+            purpose="Benchmark",
+            status=server.BookingStatus.APPROVED if i % 2 else server.BookingStatus.PENDING,
+            approved_by=users[0].id if i % 2 else None
+        )
+        batch.append(booking.dict())
+        if i % 997 == 0:
+            booking_ids.append(booking.id)
+        if len(batch) == SEED_BATCH_SIZE:
+            await db.bookings.insert_many(batch)
+            batch = []
+    if batch:
+        await db.bookings.insert_many(batch)
+
+    return {
+        "company": company,
+        "license": license,
+        "legacy_license": legacy_license,
+        "users": users,
+        "cars": cars,
+        "booking_ids": booking_ids,
+        # Middle of the booked period, where a car has bookings before and after
+        "probe_start": start + timedelta(hours=12 * (booking_count // CAR_COUNT // 2) + 2),
+    }
+
+
+@pytest.fixture(scope="module", params=BOOKING_COUNTS, ids=lambda count: f"{count}_bookings")
+def dataset(request, loop, database):
+    return loop.run_until_complete(seed(database, request.param))
+
+
+def assert_within_budget(benchmark, name: str):
+    if benchmark.disabled:  # --benchmark-disable runs each function once, without stats
+        return
+    budget = BUDGETS_MS[name] * BUDGET_FACTOR
+    assert benchmark.stats.stats.mean * 1000 <= budget, (
+        f"{name}: mean {benchmark.stats.stats.mean * 1000:.2f} ms exceeds budget {budget:.2f} ms"
+    )
+
+
+def run_async(benchmark, loop, name: str, coroutine_function):
+    """Benchmark ``await coroutine_function()`` and enforce the budget for ``name``"""
+    result = benchmark(lambda: loop.run_until_complete(coroutine_function()))
+    assert_within_budget(benchmark, name)
+    return result
+
+
+def test_check_car_availability(benchmark, loop, dataset):
+    car_id = dataset["cars"][0].id
+    start = dataset["probe_start"]
+    available, _ = run_async(benchmark, loop, "check_car_availability", lambda: server.check_car_availability(
+        dataset["company"].id, car_id, start, start + timedelta(hours=4)
+    ))
+    assert available is False
+
+
+def test_get_booking_with_details(benchmark, loop, dataset):
+    booking_ids = iter(dataset["booking_ids"] * 1000)
+    booking = run_async(benchmark, loop, "get_booking_with_details", lambda: server.get_booking_with_details(
+        dataset["company"].id, next(booking_ids)
+    ))
+    assert booking["car_info"] is not None
+
+
+def test_get_current_user(benchmark, loop, dataset):
+    token = server.create_access_token({"sub": dataset["users"][1].id})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    user = run_async(benchmark, loop, "get_current_user", lambda: server.get_current_user(credentials))
+    assert user.id == dataset["users"][1].id
+
+
+def test_validate_license_key(benchmark, loop, dataset):
+    license_doc = run_async(benchmark, loop, "validate_license_key", lambda: server.validate_license_key(
+        dataset["license"].license_key
+    ))
+    assert license_doc["id"] == dataset["license"].id
+
+
+def test_check_license_limits(benchmark, loop, dataset):
+    limits = run_async(benchmark, loop, "check_license_limits", lambda: server.check_license_limits(
+        dataset["company"].id, dataset["license"].dict()
+    ))
+    assert limits["users_within_limit"]
+
+
+def test_check_license_limits_uncounted(benchmark, loop, dataset):
+    limits = run_async(benchmark, loop, "check_license_limits_uncounted", lambda: server.check_license_limits(
+        dataset["company"].id, dataset["legacy_license"]
+    ))
+    assert limits["users_count"] == USER_COUNT
+    assert limits["vehicles_count"] == CAR_COUNT
+
+
+def test_sync_license_usage(benchmark, loop, dataset):
+    license_id = dataset["legacy_license"]["id"]
+    run_async(benchmark, loop, "sync_license_usage", lambda: server.sync_license_usage(
+        license_id, dataset["company"].id
+    ))
+    license_doc = loop.run_until_complete(server.db.licenses.find_one({"id": license_id}))
+    assert (license_doc["users_count"], license_doc["vehicles_count"]) == (USER_COUNT, CAR_COUNT)
+
+
+def test_generate_license_key(benchmark):
+    key = benchmark(server.generate_license_key)
+    assert_within_budget(benchmark, "generate_license_key")
+    assert len(key) == 24
+
+
+def test_verify_password(benchmark):
+    password_hash = server.get_password_hash(PASSWORD)
+    assert benchmark(server.verify_password, PASSWORD, password_hash)
+    assert_within_budget(benchmark, "verify_password")
+
+
+def test_get_password_hash(benchmark):
+    benchmark(server.get_password_hash, PASSWORD)
+    assert_within_budget(benchmark, "get_password_hash")